@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from workout_api.contrib.admission import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    Bucket,
+    Overloaded,
+    RouteClass,
+)
+
+
+def _controller(capacity: int = 1, max_queue: int = 1, queue_timeout: float = 1.0) -> AdmissionController:
+    return AdmissionController(
+        capacity=capacity,
+        classes={
+            'read': RouteClass(bucket=Bucket('read', capacity), priority=0, max_queue=max_queue),
+            'write': RouteClass(bucket=Bucket('write', capacity), priority=1, max_queue=max_queue),
+            'bulk': RouteClass(bucket=Bucket('bulk', 1), priority=2, max_queue=max_queue),
+        },
+        queue_timeout=queue_timeout,
+    )
+
+
+@pytest.mark.asyncio
+async def test_admission_prioritizes_reads():
+    """Testa que, ao liberar uma vaga, leituras na fila passam à frente de escritas"""
+    controller = _controller()
+    running = await controller.acquire('write', '/atletas/')
+
+    order = []
+
+    async def request(class_name: str):
+        buckets = await controller.acquire(class_name, '/atletas/')
+        order.append(class_name)
+        controller.release(buckets)
+
+    write = asyncio.create_task(request('write'))
+    await asyncio.sleep(0)
+    read = asyncio.create_task(request('read'))
+    await asyncio.sleep(0)
+    assert controller.stats()['queue_depth'] == 2
+
+    controller.release(running)
+    await asyncio.gather(write, read)
+    assert order == ['read', 'write']
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_when_queue_is_full():
+    """Testa a rejeição imediata com a fila cheia e a contagem de shed"""
+    controller = _controller(max_queue=1)
+    running = await controller.acquire('read', '/atletas/')
+    waiting = asyncio.create_task(controller.acquire('read', '/atletas/'))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Overloaded):
+        await controller.acquire('read', '/atletas/')
+
+    stats = controller.stats()
+    assert stats['classes']['read']['shed'] == 1
+    assert stats['classes']['read']['queued'] == 1
+
+    controller.release(running)
+    controller.release(await waiting)
+    assert controller.stats()['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_route_limit():
+    """Testa o limite adicional por prefixo de rota"""
+    controller = AdmissionController(
+        capacity=10,
+        classes={'read': RouteClass(bucket=Bucket('read', 10), priority=0, max_queue=0)},
+        route_limits={'/leaderboard': 1},
+    )
+    buckets = await controller.acquire('read', '/leaderboard/')
+    with pytest.raises(Overloaded):
+        await controller.acquire('read', '/leaderboard/workouts/1')
+
+    other = await controller.acquire('read', '/atletas/')
+    controller.release(other)
+    controller.release(buckets)
+
+
+@pytest.mark.asyncio
+async def test_admission_saturated_route_does_not_block_other_routes():
+    """Testa que uma espera pelo limite de um prefixo não segura requisições de outras rotas"""
+    controller = AdmissionController(
+        capacity=10,
+        classes={'read': RouteClass(bucket=Bucket('read', 10), priority=0, max_queue=5)},
+        route_limits={'/leaderboard': 1},
+    )
+    running = await controller.acquire('read', '/leaderboard/')
+    waiting = asyncio.create_task(controller.acquire('read', '/leaderboard/workouts/1'))
+    await asyncio.sleep(0)
+    assert controller.stats()['queue_depth'] == 1
+
+    other = await asyncio.wait_for(controller.acquire('read', '/atletas/'), timeout=0.1)
+    controller.release(other)
+
+    controller.release(running)
+    controller.release(await waiting)
+    assert controller.stats()['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_middleware_returns_503_with_retry_after():
+    """Testa que o middleware responde 503 + Retry-After quando a classe está saturada"""
+    release = asyncio.Event()
+
+    async def slow(request):
+        await release.wait()
+        return PlainTextResponse('ok')
+
+    controller = _controller(max_queue=0)
+    app = Starlette(routes=[Route('/slow', slow, methods=['POST'])])
+    app.add_middleware(AdmissionControlMiddleware, controller=controller, retry_after=2)
+
+    async with AsyncClient(app=app, base_url='http://test') as client:
+        first = asyncio.create_task(client.post('/slow'))
+        await asyncio.sleep(0.05)
+
+        response = await client.post('/slow')
+        assert response.status_code == 503
+        assert response.headers['retry-after'] == '2'
+
+        release.set()
+        assert (await first).status_code == 200
+
+    assert controller.stats()['classes']['write']['shed'] == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_stats_endpoint(client: AsyncClient):
+    """Testa a exposição das métricas de admissão"""
+    response = await client.get('/admission')
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data['classes']) == {'read', 'write', 'bulk'}
+    assert 'queue_depth' in data
@@ -0,0 +1,163 @@
+import asyncio
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+
+from workout_api.analytics.schemas import CampoAnalitico
+from workout_api.analytics.snapshot import AtletaSnapshot, atleta_snapshot
+from workout_api.atleta.events import atleta_events
+from workout_api.atleta.models import AtletaModel
+from tests.conftest import async_session_maker, engine
+
+
+async def _seed(client: AsyncClient):
+    await client.post("/categorias/", json={"nome": "Scale"})
+    await client.post("/categorias/", json={"nome": "RX"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+
+    ids = {}
+    atletas = [
+        ("João Silva", "12345678909", 25, 80.0, 2.00, "M", "Scale"),
+        ("Maria Santos", "98765432100", 28, 60.0, 1.60, "F", "RX"),
+        ("Ana Souza", "11144477735", 35, 70.0, 1.70, "F", "RX"),
+    ]
+    for nome, cpf, idade, peso, altura, sexo, categoria in atletas:
+        response = await client.post("/atletas/", json={
+            "nome": nome,
+            "cpf": cpf,
+            "idade": idade,
+            "peso": peso,
+            "altura": altura,
+            "sexo": sexo,
+            "categoria": {"nome": categoria},
+            "centro_treinamento": {"nome": "CT King"}
+        })
+        assert response.status_code == 201
+        ids[nome] = response.json()["id"]
+    return ids
+
+
+@pytest.fixture
+async def snapshot():
+    atleta_snapshot.clear()
+    yield atleta_snapshot
+    atleta_snapshot.clear()
+
+
+@pytest.mark.asyncio
+async def test_analytics_unavailable_without_snapshot(client: AsyncClient, snapshot):
+    """Testa que o router responde 503 enquanto o snapshot não foi carregado"""
+    response = await client.get("/analytics/percentis?campo=peso")
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_analytics_percentis_histograma_grupos(client: AsyncClient, snapshot):
+    """Testa percentis, histograma e agrupamentos servidos pelo snapshot"""
+    await _seed(client)
+    await snapshot.refresh({"default": engine})
+
+    response = await client.get("/analytics/percentis?campo=peso&p=0&p=50&p=100")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    assert data["percentis"] == {"0": 60.0, "50": 70.0, "100": 80.0}
+
+    response = await client.get("/analytics/percentis?campo=imc&p=50&sexo=M")
+    assert response.json()["percentis"] == {"50": 20.0}
+
+    response = await client.get("/analytics/histograma?campo=idade&faixas=2")
+    faixas = response.json()["faixas"]
+    assert [faixa["total"] for faixa in faixas] == [2, 1]
+    assert faixas[0]["inicio"] == 25 and faixas[-1]["fim"] == 35
+
+    response = await client.get("/analytics/grupos?campo=peso&por=categoria&por=faixa_etaria")
+    grupos = {tuple(grupo["chave"].values()): grupo for grupo in response.json()["grupos"]}
+    assert grupos[("RX", "20-29")]["total"] == 1
+    assert grupos[("RX", "30-39")]["media"] == 70.0
+    assert grupos[("Scale", "20-29")]["maximo"] == 80.0
+
+
+@pytest.mark.asyncio
+async def test_analytics_refresh_is_incremental(client: AsyncClient, snapshot):
+    """Testa o refresh incremental com atualizações (updated_at) e exclusões"""
+    ids = await _seed(client)
+    await snapshot.refresh({"default": engine})
+
+    await client.patch(f"/atletas/{ids['Maria Santos']}", json={"idade": 41})
+    await client.delete(f"/atletas/{ids['João Silva']}")
+    await snapshot.refresh({"default": engine})
+
+    response = await client.get("/analytics/grupos?campo=idade&por=sexo")
+    grupos = response.json()["grupos"]
+    assert response.json()["total"] == 2
+    assert grupos == [{"chave": {"sexo": "F"}, "total": 2, "media": 38.0, "minimo": 35.0, "maximo": 41.0}]
+
+
+@pytest.mark.asyncio
+async def test_analytics_refresh_drops_deleted_with_same_count(client: AsyncClient, snapshot):
+    """Testa que uma exclusão compensada por um cadastro (mesma contagem) ainda some do snapshot"""
+    ids = await _seed(client)
+    await snapshot.refresh({"default": engine})
+
+    await client.delete(f"/atletas/{ids['João Silva']}")
+    response = await client.post("/atletas/", json={
+        "nome": "Pedro Lima",
+        "cpf": "52998224725",
+        "idade": 22,
+        "peso": 90.0,
+        "altura": 1.80,
+        "sexo": "M",
+        "categoria": {"nome": "RX"},
+        "centro_treinamento": {"nome": "CT King"}
+    })
+    assert response.status_code == 201
+    await snapshot.refresh({"default": engine})
+
+    response = await client.get("/analytics/percentis?campo=peso&p=0&p=100&sexo=M")
+    assert response.json()["total"] == 1
+    assert response.json()["percentis"] == {"0": 90.0, "100": 90.0}
+
+
+@pytest.mark.asyncio
+async def test_analytics_refresh_uses_tombstones_and_reconciles(client: AsyncClient, snapshot, monkeypatch):
+    """Testa exclusões aplicadas pelo change-feed e a releitura dos pk_id só na reconciliação"""
+    ids = await _seed(client)
+    monkeypatch.setattr(snapshot, "reconcile_every", 1000)
+    snapshot._follower = asyncio.create_task(snapshot.follow(atleta_events, atleta_events.subscribe()))
+    try:
+        await snapshot.refresh({"default": engine})
+
+        await client.delete(f"/atletas/{ids['João Silva']}")
+        # Exclusão fora da API: sem evento, só a reconciliação a percebe
+        async with async_session_maker() as session:
+            await session.execute(delete(AtletaModel).filter_by(pk_id=ids["Ana Souza"]))
+            await session.commit()
+        await asyncio.sleep(0)
+
+        await snapshot.refresh({"default": engine})
+        assert snapshot.total == 2
+
+        monkeypatch.setattr(snapshot, "reconcile_every", 1)
+        await snapshot.refresh({"default": engine})
+        assert snapshot.total == 1
+    finally:
+        await snapshot.stop()
+
+
+def test_snapshot_compacts_dead_rows():
+    """Testa que a compactação descarta as linhas mortas e mantém o upsert por pk_id"""
+    snapshot = AtletaSnapshot()
+    snapshot.apply([(pk_id, 30, 70.0, 1.70, "M", "RX", "CT King") for pk_id in range(1, 2001)])
+    snapshot.retain(np.arange(1501, 2001))
+
+    assert snapshot.size == 500 and snapshot.total == 500
+    snapshot.apply([(1600, 40, 80.0, 1.80, "M", "RX", "CT King"), (1, 30, 70.0, 1.70, "F", "RX", "CT King")])
+    assert snapshot.size == 501
+    assert snapshot.percentiles(CampoAnalitico.peso, [100], snapshot.mask()) == {100: 80.0}
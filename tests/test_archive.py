@@ -0,0 +1,119 @@
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from workout_api.atleta.archive import atleta_archiver
+from workout_api.atleta.events import atleta_events
+from workout_api.atleta.models import AtletaModel
+from tests.conftest import async_session_maker, engine
+
+
+async def _seed(client: AsyncClient) -> dict[str, int]:
+    await client.post("/categorias/", json={"nome": "RX"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+
+    ids = {}
+    for nome, cpf in (("João Silva", "12345678909"), ("Maria Santos", "98765432100")):
+        response = await client.post("/atletas/", json={
+            "nome": nome,
+            "cpf": cpf,
+            "idade": 25,
+            "peso": 70.0,
+            "altura": 1.70,
+            "sexo": "M",
+            "categoria": {"nome": "RX"},
+            "centro_treinamento": {"nome": "CT King"}
+        })
+        assert response.status_code == 201
+        ids[nome] = response.json()["id"]
+
+    # João sem atividade desde 2020
+    async with async_session_maker() as session:
+        await session.execute(
+            update(AtletaModel)
+            .filter_by(pk_id=ids["João Silva"])
+            .values(created_at=datetime(2020, 3, 1), updated_at=None)
+        )
+        await session.commit()
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_inactive_atletas(client: AsyncClient):
+    """Testa que o arquivamento tira os inativos das leituras padrão e que arquivados=true os inclui"""
+    ids = await _seed(client)
+
+    assert await atleta_archiver.archive(engines={"default": engine}, inactive_days=365) == 1
+
+    response = await client.get("/atletas/?fields=nome")
+    assert [item["nome"] for item in response.json()["items"]] == ["Maria Santos"]
+    response = await client.get("/atletas/?fields=nome&arquivados=true&sort=nome")
+    assert [item["nome"] for item in response.json()["items"]] == ["João Silva", "Maria Santos"]
+
+    assert (await client.get(f"/atletas/{ids['João Silva']}")).status_code == 404
+    response = await client.get(f"/atletas/{ids['João Silva']}?arquivados=true&fields=nome,cpf")
+    assert response.json() == {"nome": "João Silva", "cpf": "12345678909"}
+    response = await client.get("/atletas/cpf/12345678909?arquivados=true&fields=nome")
+    assert response.json() == {"nome": "João Silva"}
+
+    # O CPF arquivado continua reservado
+    response = await client.post("/atletas/", json={
+        "nome": "João Silva",
+        "cpf": "12345678909",
+        "idade": 30,
+        "peso": 70.0,
+        "altura": 1.70,
+        "sexo": "M",
+        "categoria": {"nome": "RX"},
+        "centro_treinamento": {"nome": "CT King"}
+    })
+    assert response.status_code == 303
+    assert "restaurar" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_restore_archived_atleta(client: AsyncClient):
+    """Testa a restauração do atleta arquivado, com as medições, para as tabelas ativas"""
+    ids = await _seed(client)
+    await atleta_archiver.archive(engines={"default": engine}, inactive_days=365)
+
+    response = await client.post(f"/atletas/{ids['João Silva']}/restaurar")
+    assert response.status_code == 200
+    assert response.json()["nome"] == "João Silva"
+
+    response = await client.get(f"/atletas/{ids['João Silva']}?fields=nome")
+    assert response.json() == {"nome": "João Silva"}
+    response = await client.get(f"/medidas/atletas/{ids['João Silva']}")
+    assert len(response.json()) == 1
+
+    response = await client.post(f"/atletas/{ids['Maria Santos']}/restaurar")
+    assert response.status_code == 404
+
+    # O atleta restaurado não volta ao arquivo no ciclo seguinte
+    assert await atleta_archiver.archive(engines={"default": engine}, inactive_days=365) == 0
+    response = await client.get(f"/atletas/{ids['João Silva']}?fields=nome")
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_archive_and_restore_publish_events(client: AsyncClient):
+    """Testa que o arquivamento publica 'archived' por lote e a restauração publica 'created'"""
+    ids = await _seed(client)
+    subscription = atleta_events.subscribe()
+    try:
+        await atleta_archiver.archive(engines={"default": engine}, inactive_days=365)
+        event = subscription.queue.get_nowait()
+        assert (event.type, event.data) == ("archived", {"ids": [ids["João Silva"]]})
+
+        await client.post(f"/atletas/{ids['João Silva']}/restaurar")
+        event = subscription.queue.get_nowait()
+        assert event.type == "created"
+        assert (event.data["id"], event.data["cpf"]) == (ids["João Silva"], "12345678909")
+    finally:
+        atleta_events.unsubscribe(subscription)
@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+
+from workout_api.atleta.batcher import atleta_batcher
+from workout_api.configs.settings import settings
+
+
+def _atleta(nome: str, cpf: str) -> dict:
+    return {
+        "nome": nome,
+        "cpf": cpf,
+        "idade": 25,
+        "peso": 75.5,
+        "altura": 1.70,
+        "sexo": "M",
+        "categoria": {"nome": "Scale"},
+        "centro_treinamento": {"nome": "CT King"}
+    }
+
+
+@pytest.mark.asyncio
+async def test_batched_inserts_resolve_duplicates_per_row(client: AsyncClient, monkeypatch):
+    """Testa que inserts concorrentes viram um lote e que CPFs duplicados falham só na própria linha"""
+    await client.post("/categorias/", json={"nome": "Scale"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+    response = await client.post("/atletas/", json=_atleta("Já Cadastrado", "11144477735"))
+    assert response.status_code == 201
+
+    monkeypatch.setattr(settings, "ATLETA_BATCH_ENABLED", True)
+    monkeypatch.setattr(atleta_batcher, "max_delay", 0.05)
+    flushes = []
+    original_flush = atleta_batcher._flush
+
+    async def spy_flush(engine, batch):
+        flushes.append(len(batch))
+        await original_flush(engine, batch)
+
+    monkeypatch.setattr(atleta_batcher, "_flush", spy_flush)
+
+    responses = await asyncio.gather(
+        client.post("/atletas/", json=_atleta("João Silva", "12345678909")),
+        client.post("/atletas/", json=_atleta("Maria Santos", "98765432100")),
+        client.post("/atletas/", json=_atleta("Repetido no Lote", "12345678909")),
+        client.post("/atletas/", json=_atleta("Repetido no Banco", "11144477735")),
+    )
+
+    joao, maria, repetido_lote, repetido_banco = [response.status_code for response in responses]
+    assert sorted([joao, repetido_lote]) == [201, 303]
+    assert maria == 201
+    assert repetido_banco == 303
+    assert flushes == [4]
+
+    ids = {response.json()["id"] for response in responses if response.status_code == 201}
+    assert len(ids) == 2
+
+    listing = (await client.get("/atletas/?fields=cpf")).json()
+    assert listing["total"] == 3
+
+    for atleta_id in ids:
+        medidas = (await client.get(f"/medidas/atletas/{atleta_id}")).json()
+        assert [medida["peso"] for medida in medidas] == [75.5]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_dialect_falls_back_to_direct_insert(client: AsyncClient, monkeypatch):
+    """Testa que, sem suporte do dialeto ao group-commit, o insert segue pelo caminho direto"""
+    await client.post("/categorias/", json={"nome": "Scale"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+
+    monkeypatch.setattr(settings, "ATLETA_BATCH_ENABLED", True)
+    monkeypatch.setattr(atleta_batcher, "supports", lambda engine: False)
+
+    async def fail_submit(db_session, values):
+        raise AssertionError("submit não deveria ser chamado")
+
+    monkeypatch.setattr(atleta_batcher, "submit", fail_submit)
+
+    response = await client.post("/atletas/", json=_atleta("João Silva", "12345678909"))
+    assert response.status_code == 201
+    response = await client.post("/atletas/", json=_atleta("João Silva", "12345678909"))
+    assert response.status_code == 303
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_open_window(client: AsyncClient, monkeypatch):
+    """Testa que o shutdown grava a janela aberta e aguarda o lote, sem esperar o max_delay"""
+    await client.post("/categorias/", json={"nome": "Scale"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+
+    monkeypatch.setattr(settings, "ATLETA_BATCH_ENABLED", True)
+    monkeypatch.setattr(atleta_batcher, "max_delay", 60)
+
+    request = asyncio.create_task(client.post("/atletas/", json=_atleta("João Silva", "12345678909")))
+    while not atleta_batcher._pending:
+        await asyncio.sleep(0.01)
+
+    await atleta_batcher.stop()
+    assert atleta_batcher._tasks == set()
+    assert atleta_batcher._timers == {}
+    response = await request
+    assert response.status_code == 201
@@ -0,0 +1,196 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from workout_api.atleta.controller import build_atletas_query, project_atletas_query
+from workout_api.atleta.schemas import AtletaSort
+from tests.conftest import engine
+
+
+async def _seed(client: AsyncClient):
+    await client.post("/categorias/", json={"nome": "Scale"})
+    await client.post("/categorias/", json={"nome": "RX"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT Queen",
+        "endereco": "Rua Y",
+        "proprietario": "Ana"
+    })
+
+    atletas = [
+        ("João Silva", "12345678909", 25, 75.5, 1.70, "M", "Scale", "CT King"),
+        ("Maria Santos", "98765432100", 28, 62.0, 1.65, "F", "RX", "CT King"),
+        ("Ana Souza", "11144477735", 35, 58.0, 1.60, "F", "RX", "CT Queen"),
+    ]
+    for nome, cpf, idade, peso, altura, sexo, categoria, centro in atletas:
+        response = await client.post("/atletas/", json={
+            "nome": nome,
+            "cpf": cpf,
+            "idade": idade,
+            "peso": peso,
+            "altura": altura,
+            "sexo": sexo,
+            "categoria": {"nome": categoria},
+            "centro_treinamento": {"nome": centro}
+        })
+        assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_filter_atletas_by_categoria_and_sexo(client: AsyncClient):
+    """Testa filtros combinados por categoria (nome) e sexo"""
+    await _seed(client)
+
+    response = await client.get("/atletas/?categoria=RX&sexo=F")
+    assert response.status_code == 200
+    nomes = {item["nome"] for item in response.json()["items"]}
+    assert nomes == {"Maria Santos", "Ana Souza"}
+
+
+@pytest.mark.asyncio
+async def test_filter_atletas_by_centro_id_and_idade_range(client: AsyncClient):
+    """Testa filtros por id do centro e faixa de idade"""
+    await _seed(client)
+    centros = (await client.get("/centros_treinamento/")).json()
+    centro_id = next(centro["id"] for centro in centros if centro["nome"] == "CT King")
+
+    response = await client.get(f"/atletas/?centro_treinamento_id={centro_id}&idade_min=26&idade_max=40")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["nome"] == "Maria Santos"
+
+
+@pytest.mark.asyncio
+async def test_sort_atletas(client: AsyncClient):
+    """Testa a ordenação decrescente por peso"""
+    await _seed(client)
+
+    response = await client.get("/atletas/?sort=-peso")
+    assert response.status_code == 200
+    nomes = [item["nome"] for item in response.json()["items"]]
+    assert nomes == ["João Silva", "Maria Santos", "Ana Souza"]
+
+
+@pytest.mark.asyncio
+async def test_sort_atletas_rejects_unknown_field(client: AsyncClient):
+    """Testa que campos de ordenação fora da whitelist retornam 422"""
+    response = await client.get("/atletas/?sort=cpf")
+    assert response.status_code == 422
+
+
+# Volume da tabela nos testes de plano: grande o bastante para um seq scan custar mais
+# que o índice certo, com as estatísticas coletadas por ANALYZE
+PLAN_ATLETAS = 100_000
+
+
+@pytest.fixture
+async def atletas_volume():
+    """100 categorias e 100 centros com atletas distribuídos de forma uniforme e determinística"""
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO categorias (nome) SELECT 'Categoria ' || i FROM generate_series(1, 100) i"
+        ))
+        await conn.execute(text(
+            "INSERT INTO centros_treinamento (nome, endereco, proprietario, shard) "
+            "SELECT 'Centro ' || i, 'Rua X', 'Marcos', 'default' FROM generate_series(1, 100) i"
+        ))
+        await conn.execute(text(f"""
+            INSERT INTO atletas (
+                nome, cpf, idade, peso, altura, sexo, created_at, categoria_id, centro_treinamento_id
+            )
+            SELECT
+                'Atleta ' || md5(i::text),
+                lpad(i::text, 11, '0'),
+                18 + i * 37 % 63,
+                50 + i * 13 % 5000 / 100.0,
+                1.5 + i * 17 % 500 / 1000.0,
+                CASE WHEN i / 7 % 2 = 0 THEN 'M' ELSE 'F' END,
+                now() - i * interval '1 minute',
+                i % 100 + 1,
+                i / 100 % 100 + 1
+            FROM generate_series(1, {PLAN_ATLETAS}) i
+        """))
+        await conn.execute(text("ANALYZE categorias, centros_treinamento, atletas"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filters, index", [
+    ({"categoria_id": 1, "sexo": "M", "idade_min": 18, "idade_max": 35}, "ix_atletas_categoria_sexo_idade"),
+    ({"centro_treinamento_id": 1, "sexo": "F", "idade_min": 18}, "ix_atletas_centro_sexo_idade"),
+    ({"sexo": "F", "idade_min": 80}, "ix_atletas_sexo_idade"),
+    ({"cpf": "00000012345"}, "atletas_cpf_key"),
+    ({"peso_min": 99.8}, "ix_atletas_peso"),
+    ({"altura_min": 1.998}, "ix_atletas_altura"),
+    ({"categoria": "Categoria 1", "sort": AtletaSort.nome}, "ix_atletas_categoria_nome"),
+    ({"centro_treinamento": "Centro 1", "sort": AtletaSort.nome_desc}, "ix_atletas_centro_nome"),
+    ({"categoria": "Categoria 1", "sort": AtletaSort.peso}, "ix_atletas_categoria_peso"),
+    ({"categoria_id": 1, "sort": AtletaSort.peso_desc}, "ix_atletas_categoria_peso"),
+    ({"sort": AtletaSort.nome}, "ix_atletas_nome"),
+    ({"sort": AtletaSort.idade_desc}, "ix_atletas_idade"),
+    ({"sort": AtletaSort.peso}, "ix_atletas_peso"),
+    ({"sort": AtletaSort.altura_desc}, "ix_atletas_altura"),
+    ({"sort": AtletaSort.created_at_desc}, "ix_atletas_created_at"),
+])
+async def test_atletas_query_plan_uses_index(atletas_volume, filters, index):
+    """
+    Testa que cada combinação suportada de filtro/ordenação usa o seu índice, com seq scan permitido.
+
+    Com ordenação, o plano verificado é o da página (LIMIT do tamanho padrão); só com
+    filtros, o do COUNT do total, que percorre todas as linhas do filtro.
+    """
+    query = build_atletas_query(**filters)
+    if "sort" in filters:
+        query = query.limit(50)
+    else:
+        query = select(func.count()).select_from(query.order_by(None).subquery())
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    async with engine.connect() as conn:
+        plan = "\n".join(row[0] for row in await conn.execute(text(f"EXPLAIN {sql}")))
+
+    assert index in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_atletas_sparse_fieldset(client: AsyncClient):
+    """Testa que `fields=` retorna apenas os campos solicitados"""
+    await _seed(client)
+
+    response = await client.get("/atletas/?fields=nome,idade&sort=idade")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0] == {"nome": "João Silva", "idade": 25}
+
+
+@pytest.mark.asyncio
+async def test_atleta_get_sparse_fieldset(client: AsyncClient):
+    """Testa `fields=` no GET por id, incluindo campos de relacionamento"""
+    await _seed(client)
+    atleta_id = (await client.get("/atletas/?fields=id&cpf=98765432100")).json()["items"][0]["id"]
+
+    response = await client.get(f"/atletas/{atleta_id}?fields=cpf,categoria")
+    assert response.status_code == 200
+    assert response.json() == {"cpf": "98765432100", "categoria": {"nome": "RX"}}
+
+
+@pytest.mark.asyncio
+async def test_atletas_sparse_fieldset_invalid_field(client: AsyncClient):
+    """Testa que campos desconhecidos em `fields=` retornam 422"""
+    response = await client.get("/atletas/?fields=nome,senha")
+    assert response.status_code == 422
+
+
+def test_sparse_fieldset_skips_joins():
+    """Testa que os JOINs só são emitidos quando categoria/centro são solicitados"""
+    sql = str(project_atletas_query(build_atletas_query(), ["nome", "peso"]))
+    assert "JOIN" not in sql
+
+    sql = str(project_atletas_query(build_atletas_query(), ["nome", "categoria"]))
+    assert "JOIN categorias" in sql
+    assert "centros_treinamento" not in sql
@@ -0,0 +1,98 @@
+import pytest
+from httpx import AsyncClient
+
+from workout_api.atleta.events import atleta_events
+
+CATEGORIA = {"metodo": "POST", "caminho": "/categorias/", "corpo": {"nome": "Scale"}}
+CENTRO = {"metodo": "POST", "caminho": "/centros_treinamento/", "corpo": {
+    "nome": "CT King",
+    "endereco": "Rua X",
+    "proprietario": "Marcos"
+}}
+
+
+def atleta(nome: str, cpf: str) -> dict:
+    return {"metodo": "POST", "caminho": "/atletas/", "corpo": {
+        "nome": nome,
+        "cpf": cpf,
+        "idade": 25,
+        "peso": 75.5,
+        "altura": 1.70,
+        "sexo": "M",
+        "categoria": {"nome": "Scale"},
+        "centro_treinamento": {"nome": "CT King"}
+    }}
+
+
+@pytest.mark.asyncio
+async def test_batch_executes_operations_in_order(client: AsyncClient):
+    """Testa um lote que cria categoria, centro e atletas e lê o resultado na mesma transação"""
+    response = await client.post("/batch/", json={"operacoes": [
+        CATEGORIA,
+        CENTRO,
+        atleta("João Silva", "12345678909"),
+        atleta("Maria Santos", "98765432100"),
+        {"metodo": "GET", "caminho": "/atletas/?fields=nome&sort=nome"},
+    ]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["confirmado"] is True
+    assert [resultado["status"] for resultado in data["resultados"]] == [201, 201, 201, 201, 200]
+    assert [item["nome"] for item in data["resultados"][-1]["corpo"]["items"]] == ["João Silva", "Maria Santos"]
+
+    response = await client.get("/atletas/?fields=nome")
+    assert response.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_non_atomic_keeps_successful_operations(client: AsyncClient):
+    """Testa que, sem atomicidade, uma operação com falha é desfeita sozinha"""
+    response = await client.post("/batch/", json={"operacoes": [
+        CATEGORIA,
+        CENTRO,
+        atleta("João Silva", "12345678909"),
+        atleta("João Repetido", "12345678909"),
+        atleta("Maria Santos", "98765432100"),
+    ]})
+
+    data = response.json()
+    assert data["confirmado"] is True
+    assert [resultado["status"] for resultado in data["resultados"]] == [201, 201, 201, 303, 201]
+
+    response = await client.get("/atletas/?fields=nome&sort=nome")
+    assert [item["nome"] for item in response.json()["items"]] == ["João Silva", "Maria Santos"]
+
+
+@pytest.mark.asyncio
+async def test_batch_atomic_rolls_back_everything(client: AsyncClient):
+    """Testa que, com atomico=true, a primeira falha desfaz o lote e não publica eventos"""
+    subscription = atleta_events.subscribe()
+    try:
+        response = await client.post("/batch/", json={"atomico": True, "operacoes": [
+            CATEGORIA,
+            CENTRO,
+            atleta("João Silva", "12345678909"),
+            {"metodo": "GET", "caminho": "/categorias/999"},
+            atleta("Maria Santos", "98765432100"),
+        ]})
+        assert subscription.queue.empty()
+    finally:
+        atleta_events.unsubscribe(subscription)
+
+    data = response.json()
+    assert data["confirmado"] is False
+    assert [resultado["status"] for resultado in data["resultados"]] == [201, 201, 201, 404, 424]
+
+    assert (await client.get("/categorias/")).json() == []
+    assert (await client.get("/atletas/")).json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_unknown_routes(client: AsyncClient):
+    """Testa que só as rotas de atletas, categorias e centros são aceitas em lote"""
+    response = await client.post("/batch/", json={"operacoes": [
+        {"metodo": "GET", "caminho": "/atletas/eventos"},
+        {"metodo": "POST", "caminho": "/batch/", "corpo": {"operacoes": []}},
+    ]})
+    assert response.status_code == 422
@@ -0,0 +1,112 @@
+import pytest
+from httpx import AsyncClient
+
+from workout_api.atleta.cpf_index import CpfIndex, cpf_index
+from workout_api.contrib.bloom import BloomFilter
+from tests.conftest import engine
+
+
+async def _seed(client: AsyncClient):
+    await client.post("/categorias/", json={"nome": "Scale"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+    response = await client.post("/atletas/", json={
+        "nome": "João Silva",
+        "cpf": "12345678909",
+        "idade": 25,
+        "peso": 75.5,
+        "altura": 1.70,
+        "sexo": "M",
+        "categoria": {"nome": "Scale"},
+        "centro_treinamento": {"nome": "CT King"}
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Testa que todo item inserido é encontrado e que a taxa de falso positivo fica perto da configurada"""
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f"{i:011d}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"x{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_cpf_index_grows_past_capacity():
+    """Testa que o índice encadeia filtros maiores ao passar da capacidade"""
+    index = CpfIndex(capacity=10, error_rate=0.01)
+    index._filters = [BloomFilter(10, 0.005)]
+    index.ready = True
+
+    cpfs = [f"{i:011d}" for i in range(100)]
+    for cpf in cpfs:
+        index.add(cpf)
+
+    assert len(index._filters) > 1
+    assert all(cpf in index for cpf in cpfs)
+
+
+@pytest.mark.asyncio
+async def test_get_atleta_by_cpf(client: AsyncClient):
+    """Testa a consulta por CPF com o filtro carregado do banco"""
+    atleta = await _seed(client)
+    await cpf_index.load({"default": engine})
+
+    response = await client.get("/atletas/cpf/123.456.789-09?fields=id,nome")
+    assert response.status_code == 200
+    assert response.json() == {"id": atleta["id"], "nome": "João Silva"}
+
+    response = await client.get("/atletas/cpf/98765432100")
+    assert response.status_code == 404
+
+    response = await client.get("/atletas/cpf/12345678900")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_filter_tracks_new_atletas(client: AsyncClient):
+    """Testa que CPFs criados após a carga entram no filtro e duplicatas são barradas"""
+    await cpf_index.load({"default": engine})
+    assert cpf_index.ready and "12345678909" not in cpf_index
+
+    await _seed(client)
+    assert "12345678909" in cpf_index
+
+    response = await client.get("/atletas/cpf/12345678909")
+    assert response.status_code == 200
+
+    response = await client.post("/atletas/", json={
+        "nome": "Outro João",
+        "cpf": "12345678909",
+        "idade": 30,
+        "peso": 80.0,
+        "altura": 1.80,
+        "sexo": "M",
+        "categoria": {"nome": "Scale"},
+        "centro_treinamento": {"nome": "CT King"}
+    })
+    assert response.status_code == 303
+
+
+@pytest.mark.asyncio
+async def test_filter_miss_queries_database_unless_authoritative(client: AsyncClient, monkeypatch):
+    """Testa que um "não" do filtro só dispensa o banco quando o filtro é autoritativo"""
+    atleta = await _seed(client)
+    # Filtro pronto que não viu o cadastro (feito em outro worker, por COPY ou SQL manual)
+    cpf_index._filters = [BloomFilter(cpf_index.capacity, cpf_index.error_rate)]
+    cpf_index.ready = True
+    assert "12345678909" not in cpf_index
+
+    response = await client.get("/atletas/cpf/12345678909?fields=id")
+    assert response.json() == {"id": atleta["id"]}
+
+    monkeypatch.setattr(cpf_index, "authoritative", True)
+    response = await client.get("/atletas/cpf/12345678909")
+    assert response.status_code == 404
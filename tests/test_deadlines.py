@@ -0,0 +1,118 @@
+import asyncio
+import time
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.exc import DBAPIError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from workout_api.contrib.deadlines import (
+    DeadlineMiddleware,
+    apply_statement_timeout,
+    request_deadline,
+    resolve_deadline_ms,
+)
+from workout_api.contrib.exception_handlers import dbapi_exception_handler
+
+
+def test_resolve_deadline_longest_prefix():
+    """Testa a escolha do deadline pelo prefixo mais longo e pelo método"""
+    routes = {"/atletas": 3000, "GET /atletas/eventos": 0, "POST /atletas": 1000}
+    assert resolve_deadline_ms("GET", "/atletas/1", routes, 30000) == 3000
+    assert resolve_deadline_ms("POST", "/atletas/", routes, 30000) == 1000
+    assert resolve_deadline_ms("GET", "/atletas/eventos", routes, 30000) == 0
+    assert resolve_deadline_ms("GET", "/categorias/", routes, 30000) == 30000
+
+
+def test_statement_timeout_uses_remaining_deadline():
+    """Testa que o SET LOCAL statement_timeout recebe o tempo restante do deadline"""
+    executed = []
+
+    class FakeDialect:
+        name = "postgresql"
+
+    class FakeConnection:
+        dialect = FakeDialect()
+
+        def exec_driver_sql(self, sql):
+            executed.append(sql)
+
+    token = request_deadline.set(time.monotonic() + 2)
+    try:
+        apply_statement_timeout(None, None, FakeConnection())
+    finally:
+        request_deadline.reset(token)
+    apply_statement_timeout(None, None, FakeConnection())
+
+    assert len(executed) == 1
+    timeout_ms = int(executed[0].rsplit(" ", 1)[1])
+    assert 1900 <= timeout_ms <= 2000
+
+
+@pytest.mark.asyncio
+async def test_deadline_middleware_returns_504_and_cancels_handler():
+    """Testa que o handler é cancelado no deadline e a resposta é 504"""
+    cancelled = asyncio.Event()
+
+    async def slow(request: Request):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return PlainTextResponse("ok")
+
+    async def fast(request: Request):
+        return PlainTextResponse("ok")
+
+    app = Starlette(routes=[Route("/slow", slow), Route("/fast", fast)])
+    app.add_middleware(DeadlineMiddleware, default_ms=5000, route_deadlines={"/slow": 50})
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/slow")
+        assert response.status_code == 504
+        assert cancelled.is_set()
+
+        response = await client.get("/fast")
+        assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_deadline_middleware_cancels_on_client_disconnect():
+    """Testa que a desconexão do cliente cancela o handler em andamento"""
+    cancelled = asyncio.Event()
+
+    async def slow(scope, receive, send):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    middleware = DeadlineMiddleware(slow, default_ms=5000)
+    messages = [{"type": "http.request", "body": b"", "more_body": False}, {"type": "http.disconnect"}]
+
+    async def receive():
+        await asyncio.sleep(0.01)
+        return messages.pop(0)
+
+    async def send(message):
+        raise AssertionError("nenhuma resposta deve ser enviada")
+
+    await middleware({"type": "http", "method": "GET", "path": "/slow"}, receive, send)
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_statement_timeout_maps_to_504():
+    """Testa que o erro de statement_timeout (SQLSTATE 57014) vira 504"""
+    class QueryCanceled(Exception):
+        sqlstate = "57014"
+
+    exc = DBAPIError("SELECT 1", {}, QueryCanceled("canceling statement due to statement timeout"))
+    request = Request({"type": "http", "method": "GET", "path": "/atletas/", "headers": [], "query_string": b""})
+
+    response = await dbapi_exception_handler(request, exc)
+    assert response.status_code == 504
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from workout_api.contrib.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+def _app(store: IdempotencyStore, calls: list, release: asyncio.Event) -> Starlette:
+    async def criar(request: Request):
+        corpo = await request.json()
+        calls.append(corpo)
+        await release.wait()
+        if corpo.get("falhar"):
+            return JSONResponse({"detail": "erro"}, status_code=500)
+        return JSONResponse({"id": len(calls), **corpo}, status_code=201)
+
+    app = Starlette(routes=[Route("/itens/", criar, methods=["POST"])])
+    app.add_middleware(IdempotencyMiddleware, store=store, paths=("/itens/",))
+    return app
+
+
+@pytest.mark.asyncio
+async def test_idempotency_waits_and_replays():
+    """Testa que repetições concorrentes esperam a primeira execução e recebem a mesma resposta"""
+    store, calls, release = IdempotencyStore(max_bytes=1024, ttl=60), [], asyncio.Event()
+    async with AsyncClient(app=_app(store, calls, release), base_url="http://test") as ac:
+        headers = {"Idempotency-Key": "abc"}
+        requests = [asyncio.create_task(ac.post("/itens/", json={"nome": "RX"}, headers=headers)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        assert store.stats()["em_andamento"] == 1
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+        assert len(calls) == 1
+        assert {(response.status_code, response.text) for response in responses} == {(201, '{"id":1,"nome":"RX"}')}
+        assert sum(response.headers.get("idempotent-replayed") == "true" for response in responses) == 4
+
+        response = await ac.post("/itens/", json={"nome": "Scale"}, headers=headers)
+        assert response.status_code == 422
+
+        response = await ac.post("/itens/", json={"nome": "RX"})
+        assert response.status_code == 201
+        assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_idempotency_store_is_bounded_and_skips_5xx():
+    """Testa a expiração por TTL, o limite em bytes e que respostas 5xx não são guardadas"""
+    store, calls, release = IdempotencyStore(max_bytes=100, ttl=60), [], asyncio.Event()
+    release.set()
+    async with AsyncClient(app=_app(store, calls, release), base_url="http://test") as ac:
+        for key in ("a", "a"):
+            await ac.post("/itens/", json={"falhar": True}, headers={"Idempotency-Key": key})
+        assert len(calls) == 2
+        assert store.stats()["entradas"] == 0
+
+        for key in ("k1", "k2", "k3"):
+            await ac.post("/itens/", json={"nome": "RX"}, headers={"Idempotency-Key": key})
+        assert store.size <= 100
+        assert store.stats()["entradas"] == 1
+        assert store.get(("/itens/", "k3")) is not None
+
+        store.ttl = 0
+        response = await ac.post("/itens/", json={"nome": "RX"}, headers={"Idempotency-Key": "k3"})
+        assert "idempotent-replayed" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_idempotent_atleta_post(client: AsyncClient):
+    """Testa que o POST /atletas/ repetido com a mesma chave devolve o 201 original em vez de 303"""
+    headers = {"Idempotency-Key": "cadastro-joao"}
+    await client.post("/categorias/", json={"nome": "RX"}, headers={"Idempotency-Key": "categoria-rx"})
+    response = await client.post("/categorias/", json={"nome": "RX"}, headers={"Idempotency-Key": "categoria-rx"})
+    assert response.status_code == 201
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+
+    atleta = {
+        "nome": "João Silva",
+        "cpf": "12345678909",
+        "idade": 25,
+        "peso": 75.5,
+        "altura": 1.80,
+        "sexo": "M",
+        "categoria": {"nome": "RX"},
+        "centro_treinamento": {"nome": "CT King"}
+    }
+    responses = await asyncio.gather(*(client.post("/atletas/", json=atleta, headers=headers) for _ in range(3)))
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len({response.json()["id"] for response in responses}) == 1
+
+    response = await client.post("/atletas/", json=atleta)
+    assert response.status_code == 303
+
+
+@pytest.mark.asyncio
+async def test_idempotency_ignores_truncated_upload():
+    """Testa que um upload interrompido não executa nem reserva a chave para o corpo parcial"""
+    store, calls, release = IdempotencyStore(max_bytes=1024, ttl=60), [], asyncio.Event()
+    release.set()
+    app = _app(store, calls, release)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/itens/",
+        "raw_path": b"/itens/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"idempotency-key", b"abc")],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+    messages = [
+        {"type": "http.request", "body": b'{"nome": ', "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    assert sent == [] and calls == []
+    assert store.stats()["entradas"] == 0 and store.stats()["em_andamento"] == 0
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/itens/", json={"nome": "RX"}, headers={"Idempotency-Key": "abc"})
+        assert response.status_code == 201
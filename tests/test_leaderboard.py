@@ -0,0 +1,146 @@
+import pytest
+from httpx import AsyncClient
+
+from workout_api.configs.settings import settings
+from workout_api.leaderboard.cache import WorkoutRanking
+
+
+ATLETAS = [
+    ("João Silva", "12345678909", "M", "RX", "CT King"),
+    ("Maria Santos", "98765432100", "F", "RX", "CT King"),
+    ("Ana Souza", "11144477735", "F", "RX", "CT Queen"),
+    ("Pedro Lima", "52998224725", "M", "Scale", "CT Queen"),
+]
+
+
+async def _seed(client: AsyncClient) -> dict:
+    ids = {}
+    for nome in ("RX", "Scale"):
+        ids[nome] = (await client.post("/categorias/", json={"nome": nome})).json()["id"]
+    for nome in ("CT King", "CT Queen"):
+        ids[nome] = (await client.post("/centros_treinamento/", json={
+            "nome": nome,
+            "endereco": "Rua X",
+            "proprietario": "Marcos"
+        })).json()["id"]
+    for nome, cpf, sexo, categoria, centro in ATLETAS:
+        response = await client.post("/atletas/", json={
+            "nome": nome,
+            "cpf": cpf,
+            "idade": 30,
+            "peso": 70.0,
+            "altura": 1.70,
+            "sexo": sexo,
+            "categoria": {"nome": categoria},
+            "centro_treinamento": {"nome": centro}
+        })
+        ids[nome] = response.json()["id"]
+
+    ids["23.1"] = (await client.post("/workouts/", json={"nome": "23.1", "tipo": "repeticoes"})).json()["id"]
+    ids["23.2"] = (await client.post("/workouts/", json={"nome": "23.2", "tipo": "tempo"})).json()["id"]
+    return ids
+
+
+async def _score(client: AsyncClient, atleta_id: int, workout_id: int, valor: float) -> dict:
+    response = await client.post("/scores/", json={"atleta_id": atleta_id, "workout_id": workout_id, "valor": valor})
+    assert response.status_code == 201
+    return response.json()
+
+
+@pytest.fixture(params=[True, False], ids=["cache", "sql"])
+def leaderboard_cache_enabled(request, monkeypatch):
+    monkeypatch.setattr(settings, "LEADERBOARD_CACHE_ENABLED", request.param)
+    return request.param
+
+
+@pytest.mark.asyncio
+async def test_workout_leaderboard(client: AsyncClient, leaderboard_cache_enabled):
+    """Testa o ranking de um workout com empate e filtro por centro"""
+    ids = await _seed(client)
+    await _score(client, ids["João Silva"], ids["23.1"], 180)
+    await _score(client, ids["Maria Santos"], ids["23.1"], 200)
+    await _score(client, ids["Ana Souza"], ids["23.1"], 180)
+
+    response = await client.get(f"/leaderboard/workouts/{ids['23.1']}")
+    assert response.status_code == 200
+    ranking = [(item["posicao"], item["nome"]) for item in response.json()]
+    assert ranking == [(1, "Maria Santos"), (2, "João Silva"), (2, "Ana Souza")]
+
+    response = await client.get(f"/leaderboard/workouts/{ids['23.1']}?centro_treinamento_id={ids['CT Queen']}")
+    assert [(item["posicao"], item["nome"]) for item in response.json()] == [(1, "Ana Souza")]
+
+    response = await client.get(f"/leaderboard/workouts/{ids['23.1']}/atletas/{ids['Ana Souza']}")
+    assert response.status_code == 200
+    assert response.json()["posicao"] == 2
+
+
+@pytest.mark.asyncio
+async def test_workout_leaderboard_reflects_score_updates(client: AsyncClient, leaderboard_cache_enabled):
+    """Testa que PATCH e DELETE de scores atualizam o leaderboard já carregado"""
+    ids = await _seed(client)
+    await _score(client, ids["João Silva"], ids["23.2"], 300)
+    maria = await _score(client, ids["Maria Santos"], ids["23.2"], 320)
+
+    response = await client.get(f"/leaderboard/workouts/{ids['23.2']}")
+    assert [item["nome"] for item in response.json()] == ["João Silva", "Maria Santos"]
+
+    await client.patch(f"/scores/{maria['id']}", json={"valor": 290})
+    response = await client.get(f"/leaderboard/workouts/{ids['23.2']}")
+    assert [item["nome"] for item in response.json()] == ["Maria Santos", "João Silva"]
+
+    await client.delete(f"/atletas/{ids['Maria Santos']}")
+    response = await client.get(f"/leaderboard/workouts/{ids['23.2']}")
+    assert [item["nome"] for item in response.json()] == ["João Silva"]
+
+
+@pytest.mark.asyncio
+async def test_geral_leaderboard(client: AsyncClient):
+    """Testa o leaderboard geral somando posições e filtrando por categoria"""
+    ids = await _seed(client)
+    await _score(client, ids["João Silva"], ids["23.1"], 200)
+    await _score(client, ids["Maria Santos"], ids["23.1"], 180)
+    await _score(client, ids["João Silva"], ids["23.2"], 280)
+    await _score(client, ids["Maria Santos"], ids["23.2"], 300)
+    await _score(client, ids["Ana Souza"], ids["23.2"], 290)
+
+    response = await client.get(f"/leaderboard/?categoria_id={ids['RX']}")
+    assert response.status_code == 200
+    ranking = [(item["posicao"], item["nome"], item["pontos"], item["workouts"]) for item in response.json()]
+    assert ranking == [
+        (1, "João Silva", 2, 2),
+        (2, "Maria Santos", 5, 2),
+        (3, "Ana Souza", 2, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_score_workout_categoria_mismatch(client: AsyncClient):
+    """Testa que um atleta não pode pontuar em workout de outra categoria"""
+    ids = await _seed(client)
+    workout = (await client.post("/workouts/", json={
+        "nome": "Scale 1",
+        "tipo": "carga",
+        "categoria_id": ids["Scale"]
+    })).json()
+
+    response = await client.post("/scores/", json={
+        "atleta_id": ids["João Silva"],
+        "workout_id": workout["id"],
+        "valor": 100
+    })
+    assert response.status_code == 400
+
+
+def test_workout_ranking_incremental():
+    """Testa top-N e posição com empates após atualizações incrementais"""
+    ranking = WorkoutRanking(menor_vence=False, scores=[(1, 10.0), (2, 30.0), (3, 20.0)])
+    ranking.upsert(4, 20.0)
+    ranking.upsert(1, 40.0)
+
+    assert ranking.top(10) == [(1, 1, 40.0), (2, 2, 30.0), (3, 3, 20.0), (3, 4, 20.0)]
+    assert ranking.top(2, offset=3) == [(3, 4, 20.0)]
+    assert ranking.rank_of(4) == (3, 20.0)
+
+    ranking.remove(2)
+    assert ranking.rank_of(3) == (2, 20.0)
+    assert ranking.rank_of(2) is None
@@ -0,0 +1,71 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _seed(client: AsyncClient):
+    for nome in ("Scale", "RX", "Masters RX"):
+        await client.post("/categorias/", json={"nome": nome})
+    for nome in ("CT King", "CT Queen"):
+        await client.post("/centros_treinamento/", json={
+            "nome": nome,
+            "endereco": "Rua X",
+            "proprietario": "Marcos"
+        })
+
+    atletas = [
+        ("João Silva", "12345678909", "RX", "CT King"),
+        ("Maria Santos", "98765432100", "RX", "CT King"),
+        ("Ana Souza", "11144477735", "Scale", "CT King"),
+    ]
+    for nome, cpf, categoria, centro in atletas:
+        response = await client.post("/atletas/", json={
+            "nome": nome,
+            "cpf": cpf,
+            "idade": 25,
+            "peso": 70.0,
+            "altura": 1.70,
+            "sexo": "M",
+            "categoria": {"nome": categoria},
+            "centro_treinamento": {"nome": centro}
+        })
+        assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_categorias_search_sort_and_paginate(client: AsyncClient):
+    """Testa busca por nome, ordenação e paginação da listagem de categorias"""
+    await _seed(client)
+
+    response = await client.get("/categorias/?nome=rx&sort=-nome&page=1")
+    data = response.json()
+    assert data["total"] == 2
+    assert [item["nome"] for item in data["items"]] == ["RX", "Masters RX"]
+    assert "total_atletas" not in data["items"][0]
+
+    response = await client.get("/categorias/?sort=nome&size=2&page=2")
+    assert [item["nome"] for item in response.json()["items"]] == ["Scale"]
+
+    # Sem page/size, o formato anterior: a lista completa
+    response = await client.get("/categorias/?sort=nome")
+    assert [item["nome"] for item in response.json()] == ["Masters RX", "RX", "Scale"]
+
+
+@pytest.mark.asyncio
+async def test_listings_with_atleta_counts(client: AsyncClient):
+    """Testa a contagem de atletas (inclusive zero) nas listagens de categorias e centros"""
+    await _seed(client)
+
+    response = await client.get("/categorias/?com_atletas=true&sort=nome")
+    counts = {item["nome"]: item["total_atletas"] for item in response.json()}
+    assert counts == {"Masters RX": 0, "RX": 2, "Scale": 1}
+
+    response = await client.get("/centros_treinamento/?com_atletas=true&nome=queen&size=10")
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["nome"] == "CT Queen"
+    assert data["items"][0]["total_atletas"] == 0
+
+    response = await client.get("/centros_treinamento/?com_atletas=true&sort=-id&size=1")
+    assert response.json()["items"][0]["total_atletas"] == 0
+    response = await client.get("/centros_treinamento/?com_atletas=true&sort=id&size=1")
+    assert response.json()["items"][0]["total_atletas"] == 3
@@ -0,0 +1,105 @@
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+
+from workout_api.medidas.models import MedidaModel
+from tests.conftest import async_session_maker
+
+
+async def _seed(client: AsyncClient) -> int:
+    await client.post("/categorias/", json={"nome": "RX"})
+    await client.post("/centros_treinamento/", json={
+        "nome": "CT King",
+        "endereco": "Rua X",
+        "proprietario": "Marcos"
+    })
+    response = await client.post("/atletas/", json={
+        "nome": "João Silva",
+        "cpf": "12345678909",
+        "idade": 25,
+        "peso": 80.0,
+        "altura": 1.75,
+        "sexo": "M",
+        "categoria": {"nome": "RX"},
+        "centro_treinamento": {"nome": "CT King"}
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_medidas_recorded_on_create_and_patch(client: AsyncClient):
+    """Testa que o cadastro e as alterações de peso, altura ou idade geram medições"""
+    atleta_id = await _seed(client)
+
+    await client.patch(f"/atletas/{atleta_id}", json={"peso": 78.5})
+    await client.patch(f"/atletas/{atleta_id}", json={"nome": "João S. Silva"})
+    await client.patch(f"/atletas/{atleta_id}", json={"peso": 78.5})
+
+    response = await client.get(f"/medidas/atletas/{atleta_id}")
+    assert response.status_code == 200
+    assert [(item["peso"], item["altura"]) for item in response.json()] == [(80.0, 1.75), (78.5, 1.75)]
+
+    response = await client.get("/medidas/atletas/999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_patch_rejects_null_measurements(client: AsyncClient):
+    """Testa que null explícito em campos NOT NULL é rejeitado na validação, sem gerar medição"""
+    atleta_id = await _seed(client)
+
+    for campo in ("peso", "altura", "idade", "nome"):
+        response = await client.patch(f"/atletas/{atleta_id}", json={campo: None})
+        assert response.status_code == 422
+
+    response = await client.get(f"/medidas/atletas/{atleta_id}")
+    assert len(response.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_medidas_series_buckets(client: AsyncClient):
+    """Testa as médias semanais e mensais por atleta e por centro, e o filtro de período"""
+    atleta_id = await _seed(client)
+    centro_id = (await client.get("/centros_treinamento/")).json()[0]["id"]
+
+    medicoes = [
+        (datetime(2024, 1, 1, 8), 80.0),   # segunda-feira
+        (datetime(2024, 1, 7, 20), 82.0),  # domingo da mesma semana
+        (datetime(2024, 1, 8, 9), 79.0),
+        (datetime(2024, 2, 15, 7), 77.0),
+    ]
+    async with async_session_maker() as session:
+        await session.execute(insert(MedidaModel), [
+            {
+                "atleta_id": atleta_id,
+                "centro_treinamento_id": centro_id,
+                "peso": peso,
+                "altura": 1.75,
+                "idade": 25,
+                "registrado_em": registrado_em,
+            }
+            for registrado_em, peso in medicoes
+        ])
+        await session.commit()
+
+    fim = "2024-03-01T00:00:00"
+    response = await client.get(f"/medidas/atletas/{atleta_id}/serie?granularidade=semana&fim={fim}")
+    assert response.status_code == 200
+    pontos = response.json()["pontos"]
+    assert [(ponto["inicio"][:10], ponto["total"], ponto["peso"]) for ponto in pontos] == [
+        ("2024-01-01", 2, 81.0),
+        ("2024-01-08", 1, 79.0),
+        ("2024-02-12", 1, 77.0),
+    ]
+
+    response = await client.get(
+        f"/medidas/centros_treinamento/{centro_id}/serie?granularidade=mes&inicio=2024-01-05T00:00:00&fim={fim}"
+    )
+    pontos = response.json()["pontos"]
+    assert [(ponto["inicio"][:10], ponto["total"]) for ponto in pontos] == [("2024-01-01", 2), ("2024-02-01", 1)]
+
+    response = await client.get("/medidas/centros_treinamento/999/serie")
+    assert response.status_code == 404
@@ -0,0 +1,88 @@
+import pytest
+from httpx import AsyncClient
+
+
+async def _seed(client: AsyncClient) -> dict:
+    await client.post("/categorias/", json={"nome": "RX"})
+    await client.post("/categorias/", json={"nome": "Scale"})
+    for nome in ("CT King", "CT Queen"):
+        await client.post("/centros_treinamento/", json={
+            "nome": nome,
+            "endereco": "Rua X",
+            "proprietario": "Marcos"
+        })
+
+    atletas = [
+        ("Maria Santos", "98765432100", "RX", "CT King"),
+        ("João Silva", "12345678909", "RX", "CT King"),
+        ("Ana Souza", "11144477735", "Scale", "CT King"),
+        ("Carla Dias", "52998224725", "RX", "CT Queen"),
+    ]
+    for nome, cpf, categoria, centro in atletas:
+        response = await client.post("/atletas/", json={
+            "nome": nome,
+            "cpf": cpf,
+            "idade": 25,
+            "peso": 70.0,
+            "altura": 1.70,
+            "sexo": "F",
+            "categoria": {"nome": categoria},
+            "centro_treinamento": {"nome": centro}
+        })
+        assert response.status_code == 201
+
+    centros = (await client.get("/centros_treinamento/")).json()
+    categorias = (await client.get("/categorias/")).json()
+    return {item["nome"]: item["id"] for item in centros + categorias}
+
+
+@pytest.mark.asyncio
+async def test_centro_atletas_keyset_pagination(client: AsyncClient):
+    """Testa a paginação keyset dos atletas de um centro, em ordem de nome"""
+    ids = await _seed(client)
+
+    response = await client.get(f"/centros_treinamento/{ids['CT King']}/atletas?size=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["nome"] for item in data["items"]] == ["Ana Souza", "João Silva"]
+    assert data["items"][0]["categoria"] == {"nome": "Scale"}
+    assert data["items"][0]["centro_treinamento"] == {"nome": "CT King"}
+    assert data["next_cursor"]
+
+    response = await client.get(
+        f"/centros_treinamento/{ids['CT King']}/atletas?size=2&cursor={data['next_cursor']}"
+    )
+    data = response.json()
+    assert [item["nome"] for item in data["items"]] == ["Maria Santos"]
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_categoria_atletas_with_fields(client: AsyncClient):
+    """Testa a listagem de atletas de uma categoria com sparse fieldsets"""
+    ids = await _seed(client)
+
+    response = await client.get(f"/categorias/{ids['RX']}/atletas?fields=nome,centro_treinamento")
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        {"nome": "Carla Dias", "centro_treinamento": {"nome": "CT Queen"}},
+        {"nome": "João Silva", "centro_treinamento": {"nome": "CT King"}},
+        {"nome": "Maria Santos", "centro_treinamento": {"nome": "CT King"}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_nested_atletas_empty_and_missing_parent(client: AsyncClient):
+    """Testa pai sem atletas (página vazia), pai inexistente (404) e cursor inválido (422)"""
+    await client.post("/categorias/", json={"nome": "Masters"})
+    categoria_id = (await client.get("/categorias/")).json()[0]["id"]
+
+    response = await client.get(f"/categorias/{categoria_id}/atletas")
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+
+    response = await client.get("/centros_treinamento/999/atletas")
+    assert response.status_code == 404
+
+    response = await client.get(f"/categorias/{categoria_id}/atletas?cursor=invalido")
+    assert response.status_code == 422
@@ -0,0 +1,71 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from pydantic import BaseModel
+from sqlalchemy import text
+
+from workout_api.contrib.profiling import ProfileReports, ProfilingMiddleware
+from tests.conftest import async_session_maker
+
+
+class Entrada(BaseModel):
+    nome: str
+
+
+def build_app(reports: ProfileReports, **options) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/eco")
+    async def eco(entrada: Entrada) -> Entrada:
+        async with async_session_maker() as session:
+            await session.execute(text("SELECT 1"))
+        return entrada
+
+    app.add_middleware(ProfilingMiddleware, reports=reports, **options)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_profiling_only_flagged_requests():
+    """Testa que só requisições com o header ou o query param são perfiladas"""
+    reports = ProfileReports(10)
+    async with AsyncClient(app=build_app(reports), base_url="http://test") as client:
+        response = await client.post("/eco", json={"nome": "RX"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+        assert reports.summaries() == []
+
+        response = await client.post("/eco?_profile=1", json={"nome": "RX"})
+        assert response.json() == {"nome": "RX"}
+        report = reports.get(response.headers["x-profile-id"])
+
+    assert report["metodo"] == "POST"
+    assert report["caminho"] == "/eco"
+    assert report["status"] == 200
+    assert set(report["fases_ms"]) == {"validacao", "handler", "serializacao", "sql"}
+    assert report["fases_ms"]["handler"] > 0
+    assert report["sql"]["queries"] >= 1
+    assert any("SELECT 1" in query["sql"] for query in report["sql"]["mais_lentas"])
+    assert report["funcoes"]
+
+
+@pytest.mark.asyncio
+async def test_profiling_token_and_history(tmp_path):
+    """Testa o token exigido no header, o limite do histórico e os arquivos gravados"""
+    reports = ProfileReports(2)
+    app = build_app(reports, token="segredo", directory=str(tmp_path))
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/eco", json={"nome": "RX"}, headers={"X-Profile": "errado"})
+        assert "x-profile-id" not in response.headers
+        response = await client.post("/eco", json={"nome": "RX"}, headers=[("X-Profile", b"\xff\xfe")])
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+        ids = []
+        for _ in range(3):
+            response = await client.post("/eco", json={"nome": "RX"}, headers={"X-Profile": "segredo"})
+            ids.append(response.headers["x-profile-id"])
+
+    assert [summary["id"] for summary in reports.summaries()] == [ids[2], ids[1]]
+    assert (tmp_path / f"{ids[2]}.prof").exists()
+    assert (tmp_path / f"{ids[2]}.json").exists()
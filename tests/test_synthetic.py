@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from workout_api.contrib.validators import validate_cpf
+from workout_api.synthetic.generator import GeradorAtletas, cpf_check_digits, cpfs_as_strings
+from workout_api.medidas.models import MedidaModel
+from workout_api.synthetic.loader import load_atletas
+from tests.conftest import async_session_maker, engine
+
+
+def test_cpf_check_digits_match_validator():
+    """Testa os dígitos verificadores calculados em lote contra CPFs conhecidos e o validador"""
+    cpfs = cpfs_as_strings(cpf_check_digits(np.array([123456789, 987654321, 111444777, 529982247])))
+    assert cpfs == ["12345678909", "98765432100", "11144477735", "52998224725"]
+
+    lote = GeradorAtletas(seed=7).lote(0, 5000)
+    assert all(validate_cpf(cpf) == cpf for cpf in lote["cpf"])
+
+
+def test_generator_is_deterministic_and_unique():
+    """Testa que a mesma semente gera os mesmos dados e que lotes disjuntos não repetem CPF"""
+    primeiro = GeradorAtletas(seed=1).lote(0, 1000)
+    assert primeiro["nome"] == GeradorAtletas(seed=1).lote(0, 1000)["nome"]
+    assert primeiro["cpf"] != GeradorAtletas(seed=2).lote(0, 1000)["cpf"]
+
+    segundo = GeradorAtletas(seed=1).lote(1000, 1000)
+    assert len(set(primeiro["cpf"]) | set(segundo["cpf"])) == 2000
+
+
+def test_generator_skew():
+    """Testa a distribuição Zipf dos centros (skew 0: uniforme)"""
+    concentrado = np.bincount(GeradorAtletas(centros=10, skew_centros=2.0).lote(0, 20000)["centro"], minlength=10)
+    uniforme = np.bincount(GeradorAtletas(centros=10, skew_centros=0).lote(0, 20000)["centro"], minlength=10)
+    assert concentrado[0] > 0.5 * concentrado.sum()
+    assert uniforme.max() < 0.15 * uniforme.sum()
+
+
+@pytest.mark.asyncio
+async def test_load_atletas(client: AsyncClient):
+    """Testa a carga em lotes, com criação das categorias e centros"""
+    gerador = GeradorAtletas(seed=3, categorias=3, centros=4)
+    assert await load_atletas(engine, gerador, 2500, lote=1000) == 2500
+
+    response = await client.get("/categorias/?com_atletas=true&size=10")
+    data = response.json()
+    assert data["total"] == 3
+    assert sum(item["total_atletas"] for item in data["items"]) == 2500
+
+    response = await client.get("/atletas/?size=1&fields=id,peso")
+    data = response.json()
+    assert data["total"] == 2500
+
+    # Cada atleta carregado tem a medição inicial, como no POST /atletas/
+    async with async_session_maker() as session:
+        assert (await session.execute(select(func.count()).select_from(MedidaModel))).scalar() == 2500
+    response = await client.get(f"/medidas/atletas/{data['items'][0]['id']}")
+    assert [medida["peso"] for medida in response.json()] == [data["items"][0]["peso"]]
@@ -0,0 +1,139 @@
+from typing import Optional
+from fastapi import APIRouter, status, HTTPException, Query
+
+from workout_api.analytics.schemas import (
+    CampoAnalitico,
+    Dimensao,
+    FaixaHistograma,
+    Grupo,
+    GruposOut,
+    HistogramaOut,
+    PercentisOut,
+    SnapshotStatus,
+)
+from workout_api.analytics.snapshot import AtletaSnapshot, atleta_snapshot
+
+router = APIRouter()
+
+
+def loaded_snapshot() -> AtletaSnapshot:
+    if not atleta_snapshot.loaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Snapshot analítico indisponível (ANALYTICS_ENABLED desligado ou carga em andamento)'
+        )
+    return atleta_snapshot
+
+
+@router.get(
+    '/',
+    summary='Estado do snapshot analítico',
+    status_code=status.HTTP_200_OK,
+    response_model=SnapshotStatus,
+)
+async def snapshot_status() -> SnapshotStatus:
+    snapshot = loaded_snapshot()
+    return SnapshotStatus(total=snapshot.total, atualizado_em=snapshot.refreshed_at)
+
+
+@router.get(
+    '/percentis',
+    summary='Percentis de uma métrica dos atletas',
+    status_code=status.HTTP_200_OK,
+    response_model=PercentisOut,
+    description="""
+    Percentis de `idade`, `peso`, `altura` ou `imc` (peso / altura²), calculados sobre o
+    snapshot colunar em memória, sem consulta ao banco.
+
+    **Exemplos:**
+    - `/analytics/percentis?campo=imc&p=50&p=90`
+    - `/analytics/percentis?campo=peso&categoria=RX&sexo=F`
+    """,
+)
+async def percentis(
+    campo: CampoAnalitico = Query(..., description="Métrica"),
+    p: list[float] = Query([25, 50, 75], description="Percentis (0 a 100)"),
+    categoria: Optional[str] = Query(None, description="Filtrar pelo nome da categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Filtrar pelo nome do centro de treinamento"),
+    sexo: Optional[str] = Query(None, description="Filtrar por sexo (M/F)", pattern='^[MF]$'),
+) -> PercentisOut:
+    if any(not 0 <= percentil <= 100 for percentil in p):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='Percentis devem estar entre 0 e 100'
+        )
+
+    snapshot = loaded_snapshot()
+    mask = snapshot.mask(categoria, centro_treinamento, sexo)
+    valores = snapshot.percentiles(campo, p, mask)
+
+    return PercentisOut(
+        campo=campo,
+        total=int(mask.sum()),
+        atualizado_em=snapshot.refreshed_at,
+        percentis={f'{percentil:g}': valor for percentil, valor in valores.items()},
+    )
+
+
+@router.get(
+    '/histograma',
+    summary='Histograma de uma métrica dos atletas',
+    status_code=status.HTTP_200_OK,
+    response_model=HistogramaOut,
+)
+async def histograma(
+    campo: CampoAnalitico = Query(..., description="Métrica"),
+    faixas: int = Query(10, ge=1, le=200, description="Quantidade de faixas"),
+    categoria: Optional[str] = Query(None, description="Filtrar pelo nome da categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Filtrar pelo nome do centro de treinamento"),
+    sexo: Optional[str] = Query(None, description="Filtrar por sexo (M/F)", pattern='^[MF]$'),
+) -> HistogramaOut:
+    snapshot = loaded_snapshot()
+    mask = snapshot.mask(categoria, centro_treinamento, sexo)
+
+    return HistogramaOut(
+        campo=campo,
+        total=int(mask.sum()),
+        atualizado_em=snapshot.refreshed_at,
+        faixas=[
+            FaixaHistograma(inicio=inicio, fim=fim, total=total)
+            for inicio, fim, total in snapshot.histogram(campo, faixas, mask)
+        ],
+    )
+
+
+@router.get(
+    '/grupos',
+    summary='Agregados de uma métrica por dimensão',
+    status_code=status.HTTP_200_OK,
+    response_model=GruposOut,
+    description="""
+    Total, média, mínimo e máximo de uma métrica agrupados por uma ou mais dimensões
+    (`categoria`, `centro_treinamento`, `sexo`, `faixa_etaria`).
+
+    **Exemplos:**
+    - `/analytics/grupos?campo=peso&por=categoria`
+    - `/analytics/grupos?campo=imc&por=centro_treinamento&por=faixa_etaria&largura_faixa=5`
+    """,
+)
+async def grupos(
+    campo: CampoAnalitico = Query(..., description="Métrica"),
+    por: list[Dimensao] = Query(..., description="Dimensões de agrupamento"),
+    largura_faixa: int = Query(10, ge=1, le=100, description="Largura (anos) das faixas etárias"),
+    categoria: Optional[str] = Query(None, description="Filtrar pelo nome da categoria"),
+    centro_treinamento: Optional[str] = Query(None, description="Filtrar pelo nome do centro de treinamento"),
+    sexo: Optional[str] = Query(None, description="Filtrar por sexo (M/F)", pattern='^[MF]$'),
+) -> GruposOut:
+    snapshot = loaded_snapshot()
+    mask = snapshot.mask(categoria, centro_treinamento, sexo)
+    dimensoes = list(dict.fromkeys(por))
+
+    return GruposOut(
+        campo=campo,
+        total=int(mask.sum()),
+        atualizado_em=snapshot.refreshed_at,
+        grupos=[
+            Grupo(chave=chave, total=total, media=media, minimo=minimo, maximo=maximo)
+            for chave, total, media, minimo, maximo in snapshot.group_by(campo, dimensoes, mask, largura_faixa)
+        ],
+    )
@@ -0,0 +1,54 @@
+from datetime import datetime
+from enum import Enum
+from typing import Annotated
+from pydantic import Field, BaseModel
+
+
+class CampoAnalitico(str, Enum):
+    """Métricas numéricas disponíveis no snapshot analítico"""
+    idade = 'idade'
+    peso = 'peso'
+    altura = 'altura'
+    imc = 'imc'
+
+
+class Dimensao(str, Enum):
+    """Dimensões de agrupamento do snapshot analítico"""
+    categoria = 'categoria'
+    centro_treinamento = 'centro_treinamento'
+    sexo = 'sexo'
+    faixa_etaria = 'faixa_etaria'
+
+
+class SnapshotStatus(BaseModel):
+    total: Annotated[int, Field(description='Atletas no snapshot')]
+    atualizado_em: Annotated[datetime, Field(description='Momento do último refresh do snapshot')]
+
+
+class PercentisOut(SnapshotStatus):
+    campo: Annotated[CampoAnalitico, Field(description='Métrica consultada')]
+    percentis: Annotated[dict[str, float], Field(description='Valor da métrica em cada percentil pedido')]
+
+
+class FaixaHistograma(BaseModel):
+    inicio: Annotated[float, Field(description='Limite inferior da faixa')]
+    fim: Annotated[float, Field(description='Limite superior da faixa')]
+    total: Annotated[int, Field(description='Atletas na faixa')]
+
+
+class HistogramaOut(SnapshotStatus):
+    campo: Annotated[CampoAnalitico, Field(description='Métrica consultada')]
+    faixas: Annotated[list[FaixaHistograma], Field(description='Faixas de mesma largura entre o mínimo e o máximo')]
+
+
+class Grupo(BaseModel):
+    chave: Annotated[dict[str, str], Field(description='Valor de cada dimensão do grupo', example={'categoria': 'RX'})]
+    total: Annotated[int, Field(description='Atletas no grupo')]
+    media: Annotated[float, Field(description='Média da métrica no grupo')]
+    minimo: Annotated[float, Field(description='Menor valor da métrica no grupo')]
+    maximo: Annotated[float, Field(description='Maior valor da métrica no grupo')]
+
+
+class GruposOut(SnapshotStatus):
+    campo: Annotated[CampoAnalitico, Field(description='Métrica agregada')]
+    grupos: Annotated[list[Grupo], Field(description='Agregados por combinação de dimensões')]
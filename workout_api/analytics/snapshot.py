@@ -0,0 +1,348 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.future import select
+
+from workout_api.analytics.schemas import CampoAnalitico, Dimensao
+from workout_api.atleta.models import AtletaModel
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.configs.settings import settings
+from workout_api.configs.sharding import shard_router
+from workout_api.contrib.broadcaster import Broadcaster, Subscription
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy é opcional (ANALYTICS_ENABLED)
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Relógios de processos diferentes e transações longas: relê uma janela antes do último refresh
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class Dicionario:
+    """Codificação por dicionário de uma coluna textual (rótulo <-> código inteiro denso)"""
+
+    def __init__(self):
+        self.labels: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def code_of(self, label: str) -> Optional[int]:
+        return self._codes.get(label)
+
+
+class AtletaSnapshot:
+    """
+    Cópia colunar de `atletas` em arrays NumPy, para consultas analíticas sem ir ao banco.
+
+    idade, peso e altura ficam em arrays numéricos; categoria, centro e sexo são
+    codificados por dicionário. O refresh é incremental: relê só as linhas com
+    `created_at` ou `updated_at` posteriores ao último refresh de cada shard e as
+    aplica por pk_id. Exclusões e arquivamentos não deixam marcador na tabela: chegam
+    pelo change-feed (`deleted`/`archived`) como tombstones, aplicados no refresh seguinte.
+    A cada `reconcile_every` refreshes (e sempre que não há change-feed ou eventos foram
+    perdidos) os pk_id existentes são lidos do índice da chave primária e as linhas
+    ausentes deixam de ser vivas, cobrindo escritas fora da API e, com o backend
+    'memory', as de outros workers. Quando as linhas mortas passam da metade, os
+    arrays são compactados.
+    """
+
+    def __init__(self, reconcile_every: int = 1):
+        self.reconcile_every = reconcile_every
+        self._task: Optional[asyncio.Task] = None
+        self._follower: Optional[asyncio.Task] = None
+        self.clear()
+
+    def clear(self) -> None:
+        self.size = 0
+        self.watermarks: dict[str, datetime] = {}
+        self.categorias = Dicionario()
+        self.centros = Dicionario()
+        self.sexos = Dicionario()
+        self._positions: dict[int, int] = {}
+        self._columns = None
+        self._tombstones: set[int] = set()
+        self._refreshes = 0
+        self._lost_events = False
+        self.refreshed_at: Optional[datetime] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.refreshed_at is not None
+
+    @property
+    def total(self) -> int:
+        return int(self._columns['alive'][:self.size].sum()) if self._columns else 0
+
+    def _ensure_capacity(self, capacity: int) -> None:
+        if self._columns is None:
+            size = max(1024, capacity)
+            self._columns = {
+                'id': np.zeros(size, dtype=np.int64),
+                'idade': np.zeros(size, dtype=np.int16),
+                'peso': np.zeros(size, dtype=np.float64),
+                'altura': np.zeros(size, dtype=np.float64),
+                'sexo': np.zeros(size, dtype=np.int8),
+                'categoria': np.zeros(size, dtype=np.int32),
+                'centro_treinamento': np.zeros(size, dtype=np.int32),
+                'alive': np.zeros(size, dtype=bool),
+            }
+            return
+
+        current = len(self._columns['id'])
+        if capacity <= current:
+            return
+        size = max(capacity, current * 2)
+        for name, column in self._columns.items():
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:current] = column
+            self._columns[name] = grown
+
+    def apply(self, rows) -> None:
+        """Insere ou atualiza (por pk_id) linhas (pk_id, idade, peso, altura, sexo, categoria, centro)"""
+        if not rows:
+            return
+
+        ids, idades, pesos, alturas, sexos, categorias, centros = zip(*rows)
+        positions = np.fromiter((self._positions.get(pk_id, -1) for pk_id in ids), dtype=np.int64, count=len(ids))
+        novos = np.flatnonzero(positions < 0)
+
+        self._ensure_capacity(self.size + len(novos))
+        positions[novos] = np.arange(self.size, self.size + len(novos))
+        for index in novos:
+            self._positions[ids[index]] = int(positions[index])
+        self.size += len(novos)
+
+        columns = self._columns
+        columns['id'][positions] = ids
+        columns['idade'][positions] = idades
+        columns['peso'][positions] = pesos
+        columns['altura'][positions] = alturas
+        columns['sexo'][positions] = [self.sexos.encode(sexo) for sexo in sexos]
+        columns['categoria'][positions] = [self.categorias.encode(nome) for nome in categorias]
+        columns['centro_treinamento'][positions] = [self.centros.encode(nome) for nome in centros]
+        columns['alive'][positions] = True
+
+    def retain(self, live_ids) -> None:
+        """Marca como mortas as linhas cujo pk_id não está em `live_ids`"""
+        if self._columns is None:
+            return
+        alive = self._columns['alive'][:self.size]
+        alive &= np.isin(self._columns['id'][:self.size], live_ids)
+        self._compact_if_sparse()
+
+    def discard(self, ids) -> None:
+        """Marca como mortas as linhas dos pk_id informados (tombstones do change-feed)"""
+        positions = [self._positions[pk_id] for pk_id in ids if pk_id in self._positions]
+        if positions:
+            self._columns['alive'][positions] = False
+            self._compact_if_sparse()
+
+    def _compact_if_sparse(self) -> None:
+        if self.size > 1024 and self._columns['alive'][:self.size].sum() < self.size // 2:
+            self.compact()
+
+    def compact(self) -> None:
+        """Descarta as linhas mortas e renumera as posições"""
+        keep = np.flatnonzero(self._columns['alive'][:self.size])
+        self._columns = {name: column[keep] for name, column in self._columns.items()}
+        self._positions = {int(pk_id): position for position, pk_id in enumerate(self._columns['id'].tolist())}
+        self.size = len(keep)
+
+    async def refresh(self, engines: Optional[dict[str, AsyncEngine]] = None) -> None:
+        """Aplica as exclusões anotadas e as linhas novas/alteradas de cada shard desde o último refresh"""
+        if np is None:
+            raise RuntimeError('O snapshot analítico requer numpy instalado')
+
+        engines = engines or shard_router.engines
+        reconcile = self._follower is None or self._lost_events or self._refreshes % self.reconcile_every == 0
+        self._lost_events = False
+        # Antes de ler as linhas: um atleta restaurado depois do arquivamento volta pelo updated_at
+        tombstones, self._tombstones = self._tombstones, set()
+        self.discard(tombstones)
+        query = (
+            select(
+                AtletaModel.pk_id,
+                AtletaModel.idade,
+                AtletaModel.peso,
+                AtletaModel.altura,
+                AtletaModel.sexo,
+                CategoriaModel.nome,
+                CentroTreinamentoModel.nome,
+            )
+            .join(CategoriaModel, AtletaModel.categoria_id == CategoriaModel.pk_id)
+            .join(CentroTreinamentoModel, AtletaModel.centro_treinamento_id == CentroTreinamentoModel.pk_id)
+        )
+
+        live_ids = []
+        for name, shard_engine in engines.items():
+            started = datetime.utcnow()
+            since = self.watermarks.get(name)
+            shard_query = query
+            if since is not None:
+                since -= REFRESH_OVERLAP
+                shard_query = query.filter(or_(AtletaModel.created_at >= since, AtletaModel.updated_at >= since))
+
+            async with shard_engine.connect() as conn:
+                rows = (await conn.execute(shard_query)).all()
+                if reconcile:
+                    # Lidos depois das linhas: um atleta excluído entre as duas consultas já sai aqui
+                    live_ids.append(np.fromiter((await conn.execute(select(AtletaModel.pk_id))).scalars(), dtype=np.int64))
+
+            self.apply(rows)
+            self.watermarks[name] = started
+
+        if reconcile:
+            self.retain(np.concatenate(live_ids) if live_ids else np.zeros(0, dtype=np.int64))
+        self._refreshes += 1
+        self.refreshed_at = datetime.utcnow()
+
+    async def follow(self, broadcaster: Broadcaster, subscription: Subscription) -> None:
+        """Anota como tombstones os atletas excluídos ou arquivados; eventos perdidos forçam a reconciliação"""
+        try:
+            while True:
+                if subscription.overflowed and subscription.queue.empty():
+                    subscription = broadcaster.subscribe()
+                    self._lost_events = True
+                    continue
+
+                event = await subscription.queue.get()
+                if event.type == 'deleted':
+                    self._tombstones.add(event.data['id'])
+                elif event.type == 'archived':
+                    self._tombstones.update(event.data['ids'])
+                elif event.type == 'reset':
+                    self._lost_events = True
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception('Falha ao atualizar o snapshot analítico')
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float, broadcaster: Broadcaster) -> None:
+        if np is None:
+            raise RuntimeError('ANALYTICS_ENABLED requer numpy instalado')
+        # Inscreve antes do primeiro refresh para não perder exclusões feitas durante a carga
+        self._follower = asyncio.create_task(self.follow(broadcaster, broadcaster.subscribe()))
+        self._task = asyncio.create_task(self.run(interval))
+
+    async def stop(self) -> None:
+        for task in (self._task, self._follower):
+            if task is not None:
+                task.cancel()
+        self._task = self._follower = None
+
+    def mask(
+        self,
+        categoria: Optional[str] = None,
+        centro_treinamento: Optional[str] = None,
+        sexo: Optional[str] = None,
+    ):
+        """Máscara booleana das linhas vivas que atendem aos filtros (rótulos desconhecidos: nenhuma linha)"""
+        if self._columns is None:
+            return np.zeros(0, dtype=bool)
+
+        mask = self._columns['alive'][:self.size].copy()
+        filtros = (
+            ('categoria', self.categorias, categoria),
+            ('centro_treinamento', self.centros, centro_treinamento),
+            ('sexo', self.sexos, sexo),
+        )
+        for column, dicionario, label in filtros:
+            if label is None:
+                continue
+            code = dicionario.code_of(label)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self._columns[column][:self.size] == code
+        return mask
+
+    def values(self, campo: CampoAnalitico):
+        if self._columns is None:
+            return np.zeros(0)
+        if campo == CampoAnalitico.imc:
+            return self._columns['peso'][:self.size] / self._columns['altura'][:self.size] ** 2
+        return self._columns[campo.value][:self.size]
+
+    def percentiles(self, campo: CampoAnalitico, percentis: list[float], mask) -> dict[float, float]:
+        values = self.values(campo)[mask]
+        if values.size == 0:
+            return {}
+        return dict(zip(percentis, np.percentile(values, percentis).tolist()))
+
+    def histogram(self, campo: CampoAnalitico, bins: int, mask) -> list[tuple[float, float, int]]:
+        values = self.values(campo)[mask]
+        if values.size == 0:
+            return []
+        counts, edges = np.histogram(values, bins=bins)
+        return [(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(len(counts))]
+
+    def _dimension(self, dimensao: Dimensao, faixa_etaria: int):
+        """Códigos por linha e função que converte um código no rótulo da dimensão"""
+        if dimensao == Dimensao.faixa_etaria:
+            codes = self._columns['idade'][:self.size] // faixa_etaria
+            return codes, lambda code: f'{code * faixa_etaria}-{(code + 1) * faixa_etaria - 1}'
+
+        dicionario = {
+            Dimensao.categoria: self.categorias,
+            Dimensao.centro_treinamento: self.centros,
+            Dimensao.sexo: self.sexos,
+        }[dimensao]
+        return self._columns[dimensao.value][:self.size], lambda code: dicionario.labels[code]
+
+    def group_by(
+        self,
+        campo: CampoAnalitico,
+        dimensoes: list[Dimensao],
+        mask,
+        faixa_etaria: int = 10,
+    ) -> list[tuple[dict[str, str], int, float, float, float]]:
+        """Agrega `campo` por combinação de dimensões: [(chave, total, média, mínimo, máximo)]"""
+        values = self.values(campo)[mask]
+        if values.size == 0:
+            return []
+
+        dimensions = [self._dimension(dimensao, faixa_etaria) for dimensao in dimensoes]
+        keys = np.stack([codes[mask].astype(np.int64) for codes, _ in dimensions])
+        grupos, inverse = np.unique(keys, axis=1, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        counts = np.bincount(inverse)
+        sums = np.bincount(inverse, weights=values)
+        minimos = np.full(len(counts), np.inf)
+        maximos = np.full(len(counts), -np.inf)
+        np.minimum.at(minimos, inverse, values)
+        np.maximum.at(maximos, inverse, values)
+
+        return [
+            (
+                {dimensao.value: label(int(code)) for dimensao, (_, label), code in zip(dimensoes, dimensions, grupos[:, i])},
+                int(counts[i]),
+                float(sums[i] / counts[i]),
+                float(minimos[i]),
+                float(maximos[i]),
+            )
+            for i in range(len(counts))
+        ]
+
+
+atleta_snapshot = AtletaSnapshot(reconcile_every=settings.ANALYTICS_RECONCILE_EVERY)
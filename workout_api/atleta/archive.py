@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Union
+
+from sqlalchemy import delete, distinct, exists, extract, func, insert, literal, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.future import select
+
+from workout_api.atleta.events import atleta_events
+from workout_api.atleta.listing_cache import listing_cache
+from workout_api.atleta.models import AtletaArquivoModel, AtletaModel
+from workout_api.configs.settings import settings
+from workout_api.configs.sharding import shard_router
+from workout_api.leaderboard.cache import leaderboard_cache
+from workout_api.medidas.models import MedidaArquivoModel, MedidaModel
+from workout_api.scores.models import ScoreArquivoModel, ScoreModel
+
+logger = logging.getLogger(__name__)
+
+Executor = Union[AsyncConnection, AsyncSession]
+
+# (tabela ativa, arquivo, coluna com o id do atleta), na ordem de inserção (pais antes dos filhos)
+ARCHIVE_TABLES = (
+    (AtletaModel, AtletaArquivoModel, 'pk_id'),
+    (MedidaModel, MedidaArquivoModel, 'atleta_id'),
+    (ScoreModel, ScoreArquivoModel, 'atleta_id'),
+)
+
+# Ids por evento 'archived': o payload do NOTIFY (EVENTS_BACKEND='postgres') é limitado a 8000 bytes
+ARCHIVED_EVENT_IDS = 500
+
+
+async def copy_rows(executor: Executor, source, target, key: str, ids: list[int], **extra) -> None:
+    """INSERT ... SELECT das colunas comuns às duas tabelas, mais as colunas constantes de `extra`"""
+    columns = [column.name for column in source.__table__.columns if column.name in target.__table__.columns]
+    query = select(
+        *(source.__table__.c[name] for name in columns),
+        *(literal(value).label(name) for name, value in extra.items()),
+    ).filter(source.__table__.c[key].in_(ids))
+    await executor.execute(insert(target).from_select([*columns, *extra], query))
+
+
+async def move_rows(executor: Executor, ids: list[int], to_archive: bool) -> None:
+    """Move atletas, medições e scores entre as tabelas ativas e o arquivo, na transação corrente"""
+    for active, archived, key in ARCHIVE_TABLES:
+        if to_archive:
+            extra = {'arquivado_em': datetime.utcnow()} if archived is AtletaArquivoModel else {}
+            await copy_rows(executor, active, archived, key, ids, **extra)
+        else:
+            await copy_rows(executor, archived, active, key, ids)
+
+    for active, archived, key in reversed(ARCHIVE_TABLES):
+        source = active if to_archive else archived
+        await executor.execute(delete(source).filter(source.__table__.c[key].in_(ids)))
+
+
+async def ensure_partitions(conn: AsyncConnection, ids: list[int]) -> None:
+    """Cria (Postgres) as partições anuais do arquivo para os created_at do lote"""
+    if conn.dialect.name != 'postgresql':
+        return
+
+    years = (await conn.execute(
+        select(distinct(extract('year', AtletaModel.created_at))).filter(AtletaModel.pk_id.in_(ids))
+    )).scalars().all()
+    for year in sorted(int(year) for year in years):
+        await conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS atletas_arquivo_{year} PARTITION OF atletas_arquivo '
+            f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+        ))
+
+
+class AtletaArchiver:
+    """
+    Arquivamento de atletas inativos: sem alterações nem scores há `inactive_days` dias.
+
+    Cada lote de até `batch_size` atletas (com suas medições e scores) é movido para
+    as tabelas de arquivo em uma transação; no Postgres, os atletas selecionados são
+    travados com FOR UPDATE SKIP LOCKED, e escritas concorrentes apenas adiam o
+    arquivamento deles para a próxima execução. As tabelas ativas ficam só com os
+    atletas em atividade, e as leituras incluem o arquivo apenas quando pedido.
+    """
+
+    def __init__(self, inactive_days: int, batch_size: int):
+        self.inactive_days = inactive_days
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def inactive_query(self, cutoff: datetime):
+        recent_scores = exists().where(ScoreModel.atleta_id == AtletaModel.pk_id, ScoreModel.created_at >= cutoff)
+        return (
+            select(AtletaModel.pk_id)
+            .filter(func.coalesce(AtletaModel.updated_at, AtletaModel.created_at) < cutoff)
+            .filter(~recent_scores)
+            .order_by(AtletaModel.pk_id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def archive_batch(self, engine: AsyncEngine, cutoff: datetime) -> list[int]:
+        async with engine.begin() as conn:
+            ids = list((await conn.execute(self.inactive_query(cutoff))).scalars())
+            if ids:
+                await ensure_partitions(conn, ids)
+                await move_rows(conn, ids, to_archive=True)
+        return ids
+
+    async def archive(
+        self,
+        engines: Optional[dict[str, AsyncEngine]] = None,
+        inactive_days: Optional[int] = None,
+    ) -> int:
+        """Arquiva, em lotes e shard a shard, todos os atletas inativos; retorna quantos foram movidos"""
+        cutoff = datetime.utcnow() - timedelta(days=inactive_days or self.inactive_days)
+        total = 0
+        for name, shard_engine in (engines or shard_router.engines).items():
+            while True:
+                ids = await self.archive_batch(shard_engine, cutoff)
+                total += len(ids)
+                if ids:
+                    # Cada lote já confirmado some das listagens e dos rankings, inclusive nos outros
+                    # workers: um evento por lote, e não um 'deleted' por atleta, que estouraria as filas
+                    listing_cache.invalidate('atletas')
+                    leaderboard_cache.clear()
+                    for start in range(0, len(ids), ARCHIVED_EVENT_IDS):
+                        await atleta_events.publish('archived', {'ids': ids[start:start + ARCHIVED_EVENT_IDS]})
+                if len(ids) < self.batch_size:
+                    break
+
+        if total:
+            logger.info(f'{total} atletas inativos desde {cutoff:%Y-%m-%d} arquivados')
+        return total
+
+    async def restore(self, db_session: AsyncSession, id: int) -> bool:
+        """Devolve o atleta arquivado (com medições e scores) às tabelas ativas; False se não estiver arquivado"""
+        archived = (
+            await db_session.execute(select(AtletaArquivoModel.pk_id).filter_by(pk_id=id).with_for_update())
+        ).scalar()
+        if archived is None:
+            return False
+
+        await move_rows(db_session, [id], to_archive=False)
+        # A restauração conta como atividade: sem isso o próximo ciclo arquivaria o atleta de novo
+        await db_session.execute(update(AtletaModel).filter_by(pk_id=id).values(updated_at=datetime.utcnow()))
+        await db_session.commit()
+        listing_cache.invalidate('atletas')
+        leaderboard_cache.clear()
+        return True
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.archive()
+            except Exception:
+                logger.exception('Falha ao arquivar atletas inativos')
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        self._task = asyncio.create_task(self.run(interval))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+atleta_archiver = AtletaArchiver(
+    inactive_days=settings.ARCHIVE_INACTIVE_DAYS,
+    batch_size=settings.ARCHIVE_BATCH_SIZE,
+)
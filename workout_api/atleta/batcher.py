@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.medidas.models import MedidaModel
+from workout_api.configs.settings import settings
+from workout_api.contrib.deadlines import request_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class CPFDuplicadoError(Exception):
+    """O CPF já estava cadastrado ou apareceu antes no mesmo lote"""
+
+
+# Dialetos com INSERT ... ON CONFLICT DO NOTHING ... RETURNING
+BATCH_DIALECTS = {'postgresql': postgresql, 'sqlite': sqlite}
+
+
+class AtletaInsertBatcher:
+    """
+    Group-commit de inserts de atletas.
+
+    Inserts que chegam em até `max_delay` segundos (ou até `max_size` itens) são
+    gravados com um único INSERT multi-linha (mais o das medições iniciais) e um
+    único commit. Conflitos de CPF são resolvidos por linha com ON CONFLICT DO
+    NOTHING ... RETURNING: só os chamadores cujo CPF não voltou no RETURNING
+    recebem CPFDuplicadoError.
+
+    Engines de outros dialetos não são agrupados: `supports()` é consultado antes de
+    `submit()` e o insert segue pelo caminho direto. As tasks de flush ficam referenciadas
+    até terminar, e `stop()` grava as janelas abertas e aguarda os lotes em andamento.
+    """
+
+    def __init__(self, max_size: int, max_delay: float):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: dict[AsyncEngine, list[tuple[dict[str, Any], asyncio.Future]]] = {}
+        self._timers: dict[AsyncEngine, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def supports(engine: AsyncEngine) -> bool:
+        return engine.dialect.name in BATCH_DIALECTS
+
+    def check(self, engines: dict[str, AsyncEngine]) -> None:
+        """Avisa no startup sobre shards cujo dialeto não permite o group-commit"""
+        for name, engine in engines.items():
+            if not self.supports(engine):
+                logger.warning(
+                    f'Group-commit de atletas desligado no shard {name}: '
+                    f'dialeto {engine.dialect.name} não suportado'
+                )
+
+    async def submit(self, db_session: AsyncSession, values: dict[str, Any]) -> int:
+        """Enfileira o insert e aguarda o commit do lote; retorna o pk_id do atleta"""
+        engine = db_session.bind
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(engine, [])
+        pending.append((values, future))
+
+        if len(pending) >= self.max_size:
+            self._start_flush(engine)
+        elif engine not in self._timers:
+            self._timers[engine] = loop.call_later(self.max_delay, self._start_flush, engine)
+
+        return await future
+
+    def _start_flush(self, engine: AsyncEngine) -> None:
+        timer = self._timers.pop(engine, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(engine, [])
+        if batch:
+            # O loop guarda só referências fracas às tasks: sem esta, o lote poderia ser coletado
+            task = asyncio.get_running_loop().create_task(self._flush(engine, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """Shutdown: grava as janelas ainda abertas e aguarda os lotes antes de fechar as engines"""
+        for engine in list(self._pending):
+            self._start_flush(engine)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _flush(self, engine: AsyncEngine, batch: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        # O lote atende vários chamadores: não herda o deadline de quem abriu a janela
+        request_deadline.set(None)
+
+        rows, seen = [], set()
+        for values, future in batch:
+            if values['cpf'] in seen:
+                if not future.done():
+                    future.set_exception(CPFDuplicadoError(values['cpf']))
+            else:
+                seen.add(values['cpf'])
+                rows.append((values, future))
+
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                result = await session.execute(
+                    self._insert_statement(engine).values([values for values, _ in rows])
+                )
+                inserted = {cpf: pk_id for pk_id, cpf in result.all()}
+                # Medição inicial de cada atleta inserido, na mesma transação do lote
+                medidas = [
+                    MedidaModel.values_for(inserted[values['cpf']], values, values['created_at'])
+                    for values, _ in rows if values['cpf'] in inserted
+                ]
+                if medidas:
+                    await session.execute(insert(MedidaModel), medidas)
+                await session.commit()
+        except Exception as exc:
+            logger.exception('Falha ao gravar lote de atletas')
+            for _, future in rows:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for values, future in rows:
+            if future.done():
+                continue
+            if values['cpf'] in inserted:
+                future.set_result(inserted[values['cpf']])
+            else:
+                future.set_exception(CPFDuplicadoError(values['cpf']))
+
+    @staticmethod
+    def _insert_statement(engine: AsyncEngine):
+        return (
+            BATCH_DIALECTS[engine.dialect.name].insert(AtletaModel)
+            .on_conflict_do_nothing(index_elements=['cpf'])
+            .returning(AtletaModel.pk_id, AtletaModel.cpf)
+        )
+
+
+atleta_batcher = AtletaInsertBatcher(
+    max_size=settings.ATLETA_BATCH_MAX_SIZE,
+    max_delay=settings.ATLETA_BATCH_MAX_DELAY_MS / 1000,
+)
@@ -1,25 +1,134 @@
+import asyncio
+import heapq
 from datetime import datetime
-from uuid import uuid4
-from fastapi import APIRouter, status, Body, HTTPException, Query
-from pydantic import UUID4
+from itertools import islice
+from fastapi import APIRouter, status, Body, HTTPException, Query, Header, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from fastapi_pagination import Page, add_pagination, paginate
+from fastapi_pagination import Page, create_page, resolve_params
+from fastapi_pagination.ext.sqlalchemy import paginate
 from typing import Optional
 
-from workout_api.atleta.schemas import AtletaIn, AtletaOut, AtletaUpdate, AtletaGetAll
-from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.schemas import (
+    AtletaIn, AtletaOut, AtletaUpdate, AtletaSort, AtletaParcial, ArquivamentoOut
+)
+from workout_api.atleta.models import AtletaArquivoModel, AtletaModel
+from workout_api.medidas.models import MedidaModel
 from workout_api.categorias.models import CategoriaModel
 from workout_api.categorias.schemas import CategoriaSimpleOut
 from workout_api.centro_treinamento.models import CentroTreinamentoModel
 from workout_api.centro_treinamento.schemas import CentroTreinamentoSimpleOut
-from workout_api.configs.database import AsyncSession
+from workout_api.atleta.archive import atleta_archiver
+from workout_api.atleta.batcher import CPFDuplicadoError, atleta_batcher
+from workout_api.atleta.cpf_index import cpf_index
+from workout_api.atleta.events import atleta_events
+from workout_api.atleta.listing_cache import listing_cache
+from workout_api.contrib.broadcaster import Broadcaster, Subscription
+from workout_api.contrib.validators import validate_cpf
+from workout_api.leaderboard.cache import leaderboard_cache
+from workout_api.configs.settings import settings
+from workout_api.configs.database import AsyncSession, batch_session
 from fastapi import Depends
-from workout_api.configs.database import get_session
+from workout_api.configs.sharding import PRIMARY_SHARD, ShardSessions, get_shard_sessions, shard_router
 
 router = APIRouter()
 
 
+def atleta_fields(model=AtletaModel) -> dict:
+    """Campos aceitos em `fields=` e a coluna SQL que projeta cada um (em `atletas` ou no arquivo)"""
+    return {
+        'id': model.pk_id,
+        'nome': model.nome,
+        'cpf': model.cpf,
+        'idade': model.idade,
+        'peso': model.peso,
+        'altura': model.altura,
+        'sexo': model.sexo,
+        'categoria': CategoriaModel.nome,
+        'centro_treinamento': CentroTreinamentoModel.nome,
+        'created_at': model.created_at,
+    }
+
+
+ATLETA_FIELDS = atleta_fields()
+
+
+def atleta_models(arquivados: bool = False) -> list:
+    """Tabelas lidas pelos handlers: só `atletas`, a menos que o arquivo seja pedido"""
+    return [AtletaModel, AtletaArquivoModel] if arquivados else [AtletaModel]
+
+
+GET_ALL_DEFAULT_FIELDS = ['nome', 'centro_treinamento', 'categoria']
+# Campos cujas alterações entram no histórico de medidas
+MEDIDA_FIELDS = ('peso', 'altura', 'idade')
+
+
+def parse_fields(fields: Optional[str], default: list[str]) -> list[str]:
+    """Valida o parâmetro `fields=` (lista separada por vírgulas) contra ATLETA_FIELDS"""
+    if not fields:
+        return default
+
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(',') if field.strip()))
+    invalid = [field for field in requested if field not in ATLETA_FIELDS]
+    if invalid or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f'Campos inválidos em fields: {", ".join(invalid)}. '
+                   f'Campos aceitos: {", ".join(ATLETA_FIELDS)}'
+        )
+
+    return requested
+
+
+def project_atletas_query(query: Select, fields: list[str], model=AtletaModel) -> Select:
+    """
+    Restringe o SELECT às colunas de `fields`, fazendo JOIN com categorias
+    e centros_treinamento apenas quando esses campos foram solicitados.
+    """
+    query = query.with_only_columns(
+        *(atleta_fields(model)[field].label(field) for field in fields),
+        maintain_column_froms=False,
+    ).select_from(model)
+
+    if 'categoria' in fields:
+        query = query.join(CategoriaModel, model.categoria_id == CategoriaModel.pk_id)
+
+    if 'centro_treinamento' in fields:
+        query = query.join(
+            CentroTreinamentoModel,
+            model.centro_treinamento_id == CentroTreinamentoModel.pk_id
+        )
+
+    return query
+
+
+def row_to_atleta_parcial(row, fields: list[str]) -> AtletaParcial:
+    """Converte uma linha projetada em AtletaParcial, preenchendo só os campos pedidos"""
+    if hasattr(row, '_mapping'):
+        values = {field: row._mapping[field] for field in fields}
+    else:
+        values = {fields[0]: row}
+
+    if 'categoria' in values:
+        values['categoria'] = CategoriaSimpleOut(nome=values['categoria'])
+    if 'centro_treinamento' in values:
+        values['centro_treinamento'] = CentroTreinamentoSimpleOut(nome=values['centro_treinamento'])
+
+    return AtletaParcial(**values)
+
+
+async def find_atleta_by_cpf(shard_sessions: ShardSessions, cpf: str, fields: list[str], model=AtletaModel):
+    """Busca o atleta pelo índice de `cpf`, shard a shard; None se não existir"""
+    query = project_atletas_query(select(model).filter_by(cpf=cpf), fields, model)
+    for shard in shard_router.names:
+        row = (await shard_sessions.get(shard).execute(query)).first()
+        if row:
+            return row
+    return None
+
+
 @router.post(
     '/',
     summary='Criar um novo atleta',
@@ -37,6 +146,10 @@ router = APIRouter()
     - Sexo deve ser 'M' ou 'F'
     - Peso e altura devem ser valores positivos
     
+    **Group commit:**
+    Com `ATLETA_BATCH_ENABLED`, inserts concorrentes são agrupados em um único INSERT
+    multi-linha e um único commit; conflitos de CPF continuam sendo respondidos por atleta.
+    
     **Retorna:**
     - Status 201: Atleta criado com sucesso
     - Status 303: CPF já cadastrado
@@ -51,9 +164,29 @@ router = APIRouter()
     }
 )
 async def post(
-    db_session: AsyncSession = Depends(get_session),
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
     atleta_in: AtletaIn = Body(...),
 ) -> AtletaOut:
+    # Duplicata provável pelo filtro de CPFs: confirma no índice único antes de montar o insert
+    if cpf_index.ready and atleta_in.cpf in cpf_index:
+        if await find_atleta_by_cpf(shard_sessions, atleta_in.cpf, ['id']):
+            raise HTTPException(
+                status_code=status.HTTP_303_SEE_OTHER,
+                detail=f'Já existe um atleta cadastrado com o cpf: {atleta_in.cpf}'
+            )
+    # O arquivo não tem índice único: o CPF é conferido nele, a menos que o filtro garanta a ausência
+    if not cpf_index.definitely_absent(atleta_in.cpf):
+        arquivado = await find_atleta_by_cpf(shard_sessions, atleta_in.cpf, ['id'], AtletaArquivoModel)
+        if arquivado:
+            raise HTTPException(
+                status_code=status.HTTP_303_SEE_OTHER,
+                detail=f'O atleta com o cpf {atleta_in.cpf} está arquivado; '
+                       f'restaure-o com POST /atletas/{arquivado.id}/restaurar'
+            )
+
+    # Categorias e centros são replicados: a busca é sempre no shard `default`
+    db_session = shard_sessions.primary
+
     # Buscar categoria
     categoria_nome = atleta_in.categoria.nome
     categoria = (
@@ -83,93 +216,487 @@ async def post(
         )
 
     try:
-        atleta_out = AtletaOut(id=uuid4(), created_at=datetime.utcnow(), **atleta_in.model_dump())
-        atleta_model = AtletaModel(
-            **atleta_out.model_dump(exclude={'categoria', 'centro_treinamento'})
-        )
-        atleta_model.categoria_id = categoria.pk_id
-        atleta_model.centro_treinamento_id = centro.pk_id
+        shard = shard_router.validate(centro.shard)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    shard_router.remember_centro(centro.pk_id, shard)
+    # Réplicas de categoria/centro que falharam neste shard são refeitas antes do insert (FKs)
+    await shard_router.repair(shard)
+    db_session = shard_sessions.get(shard)
 
-        db_session.add(atleta_model)
-        await db_session.commit()
+    values = {
+        **atleta_in.model_dump(exclude={'categoria', 'centro_treinamento'}),
+        'created_at': datetime.utcnow(),
+        'categoria_id': categoria.pk_id,
+        'centro_treinamento_id': centro.pk_id,
+    }
 
-        return atleta_out
-    except IntegrityError:
+    try:
+        # Dentro de um POST /batch o insert segue na transação do lote, fora do group-commit
+        if (
+            settings.ATLETA_BATCH_ENABLED
+            and batch_session.get() is None
+            and atleta_batcher.supports(db_session.bind)
+        ):
+            pk_id = await atleta_batcher.submit(db_session, values)
+        else:
+            atleta_model = AtletaModel(**values)
+            db_session.add(atleta_model)
+            await db_session.flush()
+            db_session.add(MedidaModel(**MedidaModel.values_for(atleta_model.pk_id, values, values['created_at'])))
+            await db_session.commit()
+            pk_id = atleta_model.pk_id
+    except (IntegrityError, CPFDuplicadoError):
         await db_session.rollback()
         raise HTTPException(
             status_code=status.HTTP_303_SEE_OTHER,
             detail=f'Já existe um atleta cadastrado com o cpf: {atleta_in.cpf}'
         )
 
+    cpf_index.add(atleta_in.cpf)
+    listing_cache.invalidate('atletas')
+    atleta_out = AtletaOut(
+        id=pk_id,
+        created_at=values['created_at'],
+        **atleta_in.model_dump()
+    )
+    await atleta_events.publish('created', atleta_out.model_dump(mode='json'))
+
+    return atleta_out
+
+
+def build_atletas_query(
+    model=AtletaModel,
+    nome: Optional[str] = None,
+    cpf: Optional[str] = None,
+    categoria_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+    centro_treinamento_id: Optional[int] = None,
+    centro_treinamento: Optional[str] = None,
+    sexo: Optional[str] = None,
+    idade_min: Optional[int] = None,
+    idade_max: Optional[int] = None,
+    peso_min: Optional[float] = None,
+    peso_max: Optional[float] = None,
+    altura_min: Optional[float] = None,
+    altura_max: Optional[float] = None,
+    sort: Optional[AtletaSort] = None,
+) -> Select:
+    """
+    Monta o SELECT de atletas com os filtros e a ordenação informados, sobre
+    `atletas` ou sobre o arquivo (`model`=AtletaArquivoModel, mesmas colunas).
+
+    Filtros por nome de categoria/centro viram subqueries escalares sobre o índice
+    único de `nome`, de modo que o filtro em `atletas` cai sempre na FK indexada.
+    """
+    query = select(model)
+
+    if nome:
+        query = query.filter(model.nome.contains(nome))
+
+    if cpf:
+        query = query.filter(model.cpf == cpf)
+
+    if categoria_id is not None:
+        query = query.filter(model.categoria_id == categoria_id)
+
+    if categoria:
+        query = query.filter(
+            model.categoria_id == (
+                select(CategoriaModel.pk_id).filter_by(nome=categoria).correlate(None).scalar_subquery()
+            )
+        )
+
+    if centro_treinamento_id is not None:
+        query = query.filter(model.centro_treinamento_id == centro_treinamento_id)
+
+    if centro_treinamento:
+        query = query.filter(
+            model.centro_treinamento_id == (
+                select(CentroTreinamentoModel.pk_id).filter_by(nome=centro_treinamento).correlate(None).scalar_subquery()
+            )
+        )
+
+    if sexo:
+        query = query.filter(model.sexo == sexo)
+
+    ranges = (
+        (model.idade, idade_min, idade_max),
+        (model.peso, peso_min, peso_max),
+        (model.altura, altura_min, altura_max),
+    )
+    for column, minimum, maximum in ranges:
+        if minimum is not None:
+            query = query.filter(column >= minimum)
+        if maximum is not None:
+            query = query.filter(column <= maximum)
+
+    if sort:
+        descending = sort.value.startswith('-')
+        column = getattr(model, sort.value.lstrip('-'))
+        if descending:
+            query = query.order_by(column.desc(), model.pk_id.desc())
+        else:
+            query = query.order_by(column.asc(), model.pk_id.asc())
+    else:
+        query = query.order_by(model.pk_id)
+
+    return query
+
+
+async def resolve_atletas_shards(
+    db_session: AsyncSession,
+    centro_treinamento_id: Optional[int] = None,
+    centro_treinamento: Optional[str] = None,
+) -> list[str]:
+    """Shards que podem conter atletas do filtro: um só quando o centro é conhecido, senão todos"""
+    if centro_treinamento_id is None and centro_treinamento:
+        centro_treinamento_id = (
+            await db_session.execute(select(CentroTreinamentoModel.pk_id).filter_by(nome=centro_treinamento))
+        ).scalar()
+        if centro_treinamento_id is None:
+            return [PRIMARY_SHARD]
+
+    if centro_treinamento_id is not None:
+        return [await shard_router.shard_for_centro(db_session, centro_treinamento_id) or PRIMARY_SHARD]
+
+    return shard_router.names
+
+
+async def paginate_shards(
+    shard_sessions: ShardSessions,
+    shards: list[str],
+    queries: list[tuple[Select, type]],
+    fields: list[str],
+    sort: Optional[AtletaSort] = None,
+) -> Page[AtletaParcial]:
+    """
+    Pagina SELECTs de atletas espalhados por vários shards e, com `arquivados`, também
+    pelo arquivo: `queries` tem um par (SELECT, modelo) por tabela consultada em cada shard.
+
+    Cada fonte devolve no máximo offset + size linhas já ordenadas, com a chave de
+    ordenação e o pk_id como colunas extras; o merge das listas reproduz a mesma ordem
+    de build_atletas_query (nome na collation do banco) e o total é a soma dos COUNTs de cada fonte.
+    """
+    params = resolve_params()
+    raw_params = params.to_raw_params()
+    descending = bool(sort) and sort.value.startswith('-')
+
+    def source_queries(query: Select, model) -> tuple[Select, Select]:
+        sort_column = getattr(model, sort.value.lstrip('-')) if sort else model.pk_id
+        rows_query = project_atletas_query(query, fields, model).add_columns(
+            sort_column.label('_sort_key'),
+            model.pk_id.label('_pk'),
+        ).limit(raw_params.offset + raw_params.limit)
+        count_query = select(func.count()).select_from(query.order_by(None).subquery())
+        return rows_query, count_query
+
+    sources = [source_queries(query, model) for query, model in queries]
+
+    async def fetch(shard: str):
+        # As tabelas de um shard são lidas em sequência: a sessão não aceita consultas concorrentes
+        session = shard_sessions.get(shard)
+        results = []
+        for rows_query, count_query in sources:
+            rows = (await session.execute(rows_query)).all()
+            total = (await session.execute(count_query)).scalar()
+            results.append((rows, total))
+        return results
+
+    results = [
+        result
+        for shard_results in await asyncio.gather(*(fetch(shard) for shard in shards))
+        for result in shard_results
+    ]
+
+    ranks = None
+    if sort and sort.value.lstrip('-') == 'nome' and sum(1 for rows, _ in results if rows) > 1:
+        # Cada fonte ordenou nome na collation do banco: o merge usa a mesma ordem
+        ranks = await shard_sessions.collation_ranks({row._sort_key for rows, _ in results for row in rows})
+
+    merged = heapq.merge(
+        *(rows for rows, _ in results),
+        key=lambda row: (ranks[row._sort_key] if ranks else row._sort_key, row._pk),
+        reverse=descending,
+    )
+    page_rows = islice(merged, raw_params.offset, raw_params.offset + raw_params.limit)
+
+    return create_page(
+        [row_to_atleta_parcial(row, fields) for row in page_rows],
+        total=sum(total for _, total in results),
+        params=params,
+    )
+
 
 @router.get(
     '/',
     summary='Consultar todos os atletas',
     status_code=status.HTTP_200_OK,
-    response_model=Page[AtletaGetAll],
+    response_model=Page[AtletaParcial],
+    response_model_exclude_unset=True,
     description="""
-    Lista todos os atletas cadastrados com suporte a filtros e paginação.
+    Lista todos os atletas cadastrados com suporte a filtros, ordenação e paginação.
     
     **Filtros disponíveis:**
     - `nome`: Busca parcial por nome (case insensitive)
     - `cpf`: Busca exata por CPF
+    - `categoria_id` / `categoria`: Categoria por id ou por nome
+    - `centro_treinamento_id` / `centro_treinamento`: Centro de treinamento por id ou por nome
+    - `sexo`: 'M' ou 'F'
+    - `idade_min` / `idade_max`, `peso_min` / `peso_max`, `altura_min` / `altura_max`: Faixas inclusivas
+    
+    **Ordenação:**
+    - `sort`: `nome`, `idade`, `peso`, `altura` ou `created_at`; prefixe com `-` para ordem decrescente
     
     **Paginação:**
     - `page`: Número da página (padrão: 1)
     - `size`: Itens por página (padrão: 50)
     
     **Resposta customizada:**
-    Retorna apenas nome, categoria e centro de treinamento (sem CPF, idade, peso, etc.)
+    Por padrão retorna apenas nome, categoria e centro de treinamento (sem CPF, idade, peso, etc.)
+    
+    **Sparse fieldsets:**
+    - `fields`: Lista de campos separados por vírgula (`id`, `nome`, `cpf`, `idade`, `peso`, `altura`,
+      `sexo`, `categoria`, `centro_treinamento`, `created_at`). Apenas essas colunas são consultadas
+      e os JOINs com categoria e centro só acontecem quando esses campos são pedidos.
+    
+    **Arquivo:**
+    - `arquivados=true`: inclui os atletas inativos movidos para o arquivo (por padrão só os ativos)
+    
+    **Shards:**
+    Com SHARD_URLS configurado, filtros por centro de treinamento consultam só o shard do centro;
+    as demais consultas são feitas em paralelo em todos os shards e intercaladas na ordem pedida.
     
     **Exemplos:**
     - `/atletas/` - Lista todos
     - `/atletas/?nome=João` - Filtra por nome
     - `/atletas/?cpf=12345678900` - Busca por CPF
+    - `/atletas/?categoria=RX&sexo=F&idade_min=18&idade_max=35` - Filtros combinados
+    - `/atletas/?centro_treinamento_id=1&sort=-peso` - Filtro + ordenação
     - `/atletas/?page=1&size=10` - Paginação
     - `/atletas/?nome=Silva&page=2&size=5` - Filtro + paginação
+    - `/atletas/?fields=id,nome,idade` - Apenas id, nome e idade
     """,
     responses={
         200: {"description": "Lista de atletas retornada com sucesso"}
     }
 )
 async def query(
-    db_session: AsyncSession = Depends(get_session),
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
     nome: Optional[str] = Query(None, description="Filtrar por nome do atleta"),
     cpf: Optional[str] = Query(None, description="Filtrar por CPF do atleta"),
-) -> Page[AtletaGetAll]:
-    query = select(AtletaModel)
+    categoria_id: Optional[int] = Query(None, description="Filtrar pelo id da categoria"),
+    categoria: Optional[str] = Query(None, description="Filtrar pelo nome da categoria"),
+    centro_treinamento_id: Optional[int] = Query(None, description="Filtrar pelo id do centro de treinamento"),
+    centro_treinamento: Optional[str] = Query(None, description="Filtrar pelo nome do centro de treinamento"),
+    sexo: Optional[str] = Query(None, description="Filtrar por sexo (M/F)", pattern='^[MF]$'),
+    idade_min: Optional[int] = Query(None, description="Idade mínima"),
+    idade_max: Optional[int] = Query(None, description="Idade máxima"),
+    peso_min: Optional[float] = Query(None, description="Peso mínimo em kg"),
+    peso_max: Optional[float] = Query(None, description="Peso máximo em kg"),
+    altura_min: Optional[float] = Query(None, description="Altura mínima em metros"),
+    altura_max: Optional[float] = Query(None, description="Altura máxima em metros"),
+    sort: Optional[AtletaSort] = Query(None, description="Campo de ordenação ('-' para decrescente)"),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula"),
+    arquivados: bool = Query(False, description="Incluir atletas arquivados"),
+) -> Page[AtletaParcial]:
+    selected_fields = parse_fields(fields, GET_ALL_DEFAULT_FIELDS)
+    filters = dict(
+        nome=nome,
+        cpf=cpf,
+        categoria_id=categoria_id,
+        categoria=categoria,
+        centro_treinamento_id=centro_treinamento_id,
+        centro_treinamento=centro_treinamento,
+        sexo=sexo,
+        idade_min=idade_min,
+        idade_max=idade_max,
+        peso_min=peso_min,
+        peso_max=peso_max,
+        altura_min=altura_min,
+        altura_max=altura_max,
+        sort=sort,
+    )
+    raw_params = resolve_params().to_raw_params()
+    cache_key = listing_cache.key(
+        'atletas',
+        **{**filters, 'sort': sort and sort.value},
+        fields=sorted(selected_fields),
+        limit=raw_params.limit,
+        offset=raw_params.offset,
+        arquivados=arquivados,
+    )
+
+    async def compute() -> Page[AtletaParcial]:
+        # Por padrão só `atletas`; o arquivo entra como mais uma fonte do merge
+        queries = [(build_atletas_query(model, **filters), model) for model in atleta_models(arquivados)]
+
+        shards = await resolve_atletas_shards(shard_sessions.primary, centro_treinamento_id, centro_treinamento)
+        if len(shards) * len(queries) > 1:
+            return await paginate_shards(shard_sessions, shards, queries, selected_fields, sort)
+
+        return await paginate(
+            shard_sessions.get(shards[0]),
+            project_atletas_query(queries[0][0], selected_fields),
+            transformer=lambda rows: [row_to_atleta_parcial(row, selected_fields) for row in rows],
+        )
+
+    return await listing_cache.respond(cache_key, compute)
+
+
+async def stream_events(
+    request: Request,
+    broadcaster: Broadcaster,
+    subscription: Subscription,
+    heartbeat_interval: float,
+):
+    """Gera o stream SSE de uma inscrição, com heartbeat e encerramento em overflow"""
+    try:
+        if subscription.stale:
+            # Last-Event-ID fora do histórico: o cliente precisa ressincronizar via GET
+            yield 'event: reset\ndata: {}\n\n'
+
+        for event in subscription.backlog:
+            yield event.to_sse()
+
+        while True:
+            if subscription.overflowed and subscription.queue.empty():
+                # Consumidor lento: reconectar com o Last-Event-ID do último evento recebido
+                yield 'event: overflow\ndata: {}\n\n'
+                return
+
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_interval)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ': ping\n\n'
+                continue
+
+            yield event.to_sse()
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get(
+    '/eventos',
+    summary='Stream de alterações de atletas (SSE)',
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="""
+    Server-sent events com as escritas de atletas, substituindo o polling de `GET /atletas/`.
     
-    if nome:
-        query = query.filter(AtletaModel.nome.contains(nome))
+    **Eventos:**
+    - `created` / `updated`: dados completos do atleta
+    - `deleted`: `{"id": <id>}`
+    - `archived`: `{"ids": [<id>, ...]}`, atletas movidos para o arquivo (a restauração emite `created`)
+    - `reset`: o `Last-Event-ID` informado saiu do histórico, ou o change-feed perdeu eventos
+      (queda da conexão LISTEN); ressincronize via `GET /atletas/`
+    - `overflow`: o consumidor ficou para trás; reconecte com o último `Last-Event-ID` recebido
     
-    if cpf:
-        query = query.filter(AtletaModel.cpf == cpf)
+    **Retomada:**
+    Envie o header `Last-Event-ID` (o EventSource do navegador faz isso automaticamente)
+    ou o query param `last_event_id` para receber os eventos perdidos.
+    """,
+)
+async def eventos(
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="Retomar após este evento"),
+    last_event_id_header: Optional[str] = Header(None, alias='Last-Event-ID'),
+) -> StreamingResponse:
+    subscription = atleta_events.subscribe(last_event_id_header or last_event_id)
+
+    return StreamingResponse(
+        stream_events(request, atleta_events, subscription, settings.EVENTS_HEARTBEAT_INTERVAL),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@router.get(
+    '/cpf/{cpf}',
+    summary='Consultar um atleta pelo CPF',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaParcial,
+    response_model_exclude_unset=True,
+    description="""
+    Busca um atleta pelo CPF usando o índice único da coluna.
+    
+    Com CPF_FILTER_AUTHORITATIVE (e o change-feed postgres), CPFs não cadastrados são
+    respondidos com 404 pelo filtro de CPFs em memória (Bloom filter), sem consulta ao banco;
+    nos demais casos o filtro pode estar desatualizado e o índice é sempre consultado.
     
-    atletas = (await db_session.execute(query)).scalars().all()
+    **Sparse fieldsets:**
+    - `fields`: Lista de campos separados por vírgula (ex.: `/atletas/cpf/12345678909?fields=id,nome`)
+    
+    **Arquivo:**
+    - `arquivados=true`: procura também entre os atletas arquivados
+    """,
+    responses={
+        200: {"description": "Atleta encontrado"},
+        404: {"description": "CPF não cadastrado"},
+        422: {"description": "CPF inválido"}
+    }
+)
+async def get_by_cpf(
+    cpf: str,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula"),
+    arquivados: bool = Query(False, description="Procurar também entre os atletas arquivados"),
+) -> AtletaParcial:
+    selected_fields = parse_fields(fields, list(ATLETA_FIELDS))
+    try:
+        cpf = validate_cpf(cpf)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+
+    row = None
+    if not cpf_index.definitely_absent(cpf):
+        for model in atleta_models(arquivados):
+            row = await find_atleta_by_cpf(shard_sessions, cpf, selected_fields, model)
+            if row:
+                break
 
-    atletas_response = [
-        AtletaGetAll(
-            nome=atleta.nome,
-            centro_treinamento=CentroTreinamentoSimpleOut(nome=atleta.centro_treinamento.nome),
-            categoria=CategoriaSimpleOut(nome=atleta.categoria.nome)
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Atleta não encontrado com cpf: {cpf}'
         )
-        for atleta in atletas
-    ]
 
-    return paginate(atletas_response)
+    return row_to_atleta_parcial(row, selected_fields)
+
+
+def atleta_session(shard_sessions: ShardSessions, id: int) -> AsyncSession:
+    """Sessão do shard dono do atleta, derivado do próprio id"""
+    shard = shard_router.shard_for_id(id)
+    if shard is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Atleta não encontrado com id: {id}'
+        )
+
+    return shard_sessions.get(shard)
 
 
 @router.get(
     '/{id}',
     summary='Consultar um atleta pelo id',
     status_code=status.HTTP_200_OK,
-    response_model=AtletaOut,
+    response_model=AtletaParcial,
+    response_model_exclude_unset=True,
     description="""
     Busca um atleta específico pelo ID.
     
     **Retorna:**
     Todos os dados do atleta, incluindo CPF, idade, peso, altura, etc.
     
+    **Sparse fieldsets:**
+    - `fields`: Lista de campos separados por vírgula; apenas essas colunas são consultadas
+      (ex.: `/atletas/1?fields=nome,peso,altura`)
+    
+    **Arquivo:**
+    - `arquivados=true`: se o atleta não estiver ativo, procura também em `atletas_arquivo`
+    
     **Diferença do GET all:**
     Este endpoint retorna os dados completos do atleta,
     enquanto o GET /atletas/ retorna apenas nome, categoria e centro de treinamento.
@@ -179,29 +706,31 @@ async def query(
         404: {"description": "Atleta não encontrado"}
     }
 )
-async def get(id: int, db_session: AsyncSession = Depends(get_session)) -> AtletaOut:
-    atleta: AtletaModel = (
-        await db_session.execute(select(AtletaModel).filter_by(pk_id=id))
-    ).scalars().first()
+async def get(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula"),
+    arquivados: bool = Query(False, description="Procurar também entre os atletas arquivados"),
+) -> AtletaParcial:
+    selected_fields = parse_fields(fields, list(ATLETA_FIELDS))
+    db_session = atleta_session(shard_sessions, id)
+    row = None
+    for model in atleta_models(arquivados):
+        row = (
+            await db_session.execute(
+                project_atletas_query(select(model).filter_by(pk_id=id), selected_fields, model)
+            )
+        ).first()
+        if row:
+            break
 
-    if not atleta:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Atleta não encontrado com id: {id}'
         )
 
-    return AtletaOut(
-        id=atleta.pk_id,
-        nome=atleta.nome,
-        cpf=atleta.cpf,
-        idade=atleta.idade,
-        peso=atleta.peso,
-        altura=atleta.altura,
-        sexo=atleta.sexo,
-        categoria=CategoriaSimpleOut(nome=atleta.categoria.nome),
-        centro_treinamento=CentroTreinamentoSimpleOut(nome=atleta.centro_treinamento.nome),
-        created_at=atleta.created_at
-    )
+    return row_to_atleta_parcial(row, selected_fields)
 
 
 @router.patch(
@@ -212,9 +741,10 @@ async def get(id: int, db_session: AsyncSession = Depends(get_session)) -> Atlet
 )
 async def patch(
     id: int,
-    db_session: AsyncSession = Depends(get_session),
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
     atleta_up: AtletaUpdate = Body(...),
 ) -> AtletaOut:
+    db_session = atleta_session(shard_sessions, id)
     atleta: AtletaModel = (
         await db_session.execute(select(AtletaModel).filter_by(pk_id=id))
     ).scalars().first()
@@ -226,13 +756,28 @@ async def patch(
         )
 
     atleta_update = atleta_up.model_dump(exclude_unset=True)
+    medida_alterada = any(
+        getattr(atleta, key) != value for key, value in atleta_update.items() if key in MEDIDA_FIELDS
+    )
     for key, value in atleta_update.items():
         setattr(atleta, key, value)
+    atleta.updated_at = datetime.utcnow()
+
+    if medida_alterada:
+        db_session.add(MedidaModel(
+            atleta_id=atleta.pk_id,
+            centro_treinamento_id=atleta.centro_treinamento_id,
+            peso=atleta.peso,
+            altura=atleta.altura,
+            idade=atleta.idade,
+            registrado_em=atleta.updated_at,
+        ))
 
     await db_session.commit()
+    listing_cache.invalidate('atletas')
     await db_session.refresh(atleta)
 
-    return AtletaOut(
+    atleta_out = AtletaOut(
         id=atleta.pk_id,
         nome=atleta.nome,
         cpf=atleta.cpf,
@@ -244,6 +789,9 @@ async def patch(
         centro_treinamento=CentroTreinamentoSimpleOut(nome=atleta.centro_treinamento.nome),
         created_at=atleta.created_at
     )
+    await atleta_events.publish('updated', atleta_out.model_dump(mode='json'))
+
+    return atleta_out
 
 
 @router.delete(
@@ -251,7 +799,8 @@ async def patch(
     summary='Deletar um atleta pelo id',
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def delete(id: int, db_session: AsyncSession = Depends(get_session)) -> None:
+async def delete(id: int, shard_sessions: ShardSessions = Depends(get_shard_sessions)) -> None:
+    db_session = atleta_session(shard_sessions, id)
     atleta: AtletaModel = (
         await db_session.execute(select(AtletaModel).filter_by(pk_id=id))
     ).scalars().first()
@@ -264,3 +813,68 @@ async def delete(id: int, db_session: AsyncSession = Depends(get_session)) -> No
 
     await db_session.delete(atleta)
     await db_session.commit()
+
+    leaderboard_cache.remove_atleta(id)
+    listing_cache.invalidate('atletas')
+    await atleta_events.publish('deleted', {'id': id})
+
+
+@router.post(
+    '/arquivamento',
+    summary='Arquivar atletas inativos',
+    status_code=status.HTTP_200_OK,
+    response_model=ArquivamentoOut,
+    description="""
+    Move para as tabelas de arquivo os atletas sem alterações nem scores há `inativos_dias`
+    dias (padrão: ARCHIVE_INACTIVE_DAYS), junto com suas medições e scores.
+    
+    O mesmo job roda periodicamente quando ARCHIVE_ENABLED está ligado. Atletas arquivados
+    saem das listagens, dos rankings e das consultas por id/CPF, a menos que `arquivados=true`
+    seja informado, e podem ser restaurados com POST /atletas/{id}/restaurar.
+    """,
+)
+async def arquivamento(
+    inativos_dias: Optional[int] = Query(None, ge=1, description="Dias sem atividade para arquivar"),
+) -> ArquivamentoOut:
+    return ArquivamentoOut(arquivados=await atleta_archiver.archive(inactive_days=inativos_dias))
+
+
+@router.post(
+    '/{id}/restaurar',
+    summary='Restaurar um atleta arquivado',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaParcial,
+    response_model_exclude_unset=True,
+    responses={
+        200: {"description": "Atleta restaurado, com suas medições e scores"},
+        303: {"description": "O CPF foi cadastrado novamente depois do arquivamento"},
+        404: {"description": "Atleta não está arquivado"}
+    }
+)
+async def restaurar(id: int, shard_sessions: ShardSessions = Depends(get_shard_sessions)) -> AtletaParcial:
+    db_session = atleta_session(shard_sessions, id)
+    try:
+        restaurado = await atleta_archiver.restore(db_session, id)
+    except IntegrityError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_303_SEE_OTHER,
+            detail=f'Já existe um atleta ativo com o cpf do atleta arquivado {id}'
+        )
+
+    if not restaurado:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Atleta arquivado não encontrado com id: {id}'
+        )
+
+    fields = list(ATLETA_FIELDS)
+    row = (
+        await db_session.execute(project_atletas_query(select(AtletaModel).filter_by(pk_id=id), fields))
+    ).first()
+    atleta = row_to_atleta_parcial(row, fields)
+
+    # Para os consumidores do change-feed, a restauração é um novo cadastro
+    cpf_index.add(atleta.cpf)
+    await atleta_events.publish('created', atleta.model_dump(mode='json'))
+    return atleta
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaArquivoModel, AtletaModel
+from workout_api.configs.settings import settings
+from workout_api.configs.sharding import shard_router
+from workout_api.contrib.bloom import BloomFilter
+from workout_api.contrib.broadcaster import Broadcaster, Subscription
+
+logger = logging.getLogger(__name__)
+
+
+class CpfIndex:
+    """
+    Índice em memória dos CPFs cadastrados, baseado em Bloom filter.
+
+    Um "sim" pode ser falso positivo e é confirmado pelo índice único de `cpf`.
+    Um "não" só é definitivo (`definitely_absent`) com `authoritative`: quando o
+    change-feed entre processos (backend postgres) traz os inserts dos outros
+    workers e nada grava em `atletas` por fora da API (ex.: o loader sintético).
+    Sem isso, um "não" pode estar desatualizado e a consulta vai ao banco. O
+    filtro é carregado de todos os shards no startup e atualizado a cada insert.
+    Quando enche, um novo filtro com o dobro da capacidade (e metade da taxa de
+    erro) é encadeado, mantendo a taxa de falso positivo total limitada.
+    Exclusões não removem CPFs do filtro; eles só viram falsos positivos.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, authoritative: bool = False):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.authoritative = authoritative
+        self.ready = False
+        self._filters: list[BloomFilter] = []
+        self._follower: Optional[asyncio.Task] = None
+
+    def __contains__(self, cpf: str) -> bool:
+        """True se o CPF pode estar cadastrado (sempre True enquanto o filtro não está pronto)"""
+        if not self.ready:
+            return True
+        return any(cpf in bloom for bloom in self._filters)
+
+    def definitely_absent(self, cpf: str) -> bool:
+        """True só quando o filtro pronto e autoritativo garante que o CPF não está cadastrado"""
+        return self.ready and self.authoritative and cpf not in self
+
+    @property
+    def count(self) -> int:
+        return sum(bloom.count for bloom in self._filters)
+
+    def add(self, cpf: str) -> None:
+        if not self._filters or any(cpf in bloom for bloom in self._filters):
+            return
+        if self._filters[-1].full:
+            last = self._filters[-1]
+            self._filters.append(BloomFilter(last.capacity * 2, last.error_rate / 2))
+        self._filters[-1].add(cpf)
+
+    def clear(self) -> None:
+        self.ready = False
+        self._filters = []
+
+    async def load(self, engines: Optional[dict[str, AsyncEngine]] = None) -> None:
+        """(Re)constrói o filtro lendo os CPFs (ativos e arquivados) de todos os shards em streaming"""
+        self.ready = False
+        # Inserts concorrentes à carga já entram no filtro novo via add()
+        self._filters = [BloomFilter(self.capacity, self.error_rate / 2)]
+
+        for shard_engine in (engines or shard_router.engines).values():
+            async with shard_engine.connect() as conn:
+                for model in (AtletaModel, AtletaArquivoModel):
+                    cpfs = await conn.stream_scalars(
+                        select(model.cpf).execution_options(yield_per=10_000)
+                    )
+                    async for cpf in cpfs:
+                        self.add(cpf)
+
+        self.ready = True
+        logger.info(f'Filtro de CPFs carregado com {self.count} CPFs')
+
+    async def follow(self, broadcaster: Broadcaster, subscription: Subscription) -> None:
+        """Adiciona ao filtro os CPFs criados em outros workers; recarrega se perder eventos"""
+        try:
+            while True:
+                if subscription.overflowed and subscription.queue.empty():
+                    logger.warning('Filtro de CPFs perdeu eventos do change-feed; recarregando')
+                    subscription = broadcaster.subscribe()
+                    await self.load()
+                    continue
+
+                event = await subscription.queue.get()
+                if event.type == 'created':
+                    self.add(event.data['cpf'])
+                elif event.type == 'reset':
+                    logger.warning('Change-feed reconectado com eventos perdidos; recarregando o filtro de CPFs')
+                    await self.load()
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    async def start(self, broadcaster: Broadcaster) -> None:
+        # Inscreve antes de carregar para não perder inserts feitos durante a carga
+        self._follower = asyncio.create_task(self.follow(broadcaster, broadcaster.subscribe()))
+        await self.load()
+
+    async def stop(self) -> None:
+        if self._follower is not None:
+            self._follower.cancel()
+            self._follower = None
+        self.clear()
+
+
+cpf_index = CpfIndex(
+    settings.CPF_FILTER_CAPACITY,
+    settings.CPF_FILTER_ERROR_RATE,
+    # Com o backend 'memory' cada worker só vê os próprios inserts
+    authoritative=settings.CPF_FILTER_AUTHORITATIVE and settings.EVENTS_BACKEND == 'postgres',
+)
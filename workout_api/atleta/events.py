@@ -0,0 +1,13 @@
+from workout_api.configs.settings import settings
+from workout_api.contrib.broadcaster import Broadcaster
+
+# Eventos 'created', 'updated' e 'deleted' emitidos pelos handlers de atleta e 'archived' pelo arquivamento
+atleta_events = Broadcaster(
+    channel='atletas_events',
+    history_size=settings.EVENTS_HISTORY_SIZE,
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    dsn=(
+        settings.DATABASE_URL.replace('+asyncpg', '')
+        if settings.EVENTS_BACKEND == 'postgres' else None
+    ),
+)
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from workout_api.configs.database import batch_session
+from workout_api.configs.settings import settings
+from workout_api.contrib.broadcaster import Broadcaster, Subscription
+
+logger = logging.getLogger(__name__)
+
+# Tabelas lidas pelas listagens de atletas (nomes de categoria e centro vêm dos JOINs)
+LISTING_TABLES = ('atletas', 'categorias', 'centros_treinamento')
+
+# (listagem, ((parâmetro, valor), ...)) com os parâmetros ordenados e sem os None
+ListingKey = tuple[str, tuple[tuple[str, Any], ...]]
+
+
+class ListingEntry:
+    __slots__ = ('body', 'generation', 'stored_at')
+
+    def __init__(self, body: bytes, generation: tuple[int, ...]):
+        self.body = body
+        self.generation = generation
+        self.stored_at = time.monotonic()
+
+
+class ListingCache:
+    """
+    Cache LRU das respostas já serializadas (bytes do JSON) das listagens de atletas,
+    limitado a `max_bytes`.
+
+    Cada tabela tem um contador de geração, incrementado após o commit de toda escrita
+    nela; a entrada guarda as gerações lidas *antes* da consulta e só é servida enquanto
+    elas não mudarem. Uma escrita concorrente à consulta invalida a página recém-calculada
+    em vez de deixar uma versão anterior no cache. Escritas de outros workers chegam pelo
+    change-feed; as que não passam pela API expiram em `ttl` segundos.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.size = 0
+        self._entries: OrderedDict[ListingKey, ListingEntry] = OrderedDict()
+        self._generations: dict[str, int] = dict.fromkeys(LISTING_TABLES, 0)
+        self._follower: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def key(listing: str, **params: Any) -> ListingKey:
+        return listing, tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in params.items() if value is not None
+        ))
+
+    def generation(self) -> tuple[int, ...]:
+        return tuple(self._generations[table] for table in LISTING_TABLES)
+
+    def get(self, key: ListingKey) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.generation != self.generation() or time.monotonic() - entry.stored_at > self.ttl:
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.body
+
+    def store(self, key: ListingKey, body: bytes, generation: tuple[int, ...]) -> None:
+        if generation != self.generation() or len(body) > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = ListingEntry(body, generation)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: ListingKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry.body)
+
+    def invalidate(self, *tables: str) -> None:
+        """Incrementa a geração das tabelas escritas; chame após o commit"""
+        for table in tables or LISTING_TABLES:
+            self._generations[table] += 1
+
+    def clear(self) -> None:
+        self.invalidate()
+        self._entries.clear()
+        self.size = 0
+
+    async def respond(
+        self,
+        key: ListingKey,
+        compute: Callable[[], Awaitable[BaseModel]],
+    ) -> Response:
+        """
+        Resposta da listagem: os bytes em cache ou o resultado de `compute()`, serializado
+        como o FastAPI faria com response_model_exclude_unset. Dentro de um POST /batch a
+        sessão enxerga escritas ainda não confirmadas e o cache não é usado.
+        """
+        cacheable = self.enabled and batch_session.get() is None
+        if cacheable:
+            body = self.get(key)
+            if body is not None:
+                return Response(body, media_type='application/json', headers={'X-Cache': 'HIT'})
+
+        generation = self.generation()
+        response = JSONResponse((await compute()).model_dump(mode='json', exclude_unset=True))
+        if cacheable:
+            self.store(key, response.body, generation)
+            response.headers['X-Cache'] = 'MISS'
+        return response
+
+    async def follow(self, broadcaster: Broadcaster, subscription: Subscription) -> None:
+        """Invalida as listagens a cada escrita de atleta (inclusive de outros workers)"""
+        try:
+            while True:
+                if subscription.overflowed and subscription.queue.empty():
+                    subscription = broadcaster.subscribe()
+                    self.clear()
+                    continue
+
+                event = await subscription.queue.get()
+                if event.type == 'reset':
+                    # O change-feed perdeu eventos: nada do que está em cache é confiável
+                    self.clear()
+                else:
+                    self.invalidate('atletas')
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    def start(self, broadcaster: Broadcaster) -> None:
+        if not broadcaster.dsn:
+            # Com o backend 'memory' as escritas de outros workers não chegam: páginas antigas seriam servidas
+            logger.warning("LISTING_CACHE_ENABLED exige EVENTS_BACKEND='postgres'; cache de listagens desabilitado")
+            self.enabled = False
+            return
+        self._follower = asyncio.create_task(self.follow(broadcaster, broadcaster.subscribe()))
+
+    async def stop(self) -> None:
+        if self._follower is not None:
+            self._follower.cancel()
+            self._follower = None
+        self.clear()
+
+
+listing_cache = ListingCache(
+    max_bytes=settings.LISTING_CACHE_MAX_BYTES,
+    ttl=settings.LISTING_CACHE_TTL,
+    enabled=settings.LISTING_CACHE_ENABLED,
+)
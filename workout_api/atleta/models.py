@@ -1,31 +1,31 @@
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, Float, ForeignKey
+from typing import Optional
+from sqlalchemy import Integer, String, DateTime, Float, ForeignKey, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from workout_api.contrib.models import BaseModel
-
-
-class CategoriaModel(BaseModel):
-    __tablename__ = 'categorias'
-
-    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    nome: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
-    
-    atleta: Mapped['AtletaModel'] = relationship(back_populates='categoria')
-
-
-class CentroTreinamentoModel(BaseModel):
-    __tablename__ = 'centros_treinamento'
-
-    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    nome: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
-    endereco: Mapped[str] = mapped_column(String(60), nullable=False)
-    proprietario: Mapped[str] = mapped_column(String(30), nullable=False)
-    
-    atleta: Mapped['AtletaModel'] = relationship(back_populates='centro_treinamento')
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
 
 
 class AtletaModel(BaseModel):
     __tablename__ = 'atletas'
+    # Índices alinhados às combinações de filtro/ordenação de GET /atletas/
+    # (criados na migration 0002_atletas_filter_indexes; (fk, nome, pk_id) servem o keyset de 0006;
+    # pk_id no fim dos índices de ordenação cobre o desempate ORDER BY coluna, pk_id desde 0010)
+    __table_args__ = (
+        Index('ix_atletas_categoria_sexo_idade', 'categoria_id', 'sexo', 'idade'),
+        Index('ix_atletas_centro_sexo_idade', 'centro_treinamento_id', 'sexo', 'idade'),
+        Index('ix_atletas_categoria_nome', 'categoria_id', 'nome', 'pk_id'),
+        Index('ix_atletas_centro_nome', 'centro_treinamento_id', 'nome', 'pk_id'),
+        Index('ix_atletas_categoria_peso', 'categoria_id', 'peso', 'pk_id'),
+        Index('ix_atletas_sexo_idade', 'sexo', 'idade'),
+        Index('ix_atletas_nome', 'nome', 'pk_id'),
+        Index('ix_atletas_idade', 'idade', 'pk_id'),
+        Index('ix_atletas_peso', 'peso', 'pk_id'),
+        Index('ix_atletas_altura', 'altura', 'pk_id'),
+        Index('ix_atletas_created_at', 'created_at', 'pk_id'),
+        Index('ix_atletas_updated_at', 'updated_at'),
+    )
 
     pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     nome: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -35,9 +35,43 @@ class AtletaModel(BaseModel):
     altura: Mapped[float] = mapped_column(Float, nullable=False)
     sexo: Mapped[str] = mapped_column(String(1), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    # Marcador de atualização para refresh incremental (snapshot analítico)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     categoria_id: Mapped[int] = mapped_column(ForeignKey('categorias.pk_id'))
-    categoria: Mapped['CategoriaModel'] = relationship(back_populates='atleta', lazy='selectin')
+    categoria: Mapped['CategoriaModel'] = relationship(back_populates='atletas', lazy='selectin')
     
     centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
-    centro_treinamento: Mapped['CentroTreinamentoModel'] = relationship(back_populates='atleta', lazy='selectin')
+    centro_treinamento: Mapped['CentroTreinamentoModel'] = relationship(back_populates='atletas', lazy='selectin')
+
+
+class AtletaArquivoModel(BaseModel):
+    """
+    Atletas inativos movidos de `atletas` pelo arquivamento (mesmas colunas e pk_id).
+
+    No Postgres é particionada por faixa de created_at (uma partição por ano, criada
+    sob demanda pelo arquivamento); por isso a chave primária inclui created_at e o
+    CPF tem índice simples, não único.
+    """
+    __tablename__ = 'atletas_arquivo'
+    __table_args__ = (
+        PrimaryKeyConstraint('pk_id', 'created_at'),
+        Index('ix_atletas_arquivo_pk_id', 'pk_id'),
+        Index('ix_atletas_arquivo_cpf', 'cpf'),
+        Index('ix_atletas_arquivo_nome', 'nome'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    pk_id: Mapped[int] = mapped_column(Integer, autoincrement=False)
+    nome: Mapped[str] = mapped_column(String(50), nullable=False)
+    cpf: Mapped[str] = mapped_column(String(11), nullable=False)
+    idade: Mapped[int] = mapped_column(Integer, nullable=False)
+    peso: Mapped[float] = mapped_column(Float, nullable=False)
+    altura: Mapped[float] = mapped_column(Float, nullable=False)
+    sexo: Mapped[str] = mapped_column(String(1), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    arquivado_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    categoria_id: Mapped[int] = mapped_column(ForeignKey('categorias.pk_id'))
+    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
@@ -0,0 +1,166 @@
+import base64
+import binascii
+import heapq
+import json
+from itertools import islice
+from typing import Callable, Optional, Union
+
+from fastapi import HTTPException, status
+from fastapi_pagination import Page, Params
+from fastapi_pagination.ext.sqlalchemy import paginate
+from sqlalchemy import Select, and_, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.future import select
+
+from workout_api.atleta.controller import ATLETA_FIELDS, row_to_atleta_parcial
+from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.schemas import AtletaKeysetPage
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.configs.sharding import ShardSessions, shard_router
+
+# Campo de AtletaParcial que cada modelo pai representa e a FK de atletas que aponta para ele
+PARENTS = {
+    CategoriaModel: ('categoria', AtletaModel.categoria_id),
+    CentroTreinamentoModel: ('centro_treinamento', AtletaModel.centro_treinamento_id),
+}
+
+
+def with_atleta_counts(query: Select, parent_model, fk_column: InstrumentedAttribute) -> Select:
+    """Acrescenta `total_atletas` ao SELECT do pai com um único LEFT JOIN agrupado em atletas"""
+    return (
+        query.add_columns(func.count(AtletaModel.pk_id).label('total_atletas'))
+        .outerjoin(AtletaModel, fk_column == parent_model.pk_id)
+        .group_by(parent_model.pk_id)
+    )
+
+
+async def list_or_paginate(
+    session: AsyncSession,
+    query: Select,
+    transformer: Callable[[list], list],
+    page: Optional[int],
+    size: Optional[int],
+) -> Union[Page, list]:
+    """
+    Listagem de categorias/centros: `Page` quando o cliente pede `page` ou `size` e, sem
+    eles, a lista completa, o formato anterior à paginação (clientes antigos não quebram).
+    """
+    if page is not None or size is not None:
+        return await paginate(session, query, params=Params(page=page or 1, size=size or 50), transformer=transformer)
+
+    result = await session.execute(query)
+    rows = result.scalars().all() if len(query.column_descriptions) == 1 else result.all()
+    return transformer(rows)
+
+
+async def count_atletas(
+    shard_sessions: ShardSessions,
+    fk_column: InstrumentedAttribute,
+    ids: list[int],
+) -> dict[int, int]:
+    """Contagem de atletas por pai (só dos ids informados), somada entre os shards"""
+    counts: dict[int, int] = {}
+    if not ids:
+        return counts
+
+    query = select(fk_column, func.count()).filter(fk_column.in_(ids)).group_by(fk_column)
+    for shard in shard_router.names:
+        for parent_id, total in (await shard_sessions.get(shard).execute(query)).all():
+            counts[parent_id] = counts.get(parent_id, 0) + total
+    return counts
+
+
+def encode_cursor(nome: str, pk_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([nome, pk_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        nome, pk_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(nome, str) or not isinstance(pk_id, int):
+            raise ValueError(cursor)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f'Cursor inválido: {cursor}'
+        )
+    return nome, pk_id
+
+
+def atletas_of_query(
+    parent_model,
+    parent_id: int,
+    fields: list[str],
+    after: Optional[tuple[str, int]],
+    limit: int,
+) -> Select:
+    """
+    Atletas de uma categoria/centro em ordem (nome, pk_id), a partir do cursor `after`.
+
+    É um único SELECT partindo do pai com LEFT JOIN em atletas: sem linhas, o pai não
+    existe; uma linha com `_pk` nulo, o pai existe mas não tem (mais) atletas. O filtro
+    (fk, nome, pk_id) > (id, cursor) percorre o índice ix_atletas_<pai>_nome.
+    """
+    parent_field, fk_column = PARENTS[parent_model]
+
+    join_on = fk_column == parent_model.pk_id
+    if after is not None:
+        join_on = and_(join_on, tuple_(AtletaModel.nome, AtletaModel.pk_id) > tuple_(*after))
+
+    query = select(
+        *(
+            parent_model.nome.label(field) if field == parent_field else ATLETA_FIELDS[field].label(field)
+            for field in fields
+        ),
+        AtletaModel.nome.label('_nome'),
+        AtletaModel.pk_id.label('_pk'),
+    ).select_from(parent_model).outerjoin(AtletaModel, join_on)
+
+    for other_model, (other_field, other_fk) in PARENTS.items():
+        if other_field in fields and other_model is not parent_model:
+            query = query.outerjoin(other_model, other_fk == other_model.pk_id)
+
+    return (
+        query.filter(parent_model.pk_id == parent_id)
+        .order_by(AtletaModel.nome, AtletaModel.pk_id)
+        .limit(limit + 1)
+    )
+
+
+async def keyset_atletas_of(
+    shard_sessions: ShardSessions,
+    shards: list[str],
+    parent_model,
+    parent_id: int,
+    fields: list[str],
+    size: int,
+    cursor: Optional[str] = None,
+) -> Optional[AtletaKeysetPage]:
+    """Página keyset de atletas do pai, intercalando os shards informados; None se o pai não existe"""
+    after = decode_cursor(cursor) if cursor else None
+    query = atletas_of_query(parent_model, parent_id, fields, after, size)
+
+    results = [(await shard_sessions.get(shard).execute(query)).all() for shard in shards]
+    if not any(results):
+        return None
+
+    results = [[row for row in shard_rows if row._pk is not None] for shard_rows in results]
+    ranks = None
+    if sum(1 for shard_rows in results if shard_rows) > 1:
+        # Cada shard ordenou nome na collation do banco: o merge usa a mesma ordem
+        ranks = await shard_sessions.collation_ranks({row._nome for shard_rows in results for row in shard_rows})
+
+    rows = heapq.merge(
+        *results,
+        key=lambda row: (ranks[row._nome] if ranks else row._nome, row._pk),
+    )
+    rows = list(islice(rows, size + 1))
+    has_more = len(rows) > size
+    rows = rows[:size]
+
+    return AtletaKeysetPage(
+        items=[row_to_atleta_parcial(row, fields) for row in rows],
+        next_cursor=encode_cursor(rows[-1]._nome, rows[-1]._pk) if has_more else None,
+    )
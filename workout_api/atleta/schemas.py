@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Annotated, Optional
 from pydantic import Field, PositiveFloat, BaseModel, field_validator
 from datetime import datetime
@@ -30,6 +31,16 @@ class AtletaOut(AtletaIn):
 class AtletaUpdate(BaseModel):
     nome: Annotated[Optional[str], Field(None, description='Nome do atleta', example='João', max_length=50)]
     idade: Annotated[Optional[int], Field(None, description='Idade do atleta', example=25)]
+    peso: Annotated[Optional[PositiveFloat], Field(None, description='Peso do atleta em kg', example=75.5)]
+    altura: Annotated[Optional[PositiveFloat], Field(None, description='Altura do atleta em metros', example=1.70)]
+
+    @field_validator('nome', 'idade', 'peso', 'altura')
+    @classmethod
+    def reject_null(cls, v):
+        # Campos opcionais no PATCH, mas NOT NULL no banco: omitir é permitido, enviar null não
+        if v is None:
+            raise ValueError('não pode ser nulo')
+        return v
 
 
 class AtletaGetAll(BaseModel):
@@ -37,3 +48,41 @@ class AtletaGetAll(BaseModel):
     nome: Annotated[str, Field(description='Nome do atleta', max_length=50)]
     centro_treinamento: Annotated[CentroTreinamentoSimpleOut, Field(description='Centro de treinamento')]
     categoria: Annotated[CategoriaSimpleOut, Field(description='Categoria')]
+
+
+class AtletaSort(str, Enum):
+    """Ordenações aceitas pelo endpoint get all de atletas ('-' indica ordem decrescente)"""
+    nome = 'nome'
+    nome_desc = '-nome'
+    idade = 'idade'
+    idade_desc = '-idade'
+    peso = 'peso'
+    peso_desc = '-peso'
+    altura = 'altura'
+    altura_desc = '-altura'
+    created_at = 'created_at'
+    created_at_desc = '-created_at'
+
+
+class AtletaParcial(BaseModel):
+    """Schema para sparse fieldsets (`fields=`): apenas os campos solicitados são preenchidos"""
+    id: Annotated[Optional[int], Field(None, description='Identificador do atleta')]
+    nome: Annotated[Optional[str], Field(None, description='Nome do atleta')]
+    cpf: Annotated[Optional[str], Field(None, description='CPF do atleta')]
+    idade: Annotated[Optional[int], Field(None, description='Idade do atleta')]
+    peso: Annotated[Optional[float], Field(None, description='Peso do atleta em kg')]
+    altura: Annotated[Optional[float], Field(None, description='Altura do atleta em metros')]
+    sexo: Annotated[Optional[str], Field(None, description='Sexo do atleta (M/F)')]
+    categoria: Annotated[Optional[CategoriaSimpleOut], Field(None, description='Categoria')]
+    centro_treinamento: Annotated[Optional[CentroTreinamentoSimpleOut], Field(None, description='Centro de treinamento')]
+    created_at: Annotated[Optional[datetime], Field(None, description='Data de criação do atleta')]
+
+
+class AtletaKeysetPage(BaseModel):
+    """Página keyset de atletas: a próxima página é pedida com `cursor=next_cursor`"""
+    items: Annotated[list[AtletaParcial], Field(description='Atletas da página, em ordem de nome')]
+    next_cursor: Annotated[Optional[str], Field(description='Cursor da próxima página (nulo na última)')]
+
+
+class ArquivamentoOut(BaseModel):
+    arquivados: Annotated[int, Field(description='Atletas movidos para o arquivo', example=120)]
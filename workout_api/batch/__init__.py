@@ -0,0 +1 @@
+# Batch
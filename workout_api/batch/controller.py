@@ -0,0 +1,188 @@
+import json
+import logging
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, status, Body, HTTPException, Request
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp
+
+from workout_api.atleta.events import atleta_events
+from workout_api.atleta.listing_cache import listing_cache
+from workout_api.batch.schemas import BatchIn, BatchOut, OperacaoIn, ResultadoOut
+from workout_api.leaderboard.cache import leaderboard_cache
+from workout_api.configs.database import AsyncSession, batch_session
+from fastapi import Depends
+from workout_api.configs.database import get_session
+from workout_api.configs.sharding import shard_router
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Routers acessíveis em lote; o stream SSE e o arquivamento (com transações próprias
+# por shard) não fazem sentido dentro de uma transação
+BATCH_PREFIXES = ('/atletas', '/categorias', '/centros_treinamento')
+BATCH_EXCLUDED = ('/atletas/eventos', '/atletas/arquivamento')
+
+
+def operacao_permitida(caminho: str) -> bool:
+    path = urlsplit(caminho).path
+    return path.startswith(BATCH_PREFIXES) and not path.startswith(BATCH_EXCLUDED)
+
+
+def build_dispatcher(app) -> ASGIApp:
+    """
+    Pilha usada para executar as operações: o router do app com os exception
+    handlers e o AsyncExitStack das dependências, sem os middlewares HTTP
+    (admissão, deadline e CORS já foram aplicados ao POST /batch).
+    """
+    handlers = {key: value for key, value in app.exception_handlers.items() if key not in (500, Exception)}
+    return ExceptionMiddleware(AsyncExitStackMiddleware(app.router), handlers=handlers)
+
+
+async def execute(request: Request, dispatcher: ASGIApp, operacao: OperacaoIn) -> ResultadoOut:
+    """Executa uma operação como sub-requisição ASGI em processo e coleta a resposta"""
+    url = urlsplit(operacao.caminho)
+    body = b'' if operacao.corpo is None else json.dumps(operacao.corpo).encode()
+    scope = {
+        'type': 'http',
+        'asgi': request.scope.get('asgi', {'version': '3.0'}),
+        'http_version': '1.1',
+        'method': operacao.metodo,
+        'scheme': request.url.scheme,
+        'server': request.scope.get('server'),
+        'client': request.scope.get('client'),
+        'root_path': request.scope.get('root_path', ''),
+        'path': url.path,
+        'raw_path': url.path.encode(),
+        'query_string': url.query.encode(),
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        'app': request.app,
+        'state': {},
+    }
+
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    response = {'status': status.HTTP_500_INTERNAL_SERVER_ERROR, 'body': b''}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['body'] += message.get('body', b'')
+
+    try:
+        await dispatcher(scope, receive, send)
+    except Exception as exc:
+        # Exceções sem handler específico: mesma resposta do handler genérico do app
+        handler = request.app.exception_handlers.get(Exception)
+        if handler is None:
+            raise
+        error_response = await handler(Request(scope, receive), exc)
+        await error_response(scope, receive, send)
+
+    return ResultadoOut(
+        status=response['status'],
+        corpo=json.loads(response['body']) if response['body'] else None,
+    )
+
+
+@router.post(
+    '/',
+    summary='Executar várias operações em uma transação',
+    status_code=status.HTTP_200_OK,
+    response_model=BatchOut,
+    description="""
+    Executa uma lista de operações sobre `/atletas`, `/categorias` e `/centros_treinamento`
+    em uma única sessão e transação do banco, sem uma requisição HTTP e um commit por operação.
+
+    **Semântica:**
+    - Cada operação roda em um SAVEPOINT: uma falha desfaz só aquela operação
+    - `atomico=true`: a primeira falha (status fora de 2xx) desfaz o lote inteiro e as operações
+      seguintes não são executadas (status 424)
+    - Eventos do change-feed só são publicados se a transação for confirmada
+    - Indisponível com sharding (`SHARD_URLS`): escritas em outros shards e as réplicas de
+      categorias/centros teriam commits próprios, fora da transação do lote (status 422)
+
+    **Exemplo:**
+    ```json
+    {
+      "atomico": true,
+      "operacoes": [
+        {"metodo": "POST", "caminho": "/categorias/", "corpo": {"nome": "RX"}},
+        {"metodo": "GET", "caminho": "/atletas/?categoria=RX&fields=id,nome"}
+      ]
+    }
+    ```
+    """,
+    responses={
+        200: {"description": "Lote executado; veja `confirmado` e o status de cada operação"},
+        422: {"description": "Operações inválidas, fora das rotas permitidas ou sharding habilitado"}
+    }
+)
+async def batch(
+    request: Request,
+    db_session: AsyncSession = Depends(get_session),
+    batch_in: BatchIn = Body(...),
+) -> BatchOut:
+    if shard_router.enabled:
+        # A transação do lote é a de uma conexão do `default`: não haveria tudo-ou-nada entre shards
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail='Requisições em lote não são suportadas com sharding habilitado (SHARD_URLS)'
+        )
+
+    invalidas = [operacao.caminho for operacao in batch_in.operacoes if not operacao_permitida(operacao.caminho)]
+    if invalidas:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f'Rotas não permitidas em lote: {", ".join(invalidas)}. '
+                   f'Rotas aceitas: {", ".join(BATCH_PREFIXES)}'
+        )
+
+    dispatcher = build_dispatcher(request.app)
+    resultados: list[ResultadoOut] = []
+    abortado = False
+
+    # Transação externa na conexão; o commit/rollback de cada handler vira um SAVEPOINT
+    async with db_session.bind.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, join_transaction_mode='create_savepoint', expire_on_commit=False)
+        token = batch_session.set(session)
+        try:
+            async with atleta_events.deferred() as eventos:
+                for operacao in batch_in.operacoes:
+                    if abortado:
+                        resultados.append(ResultadoOut(
+                            status=status.HTTP_424_FAILED_DEPENDENCY,
+                            corpo={'detail': 'Operação não executada: lote abortado por falha anterior'},
+                        ))
+                        continue
+
+                    resultado = await execute(request, dispatcher, operacao)
+                    resultados.append(resultado)
+                    if not 200 <= resultado.status < 300:
+                        if session.in_transaction():
+                            await session.rollback()
+                        abortado = batch_in.atomico
+
+                if abortado:
+                    eventos.clear()
+                    await transaction.rollback()
+                    # Exclusões desfeitas já tinham sido aplicadas ao cache de leaderboards
+                    leaderboard_cache.clear()
+                else:
+                    if session.in_transaction():
+                        await session.commit()
+                    await transaction.commit()
+                    # Páginas calculadas por outras requisições durante o lote viam o estado anterior
+                    listing_cache.invalidate()
+        finally:
+            batch_session.reset(token)
+            await session.close()
+
+    return BatchOut(confirmado=not abortado, resultados=resultados)
@@ -0,0 +1,28 @@
+from typing import Annotated, Any, Literal, Optional
+from pydantic import Field, BaseModel
+
+from workout_api.configs.settings import settings
+
+
+class OperacaoIn(BaseModel):
+    metodo: Annotated[Literal['GET', 'POST', 'PATCH', 'DELETE'], Field(description='Método HTTP da operação', example='POST')]
+    caminho: Annotated[str, Field(description='Caminho da rota, com query string opcional', example='/categorias/')]
+    corpo: Annotated[Optional[Any], Field(None, description='Corpo JSON da operação', example={'nome': 'RX'})]
+
+
+class BatchIn(BaseModel):
+    operacoes: Annotated[
+        list[OperacaoIn],
+        Field(description='Operações executadas em ordem', min_length=1, max_length=settings.BATCH_MAX_OPERACOES),
+    ]
+    atomico: Annotated[bool, Field(False, description='Tudo ou nada: a primeira falha desfaz o lote inteiro')]
+
+
+class ResultadoOut(BaseModel):
+    status: Annotated[int, Field(description='Status HTTP da operação', example=201)]
+    corpo: Annotated[Optional[Any], Field(None, description='Corpo JSON da resposta da operação')]
+
+
+class BatchOut(BaseModel):
+    confirmado: Annotated[bool, Field(description='Se a transação do lote foi confirmada (commit)')]
+    resultados: Annotated[list[ResultadoOut], Field(description='Respostas das operações, na ordem enviada')]
@@ -1,17 +1,25 @@
-from uuid import uuid4
-from fastapi import APIRouter, status, Body, HTTPException
-from pydantic import UUID4
+from fastapi import APIRouter, status, Body, HTTPException, Query
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
+from fastapi_pagination import Page
+from typing import Optional, Union
 
-from workout_api.categorias.schemas import CategoriaIn, CategoriaOut
+from workout_api.categorias.schemas import CategoriaIn, CategoriaOut, CategoriaListOut, CategoriaSort
 from workout_api.categorias.models import CategoriaModel
+from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.controller import parse_fields
+from workout_api.atleta.listing_cache import listing_cache
+from workout_api.atleta.relations import count_atletas, keyset_atletas_of, list_or_paginate, with_atleta_counts
+from workout_api.atleta.schemas import AtletaKeysetPage
 from workout_api.configs.database import AsyncSession
 from fastapi import Depends
 from workout_api.configs.database import get_session
+from workout_api.configs.sharding import ShardSessions, get_shard_sessions, shard_router
 
 router = APIRouter()
 
+NESTED_DEFAULT_FIELDS = ['id', 'nome', 'categoria', 'centro_treinamento']
+
 
 @router.post(
     '/',
@@ -20,17 +28,16 @@ router = APIRouter()
     response_model=CategoriaOut,
 )
 async def post(
-    db_session: AsyncSession = Depends(get_session),
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
     categoria_in: CategoriaIn = Body(...),
 ) -> CategoriaOut:
+    db_session = shard_sessions.primary
     try:
-        categoria_out = CategoriaOut(id=uuid4(), **categoria_in.model_dump())
-        categoria_model = CategoriaModel(**categoria_out.model_dump())
+        categoria_model = CategoriaModel(**categoria_in.model_dump())
 
         db_session.add(categoria_model)
         await db_session.commit()
-        
-        return categoria_out
+        listing_cache.invalidate('categorias')
     except IntegrityError:
         await db_session.rollback()
         raise HTTPException(
@@ -38,19 +45,75 @@ async def post(
             detail=f'Já existe uma categoria cadastrada com o nome: {categoria_in.nome}'
         )
 
+    # Categorias são dados de referência: replicadas em todos os shards
+    await shard_router.replicate(
+        CategoriaModel, {'pk_id': categoria_model.pk_id, **categoria_in.model_dump()}
+    )
+
+    return CategoriaOut(id=categoria_model.pk_id, **categoria_in.model_dump())
+
+
+def to_categoria_list_out(row) -> CategoriaListOut:
+    """Converte uma linha da listagem (categoria ou categoria + total_atletas) no schema de saída"""
+    if isinstance(row, CategoriaModel):
+        return CategoriaListOut(id=row.pk_id, nome=row.nome)
+
+    categoria, total_atletas = row
+    return CategoriaListOut(id=categoria.pk_id, nome=categoria.nome, total_atletas=total_atletas)
+
 
 @router.get(
     '/',
     summary='Consultar todas as categorias',
     status_code=status.HTTP_200_OK,
-    response_model=list[CategoriaOut],
+    response_model=Union[Page[CategoriaListOut], list[CategoriaListOut]],
+    response_model_exclude_unset=True,
+    description="""
+    Lista as categorias com busca por nome, ordenação e paginação opcional.
+    
+    **Parâmetros:**
+    - `nome`: Busca parcial por nome (case insensitive)
+    - `sort`: `id` ou `nome`; prefixe com `-` para ordem decrescente
+    - `com_atletas`: Inclui `total_atletas`, calculado no mesmo SELECT com um LEFT JOIN agrupado em atletas
+    - `page` / `size`: Paginação; informando qualquer um deles a resposta é uma página
+      (`items`, `total`, ...), sem eles é a lista completa
+    """,
 )
-async def query(db_session: AsyncSession = Depends(get_session)) -> list[CategoriaOut]:
-    categorias: list[CategoriaOut] = (
-        await db_session.execute(select(CategoriaModel))
-    ).scalars().all()
+async def query(
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    nome: Optional[str] = Query(None, description="Buscar por parte do nome"),
+    sort: CategoriaSort = Query(CategoriaSort.id, description="Campo de ordenação ('-' para decrescente)"),
+    com_atletas: bool = Query(False, description="Incluir a quantidade de atletas de cada categoria"),
+    page: Optional[int] = Query(None, ge=1, description="Página (ativa a resposta paginada)"),
+    size: Optional[int] = Query(None, ge=1, le=100, description="Itens por página (ativa a resposta paginada)"),
+) -> Union[Page[CategoriaListOut], list[CategoriaListOut]]:
+    query = select(CategoriaModel)
+
+    if nome:
+        query = query.filter(CategoriaModel.nome.icontains(nome, autoescape=True))
+
+    column = CategoriaModel.pk_id if sort.value.lstrip('-') == 'id' else CategoriaModel.nome
+    query = query.order_by(column.desc() if sort.value.startswith('-') else column.asc())
+
+    # Com shards, os atletas não estão todos no banco da listagem: contagem separada da página
+    if com_atletas and not shard_router.enabled:
+        query = with_atleta_counts(query, CategoriaModel, AtletaModel.categoria_id)
+
+    listing = await list_or_paginate(
+        shard_sessions.primary,
+        query,
+        lambda rows: [to_categoria_list_out(row) for row in rows],
+        page,
+        size,
+    )
+    items = listing.items if isinstance(listing, Page) else listing
+
+    if com_atletas and shard_router.enabled:
+        counts = await count_atletas(shard_sessions, AtletaModel.categoria_id, [item.id for item in items])
+        for item in items:
+            item.total_atletas = counts.get(item.id, 0)
 
-    return [CategoriaOut(id=categoria.pk_id, nome=categoria.nome) for categoria in categorias]
+    return listing
 
 
 @router.get(
@@ -71,3 +134,55 @@ async def get(id: int, db_session: AsyncSession = Depends(get_session)) -> Categ
         )
 
     return CategoriaOut(id=categoria.pk_id, nome=categoria.nome)
+
+
+@router.get(
+    '/{id}/atletas',
+    summary='Consultar os atletas de uma categoria',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaKeysetPage,
+    response_model_exclude_unset=True,
+    description="""
+    Atletas da categoria em ordem de nome, com paginação keyset (sem OFFSET).
+    
+    Executa um único SELECT partindo da categoria com LEFT JOIN em atletas, servido pelo
+    índice (categoria_id, nome, pk_id); a categoria não é carregada pelo ORM.
+    
+    **Parâmetros:**
+    - `size`: Itens por página (padrão: 50)
+    - `cursor`: Valor de `next_cursor` da página anterior
+    - `fields`: Campos dos atletas, separados por vírgula (padrão: id, nome, categoria, centro_treinamento)
+    """,
+    responses={
+        200: {"description": "Página de atletas"},
+        404: {"description": "Categoria não encontrada"},
+        422: {"description": "Cursor ou campos inválidos"}
+    }
+)
+async def atletas(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    size: int = Query(50, ge=1, le=200, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página"),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula"),
+) -> AtletaKeysetPage:
+    selected_fields = parse_fields(fields, NESTED_DEFAULT_FIELDS)
+    cache_key = listing_cache.key(
+        'categorias.atletas', id=id, size=size, cursor=cursor, fields=sorted(selected_fields)
+    )
+
+    async def compute() -> AtletaKeysetPage:
+        # Atletas de uma categoria podem estar em qualquer shard
+        page = await keyset_atletas_of(
+            shard_sessions, shard_router.names, CategoriaModel, id, selected_fields, size, cursor
+        )
+
+        if page is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Categoria não encontrada com id: {id}'
+            )
+
+        return page
+
+    return await listing_cache.respond(cache_key, compute)
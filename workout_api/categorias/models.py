@@ -9,4 +9,5 @@ class CategoriaModel(BaseModel):
     pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     nome: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     
-    atleta: Mapped['AtletaModel'] = relationship(back_populates='categoria')
+    # Coleção nunca carregada pelo ORM: use GET /categorias/{id}/atletas (keyset)
+    atletas: Mapped[list['AtletaModel']] = relationship(back_populates='categoria', lazy='raise')
@@ -1,4 +1,5 @@
-from typing import Annotated
+from enum import Enum
+from typing import Annotated, Optional
 from pydantic import Field, BaseModel
 
 
@@ -10,5 +11,17 @@ class CategoriaOut(CategoriaIn):
     id: Annotated[int, Field(description='Identificador da categoria')]
 
 
+class CategoriaListOut(CategoriaOut):
+    total_atletas: Annotated[Optional[int], Field(None, description='Quantidade de atletas (com `com_atletas=true`)')]
+
+
+class CategoriaSort(str, Enum):
+    """Ordenações aceitas pela listagem de categorias ('-' indica ordem decrescente)"""
+    id = 'id'
+    id_desc = '-id'
+    nome = 'nome'
+    nome_desc = '-nome'
+
+
 class CategoriaSimpleOut(BaseModel):
     nome: Annotated[str, Field(description='Nome da categoria', max_length=50)]
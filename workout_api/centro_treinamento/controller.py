@@ -1,17 +1,33 @@
 from uuid import uuid4
-from fastapi import APIRouter, status, Body, HTTPException
+from fastapi import APIRouter, status, Body, HTTPException, Query
 from pydantic import UUID4
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
+from fastapi_pagination import Page
+from typing import Optional, Union
 
-from workout_api.centro_treinamento.schemas import CentroTreinamentoIn, CentroTreinamentoOut
+from workout_api.centro_treinamento.schemas import (
+    CentroTreinamentoIn,
+    CentroTreinamentoOut,
+    CentroTreinamentoListOut,
+    CentroTreinamentoSort,
+)
 from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.controller import parse_fields
+from workout_api.atleta.listing_cache import listing_cache
+from workout_api.atleta.relations import count_atletas, keyset_atletas_of, list_or_paginate, with_atleta_counts
+from workout_api.atleta.schemas import AtletaKeysetPage
+from workout_api.configs.sharding import PRIMARY_SHARD
 from workout_api.configs.database import AsyncSession
 from fastapi import Depends
 from workout_api.configs.database import get_session
+from workout_api.configs.sharding import ShardSessions, get_shard_sessions, shard_router
 
 router = APIRouter()
 
+NESTED_DEFAULT_FIELDS = ['id', 'nome', 'categoria', 'centro_treinamento']
+
 
 @router.post(
     '/',
@@ -20,17 +36,21 @@ router = APIRouter()
     response_model=CentroTreinamentoOut,
 )
 async def post(
-    db_session: AsyncSession = Depends(get_session),
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
     centro_in: CentroTreinamentoIn = Body(...),
 ) -> CentroTreinamentoOut:
+    db_session = shard_sessions.primary
     try:
-        centro_out = CentroTreinamentoOut(id=uuid4(), **centro_in.model_dump())
-        centro_model = CentroTreinamentoModel(**centro_out.model_dump())
+        shard_router.validate(centro_in.shard)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    try:
+        centro_model = CentroTreinamentoModel(**centro_in.model_dump())
 
         db_session.add(centro_model)
         await db_session.commit()
-        
-        return centro_out
+        listing_cache.invalidate('centros_treinamento')
     except IntegrityError:
         await db_session.rollback()
         raise HTTPException(
@@ -38,27 +58,81 @@ async def post(
             detail=f'Já existe um centro de treinamento cadastrado com o nome: {centro_in.nome}'
         )
 
+    # Centros são dados de referência: replicados em todos os shards
+    await shard_router.replicate(
+        CentroTreinamentoModel, {'pk_id': centro_model.pk_id, **centro_in.model_dump()}
+    )
+    shard_router.remember_centro(centro_model.pk_id, centro_model.shard)
+
+    return CentroTreinamentoOut(id=centro_model.pk_id, **centro_in.model_dump())
+
+
+def to_centro_list_out(row) -> CentroTreinamentoListOut:
+    """Converte uma linha da listagem (centro ou centro + total_atletas) no schema de saída"""
+    centro, extra = (row, {}) if isinstance(row, CentroTreinamentoModel) else (row[0], {'total_atletas': row[1]})
+
+    return CentroTreinamentoListOut(
+        id=centro.pk_id,
+        nome=centro.nome,
+        endereco=centro.endereco,
+        proprietario=centro.proprietario,
+        shard=centro.shard,
+        **extra
+    )
+
 
 @router.get(
     '/',
     summary='Consultar todos os centros de treinamento',
     status_code=status.HTTP_200_OK,
-    response_model=list[CentroTreinamentoOut],
+    response_model=Union[Page[CentroTreinamentoListOut], list[CentroTreinamentoListOut]],
+    response_model_exclude_unset=True,
+    description="""
+    Lista os centros de treinamento com busca por nome, ordenação e paginação opcional.
+    
+    **Parâmetros:**
+    - `nome`: Busca parcial por nome (case insensitive)
+    - `sort`: `id` ou `nome`; prefixe com `-` para ordem decrescente
+    - `com_atletas`: Inclui `total_atletas`, calculado no mesmo SELECT com um LEFT JOIN agrupado em atletas
+    - `page` / `size`: Paginação; informando qualquer um deles a resposta é uma página
+      (`items`, `total`, ...), sem eles é a lista completa
+    """,
 )
-async def query(db_session: AsyncSession = Depends(get_session)) -> list[CentroTreinamentoOut]:
-    centros: list[CentroTreinamentoOut] = (
-        await db_session.execute(select(CentroTreinamentoModel))
-    ).scalars().all()
-
-    return [
-        CentroTreinamentoOut(
-            id=centro.pk_id,
-            nome=centro.nome,
-            endereco=centro.endereco,
-            proprietario=centro.proprietario
-        )
-        for centro in centros
-    ]
+async def query(
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    nome: Optional[str] = Query(None, description="Buscar por parte do nome"),
+    sort: CentroTreinamentoSort = Query(CentroTreinamentoSort.id, description="Campo de ordenação ('-' para decrescente)"),
+    com_atletas: bool = Query(False, description="Incluir a quantidade de atletas de cada centro"),
+    page: Optional[int] = Query(None, ge=1, description="Página (ativa a resposta paginada)"),
+    size: Optional[int] = Query(None, ge=1, le=100, description="Itens por página (ativa a resposta paginada)"),
+) -> Union[Page[CentroTreinamentoListOut], list[CentroTreinamentoListOut]]:
+    query = select(CentroTreinamentoModel)
+
+    if nome:
+        query = query.filter(CentroTreinamentoModel.nome.icontains(nome, autoescape=True))
+
+    column = CentroTreinamentoModel.pk_id if sort.value.lstrip('-') == 'id' else CentroTreinamentoModel.nome
+    query = query.order_by(column.desc() if sort.value.startswith('-') else column.asc())
+
+    # Com shards, os atletas de cada centro estão no shard dele: contagem separada da página
+    if com_atletas and not shard_router.enabled:
+        query = with_atleta_counts(query, CentroTreinamentoModel, AtletaModel.centro_treinamento_id)
+
+    listing = await list_or_paginate(
+        shard_sessions.primary,
+        query,
+        lambda rows: [to_centro_list_out(row) for row in rows],
+        page,
+        size,
+    )
+    items = listing.items if isinstance(listing, Page) else listing
+
+    if com_atletas and shard_router.enabled:
+        counts = await count_atletas(shard_sessions, AtletaModel.centro_treinamento_id, [item.id for item in items])
+        for item in items:
+            item.total_atletas = counts.get(item.id, 0)
+
+    return listing
 
 
 @router.get(
@@ -82,5 +156,59 @@ async def get(id: int, db_session: AsyncSession = Depends(get_session)) -> Centr
         id=centro.pk_id,
         nome=centro.nome,
         endereco=centro.endereco,
-        proprietario=centro.proprietario
+        proprietario=centro.proprietario,
+        shard=centro.shard
+    )
+
+
+@router.get(
+    '/{id}/atletas',
+    summary='Consultar os atletas de um centro de treinamento',
+    status_code=status.HTTP_200_OK,
+    response_model=AtletaKeysetPage,
+    response_model_exclude_unset=True,
+    description="""
+    Atletas do centro de treinamento em ordem de nome, com paginação keyset (sem OFFSET).
+    
+    Executa um único SELECT partindo do centro de treinamento com LEFT JOIN em atletas, servido pelo
+    índice (centro_treinamento_id, nome, pk_id); o centro de treinamento não é carregado pelo ORM.
+    
+    **Parâmetros:**
+    - `size`: Itens por página (padrão: 50)
+    - `cursor`: Valor de `next_cursor` da página anterior
+    - `fields`: Campos dos atletas, separados por vírgula (padrão: id, nome, categoria, centro_treinamento)
+    """,
+    responses={
+        200: {"description": "Página de atletas"},
+        404: {"description": "Centro de treinamento não encontrado"},
+        422: {"description": "Cursor ou campos inválidos"}
+    }
+)
+async def atletas(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    size: int = Query(50, ge=1, le=200, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página"),
+    fields: Optional[str] = Query(None, description="Campos a retornar, separados por vírgula"),
+) -> AtletaKeysetPage:
+    selected_fields = parse_fields(fields, NESTED_DEFAULT_FIELDS)
+    cache_key = listing_cache.key(
+        'centros_treinamento.atletas', id=id, size=size, cursor=cursor, fields=sorted(selected_fields)
     )
+
+    async def compute() -> AtletaKeysetPage:
+        # Todos os atletas de um centro estão no shard dele
+        shard = await shard_router.shard_for_centro(shard_sessions.primary, id) or PRIMARY_SHARD
+        page = await keyset_atletas_of(
+            shard_sessions, [shard], CentroTreinamentoModel, id, selected_fields, size, cursor
+        )
+
+        if page is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Centro de treinamento não encontrado com id: {id}'
+            )
+
+        return page
+
+    return await listing_cache.respond(cache_key, compute)
@@ -10,5 +10,8 @@ class CentroTreinamentoModel(BaseModel):
     nome: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     endereco: Mapped[str] = mapped_column(String(60), nullable=False)
     proprietario: Mapped[str] = mapped_column(String(30), nullable=False)
+    # Shard (banco regional) que armazena os atletas deste centro
+    shard: Mapped[str] = mapped_column(String(30), nullable=False, default='default', server_default='default')
     
-    atleta: Mapped['AtletaModel'] = relationship(back_populates='centro_treinamento')
+    # Coleção nunca carregada pelo ORM: use GET /centros_treinamento/{id}/atletas (keyset)
+    atletas: Mapped[list['AtletaModel']] = relationship(back_populates='centro_treinamento', lazy='raise')
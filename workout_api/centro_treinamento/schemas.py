@@ -1,4 +1,5 @@
-from typing import Annotated
+from enum import Enum
+from typing import Annotated, Optional
 from pydantic import Field, BaseModel
 
 
@@ -6,11 +7,24 @@ class CentroTreinamentoIn(BaseModel):
     nome: Annotated[str, Field(description='Nome do centro de treinamento', example='CT King', max_length=50)]
     endereco: Annotated[str, Field(description='Endereço do centro de treinamento', example='Rua X, Q02', max_length=60)]
     proprietario: Annotated[str, Field(description='Nome do proprietário', example='Marcos', max_length=30)]
+    shard: Annotated[str, Field('default', description='Shard (banco regional) dos atletas do centro', example='default', max_length=30)]
 
 
 class CentroTreinamentoOut(CentroTreinamentoIn):
     id: Annotated[int, Field(description='Identificador do centro de treinamento')]
 
 
+class CentroTreinamentoListOut(CentroTreinamentoOut):
+    total_atletas: Annotated[Optional[int], Field(None, description='Quantidade de atletas (com `com_atletas=true`)')]
+
+
+class CentroTreinamentoSort(str, Enum):
+    """Ordenações aceitas pela listagem de centros de treinamento ('-' indica ordem decrescente)"""
+    id = 'id'
+    id_desc = '-id'
+    nome = 'nome'
+    nome_desc = '-nome'
+
+
 class CentroTreinamentoSimpleOut(BaseModel):
     nome: Annotated[str, Field(description='Nome do centro de treinamento', max_length=50)]
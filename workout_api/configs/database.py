@@ -1,13 +1,35 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from workout_api.configs.settings import settings
+from workout_api.contrib.deadlines import apply_statement_timeout
+
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)
+# Cada transação herda o deadline da requisição como statement_timeout
+event.listen(Session, 'after_begin', apply_statement_timeout)
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
+# Sessão compartilhada pelas operações de um POST /batch (uma transação para o lote)
+batch_session: ContextVar[Optional[AsyncSession]] = ContextVar('batch_session', default=None)
+
+
 async def get_session() -> AsyncSession:
+    session = batch_session.get()
+    if session is not None:
+        yield session
+        return
+
     async with async_session() as session:
         yield session
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -6,6 +7,92 @@ load_dotenv()
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+
+    # Sharding de atletas por centro de treinamento: {"nome_do_shard": "url"}; DATABASE_URL é o shard 'default'
+    SHARD_URLS: dict[str, str] = {}
+    SHARD_ID_MODULUS: int = 16
+
+    # Controle de admissão: limita a concorrência ao tamanho do pool (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_READ_LIMIT: Optional[int] = None
+    ADMISSION_WRITE_LIMIT: Optional[int] = None
+    ADMISSION_BULK_LIMIT: int = 2
+    ADMISSION_READ_QUEUE: int = 100
+    ADMISSION_WRITE_QUEUE: int = 50
+    ADMISSION_BULK_QUEUE: int = 5
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_BULK_PATHS: list[str] = ['/batch', '/atletas/arquivamento']
+    # Limites adicionais por prefixo de rota, ex.: {"/leaderboard": 4}
+    ADMISSION_ROUTE_LIMITS: dict[str, int] = {}
+
+    # Deadlines por rota (ms; 0 desativa). Chaves: '/prefixo' ou 'METODO /prefixo', ex.: {"GET /atletas": 3000}
+    REQUEST_DEADLINE_MS: int = 30000
+    REQUEST_DEADLINES_MS: dict[str, int] = {}
+
+    # Cache incremental de leaderboards (por processo)
+    LEADERBOARD_CACHE_ENABLED: bool = True
+    LEADERBOARD_CACHE_TTL: float = 60.0
+    LEADERBOARD_CACHE_MAX_SCOPES: int = 64
+
+    # Change-feed (SSE) de atletas: 'memory' (por processo) ou 'postgres' (LISTEN/NOTIFY)
+    EVENTS_BACKEND: str = 'memory'
+    EVENTS_HISTORY_SIZE: int = 1000
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_INTERVAL: float = 15.0
+
+    # Group-commit de POST /atletas/: inserts concorrentes viram um INSERT multi-linha
+    ATLETA_BATCH_ENABLED: bool = False
+    ATLETA_BATCH_MAX_SIZE: int = 100
+    ATLETA_BATCH_MAX_DELAY_MS: float = 5.0
+
+    # Bloom filter de CPFs cadastrados (por processo): responde CPFs inexistentes sem ir ao banco
+    CPF_FILTER_ENABLED: bool = True
+    CPF_FILTER_CAPACITY: int = 100_000
+    CPF_FILTER_ERROR_RATE: float = 0.01
+    # Responder 404 pelo filtro sem consultar o banco; exige EVENTS_BACKEND='postgres' e nenhuma
+    # escrita em `atletas` fora da API (loader sintético, SQL manual)
+    CPF_FILTER_AUTHORITATIVE: bool = False
+
+    # Cache das respostas serializadas das listagens de atletas (por processo), invalidado a cada escrita;
+    # exige EVENTS_BACKEND='postgres' (sem ele, fica desabilitado com um aviso no startup)
+    LISTING_CACHE_ENABLED: bool = True
+    LISTING_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    LISTING_CACHE_TTL: float = 30.0
+
+    # Idempotency-Key nos POST de cadastro: respostas guardadas por processo (LRU limitado a bytes)
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_HEADER: str = 'Idempotency-Key'
+    IDEMPOTENCY_TTL: float = 24 * 3600.0
+    IDEMPOTENCY_MAX_BYTES: int = 8 * 1024 * 1024
+    IDEMPOTENCY_PATHS: list[str] = ['/atletas/', '/categorias/', '/centros_treinamento/']
+
+    # Arquivamento de atletas inativos (sem alterações nem scores há ARCHIVE_INACTIVE_DAYS dias)
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_INACTIVE_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_INTERVAL: float = 3600.0
+
+    # Snapshot colunar (NumPy) de atletas para /analytics; requer numpy
+    ANALYTICS_ENABLED: bool = False
+    ANALYTICS_REFRESH_INTERVAL: float = 30.0
+    # Exclusões chegam pelo change-feed; a cada N refreshes os pk_id existentes são relidos (reconciliação)
+    ANALYTICS_RECONCILE_EVERY: int = 20
+
+    # POST /batch: operações por lote
+    BATCH_MAX_OPERACOES: int = 100
+
+    # Perfilamento sob demanda (cProfile) de requisições marcadas com o header ou o query param
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = 'X-Profile'
+    PROFILING_QUERY_PARAM: str = '_profile'
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_HISTORY: int = 20
+    PROFILING_TOP_FUNCTIONS: int = 25
+    # Diretório para gravar os .prof (pstats/snakeviz) e os relatórios em JSON
+    PROFILING_DIR: Optional[str] = None
 
     class Config:
         env_file = '.env'
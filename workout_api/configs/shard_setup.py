@@ -0,0 +1,26 @@
+"""
+Configuração única das sequences de atletas para o sharding.
+
+    python -m workout_api.configs.shard_setup
+
+Rode depois das migrations, ao ligar SHARD_URLS e a cada shard acrescentado. Os
+atletas existentes antes do sharding continuam no `default`, roteados pelo limite
+gravado em `shard_config`. As sequences só avançam; rodar de novo é seguro.
+"""
+import asyncio
+import logging
+
+from workout_api.configs.sharding import PRIMARY_SHARD, shard_router
+
+
+async def main() -> None:
+    try:
+        await shard_router.configure()
+    finally:
+        await shard_router.dispose()
+        await shard_router.engines[PRIMARY_SHARD].dispose()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    asyncio.run(main())
@@ -0,0 +1,328 @@
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import Integer, delete, func, insert, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import Mapped, mapped_column, sessionmaker
+
+from workout_api.atleta.models import AtletaArquivoModel, AtletaModel
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.configs.database import engine, get_session
+from workout_api.configs.settings import settings
+from workout_api.contrib.models import BaseModel
+from workout_api.scores.models import ScoreArquivoModel, ScoreModel
+from workout_api.workouts.models import WorkoutModel
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_SHARD = 'default'
+
+# Tabelas de referência replicadas do `default` para os demais shards
+REFERENCE_MODELS = (CategoriaModel, CentroTreinamentoModel, WorkoutModel)
+
+
+class ShardConfigModel(BaseModel):
+    """
+    Configuração gravada (no shard `default`) por `python -m workout_api.configs.shard_setup`.
+
+    `legacy_max_id` é o maior id de atleta existente antes do sharding: esses atletas
+    têm ids sequenciais, ficam no `default` e não são roteados pelo resto da divisão.
+    """
+    __tablename__ = 'shard_config'
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    modulus: Mapped[int] = mapped_column(Integer, nullable=False)
+    legacy_max_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+async def max_used_id(conn: AsyncConnection, model, arquivo_model) -> int:
+    """Maior id já usado no shard para a tabela: tabela ativa, arquivo e a própria sequence"""
+    used = [
+        (await conn.execute(select(func.coalesce(func.max(table.pk_id), 0)))).scalar()
+        for table in (model, arquivo_model)
+    ]
+    if conn.dialect.name == 'postgresql':
+        sequence = (await conn.execute(
+            text("SELECT pg_get_serial_sequence(:table, 'pk_id')"), {'table': model.__tablename__}
+        )).scalar()
+        last_value, is_called = (await conn.execute(text(f'SELECT last_value, is_called FROM {sequence}'))).one()
+        used.append(last_value if is_called else last_value - 1)
+    return max(used)
+
+
+class ShardRouter:
+    """
+    Roteia atletas para o banco (shard) que atende o centro de treinamento deles.
+
+    O shard `default` é o DATABASE_URL; os demais vêm de SHARD_URLS, cuja ordem
+    define o índice de cada shard (1, 2, ...) e por isso só deve crescer no final.
+    Em cada shard a sequence de atletas gera ids ≡ índice (mod SHARD_ID_MODULUS),
+    de modo que o shard dono de um atleta sai do próprio id, sem consulta. Ids até
+    `legacy_max_id` (anteriores ao sharding) pertencem ao `default`. Scores ficam no
+    shard do atleta, com a sequence intercalada da mesma forma: o id de um score é
+    único entre os shards. As sequences são configuradas uma vez, por `configure()`,
+    e só avançam.
+
+    Categorias, centros de treinamento e workouts são dados de referência replicados
+    em todos os shards, para que FKs e filtros por nome continuem locais; o `default`
+    é a fonte da verdade e as réplicas são idempotentes.
+    """
+
+    def __init__(self, primary: AsyncEngine, urls: dict[str, str], modulus: int):
+        if len(urls) + 1 > modulus:
+            raise ValueError(f'SHARD_ID_MODULUS ({modulus}) menor que o número de shards ({len(urls) + 1})')
+
+        self.modulus = modulus
+        self.engines: dict[str, AsyncEngine] = {PRIMARY_SHARD: primary}
+        for name, url in urls.items():
+            self.engines[name] = create_async_engine(
+                url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+            )
+        self.indexes = {name: index for index, name in enumerate(self.engines)}
+        self.sessionmakers = {
+            name: sessionmaker(shard_engine, class_=AsyncSession, expire_on_commit=False)
+            for name, shard_engine in self.engines.items()
+        }
+        self._centro_shards: dict[int, str] = {}
+        self._unreplicated: dict[tuple, dict] = {}
+        self.legacy_max_id = 0
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.engines) > 1
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.engines)
+
+    def validate(self, shard: str) -> str:
+        if shard not in self.engines:
+            raise ValueError(f'Shard desconhecido: {shard}. Shards configurados: {", ".join(self.engines)}')
+        return shard
+
+    def shard_for_id(self, atleta_id: int) -> Optional[str]:
+        if not self.enabled or atleta_id <= self.legacy_max_id:
+            return PRIMARY_SHARD
+        index = atleta_id % self.modulus
+        return next((name for name, shard_index in self.indexes.items() if shard_index == index), None)
+
+    def remember_centro(self, centro_id: int, shard: str) -> None:
+        self._centro_shards[centro_id] = shard
+
+    async def shard_for_centro(self, db_session: AsyncSession, centro_id: int) -> Optional[str]:
+        """Shard dono do centro; o mapa vem da tabela replicada e fica em memória"""
+        if not self.enabled:
+            return PRIMARY_SHARD
+        if centro_id not in self._centro_shards:
+            shard = (
+                await db_session.execute(select(CentroTreinamentoModel.shard).filter_by(pk_id=centro_id))
+            ).scalar()
+            if shard is None:
+                return None
+            self._centro_shards[centro_id] = shard
+        return self._centro_shards[centro_id]
+
+    async def configure(self) -> None:
+        """
+        Configuração única (comando administrativo, não o startup): grava o limite dos ids
+        legados e ajusta as sequences de atletas e de scores de cada shard para ids ≡ índice
+        do shard.
+
+        Idempotente e só para frente: com a tabela travada contra inserts, o próximo id
+        fica acima de todo id já usado (tabela, arquivo e sequence) e a sequence nunca recua.
+        Os scores anteriores ao sharding estão todos no `default`: os ids novos ficam acima deles.
+        """
+        async with self.engines[PRIMARY_SHARD].begin() as conn:
+            config = (await conn.execute(select(ShardConfigModel).filter_by(pk_id=1))).first()
+            if config is None:
+                # Tudo o que existe até aqui está no `default`, com ids sequenciais
+                legacy_max_id = await max_used_id(conn, AtletaModel, AtletaArquivoModel)
+                await conn.execute(ShardConfigModel.__table__.insert().values(
+                    pk_id=1, modulus=self.modulus, legacy_max_id=legacy_max_id,
+                ))
+                logger.info(f'Atletas com id até {legacy_max_id} ficam no shard {PRIMARY_SHARD}')
+            elif config.modulus != self.modulus:
+                raise ValueError(
+                    f'SHARD_ID_MODULUS ({self.modulus}) difere do configurado ({config.modulus}); '
+                    'o módulo não pode mudar depois que os ids foram distribuídos'
+                )
+            else:
+                legacy_max_id = config.legacy_max_id
+            legacy_max_score_id = await max_used_id(conn, ScoreModel, ScoreArquivoModel)
+
+        for name, shard_engine in self.engines.items():
+            if shard_engine.dialect.name != 'postgresql':
+                logger.warning(f'Shard {name}: ids intercalados exigem Postgres; o roteamento por id deste shard não é confiável')
+                continue
+            async with shard_engine.begin() as conn:
+                for model, arquivo_model, legacy_floor in (
+                    (AtletaModel, AtletaArquivoModel, legacy_max_id),
+                    (ScoreModel, ScoreArquivoModel, legacy_max_score_id),
+                ):
+                    await self.interleave_sequence(conn, name, model, arquivo_model, legacy_floor)
+
+    async def interleave_sequence(self, conn: AsyncConnection, name: str, model, arquivo_model, legacy_floor: int) -> None:
+        """Faz a sequence da tabela no shard gerar ids ≡ índice do shard, acima de todo id já usado"""
+        table = model.__tablename__
+        index = self.indexes[name]
+        await conn.execute(text(f'LOCK TABLE {table} IN EXCLUSIVE MODE'))
+        sequence = (await conn.execute(
+            text("SELECT pg_get_serial_sequence(:table, 'pk_id')"), {'table': table}
+        )).scalar()
+        floor = max(await max_used_id(conn, model, arquivo_model), legacy_floor)
+        start = floor - floor % self.modulus + index
+        if start <= floor:
+            start += self.modulus
+        await conn.execute(text(f'ALTER SEQUENCE {sequence} INCREMENT BY {self.modulus}'))
+        await conn.execute(text('SELECT setval(:sequence, :start, false)'), {'sequence': sequence, 'start': start})
+        logger.info(f'Shard {name}: próximos ids de {table} a partir de {start}, de {self.modulus} em {self.modulus}')
+
+    async def prepare(self) -> None:
+        """Carrega a configuração gravada por `configure()`; não altera as sequences"""
+        if not self.enabled:
+            return
+        async with self.engines[PRIMARY_SHARD].connect() as conn:
+            config = (await conn.execute(select(ShardConfigModel).filter_by(pk_id=1))).first()
+        if config is None:
+            raise RuntimeError(
+                'SHARD_URLS configurado, mas as sequences não: rode python -m workout_api.configs.shard_setup'
+            )
+        if config.modulus != self.modulus:
+            raise RuntimeError(f'SHARD_ID_MODULUS ({self.modulus}) difere do configurado ({config.modulus})')
+        self.legacy_max_id = config.legacy_max_id
+        await self.sync_reference()
+
+    @staticmethod
+    async def upsert_reference(session: AsyncSession, model, values: dict) -> None:
+        """
+        Grava a linha no shard como está no `default` (upsert por pk_id). Uma linha órfã
+        com o mesmo nome e outro pk_id (sobra de uma transação desfeita no `default`) é
+        removida antes, para o nome único não bloquear a réplica.
+        """
+        await session.execute(delete(model).filter(model.nome == values['nome'], model.pk_id != values['pk_id']))
+        updated = await session.execute(update(model).filter_by(pk_id=values['pk_id']).values(**values))
+        if not updated.rowcount:
+            await session.execute(insert(model).values(**values))
+
+    async def replicate(self, model, values: dict, attempts: int = 3) -> None:
+        """
+        Copia uma linha de tabela de referência (já gravada no `default`, com pk_id) para os
+        demais shards, com novas tentativas. O `default` é a fonte da verdade: o que ainda
+        falhar fica pendente e é reparado por `repair()` (antes do próximo insert de atleta ou score
+        no shard) ou por `sync_reference()` no startup.
+        """
+        for name in self.names:
+            if name == PRIMARY_SHARD:
+                continue
+            for attempt in range(1, attempts + 1):
+                try:
+                    async with self.sessionmakers[name]() as session:
+                        await self.upsert_reference(session, model, values)
+                        await session.commit()
+                    self._unreplicated.pop((name, model, values['pk_id']), None)
+                    break
+                except SQLAlchemyError:
+                    if attempt == attempts:
+                        logger.exception(f'Falha ao replicar {model.__tablename__} {values["pk_id"]} no shard {name}')
+                        self._unreplicated[(name, model, values['pk_id'])] = values
+                    else:
+                        await asyncio.sleep(0.1 * attempt)
+
+    async def repair(self, shard: str) -> None:
+        """Reaplica no shard as réplicas que falharam; sem pendências, não consulta nada"""
+        pending = [(key, values) for key, values in self._unreplicated.items() if key[0] == shard]
+        if not pending:
+            return
+        async with self.sessionmakers[shard]() as session:
+            for (_, model, _), values in pending:
+                await self.upsert_reference(session, model, values)
+            await session.commit()
+        for key, _ in pending:
+            self._unreplicated.pop(key, None)
+
+    async def sync_reference(self) -> None:
+        """Startup: iguala os dados de referência de cada shard aos do `default` (idempotente)"""
+        if not self.enabled:
+            return
+        async with self.sessionmakers[PRIMARY_SHARD]() as primary:
+            rows = {
+                model: [
+                    {column.name: getattr(row, column.name) for column in model.__table__.columns}
+                    for row in (await primary.execute(select(model))).scalars()
+                ]
+                for model in REFERENCE_MODELS
+            }
+
+        for name in self.names:
+            if name == PRIMARY_SHARD:
+                continue
+            try:
+                async with self.sessionmakers[name]() as session:
+                    for model in REFERENCE_MODELS:
+                        for values in rows[model]:
+                            await self.upsert_reference(session, model, values)
+                    await session.commit()
+            except SQLAlchemyError:
+                logger.exception(f'Falha ao sincronizar os dados de referência no shard {name}')
+        self._unreplicated.clear()
+
+    async def dispose(self) -> None:
+        for name, shard_engine in self.engines.items():
+            if name != PRIMARY_SHARD:
+                await shard_engine.dispose()
+
+
+class ShardSessions:
+    """Sessões por shard de uma requisição; a do shard `default` é a da dependência get_session"""
+
+    def __init__(self, router: ShardRouter, primary: AsyncSession):
+        self.router = router
+        self._sessions: dict[str, AsyncSession] = {PRIMARY_SHARD: primary}
+
+    @property
+    def primary(self) -> AsyncSession:
+        return self._sessions[PRIMARY_SHARD]
+
+    def get(self, shard: str) -> AsyncSession:
+        if shard not in self._sessions:
+            self._sessions[shard] = self.router.sessionmakers[shard]()
+        return self._sessions[shard]
+
+    async def collation_ranks(self, values: set[str]) -> dict[str, int]:
+        """
+        Posição de cada texto na ordem da collation do banco, para intercalar em Python
+        listas que cada shard ordenou no SQL (a ordem de `str` é por code point e diverge
+        de collations com acentos/caixa). Os shards usam a mesma collation do `default`.
+        """
+        if self.primary.bind.dialect.name != 'postgresql':
+            # SQLite compara texto por bytes (BINARY), a mesma ordem de str
+            return {value: rank for rank, value in enumerate(sorted(values))}
+
+        result = await self.primary.execute(
+            text('SELECT v FROM unnest(CAST(:values AS text[])) AS v ORDER BY v'),
+            {'values': list(values)},
+        )
+        return {value: rank for rank, value in enumerate(result.scalars())}
+
+    async def close(self) -> None:
+        for shard, session in self._sessions.items():
+            if shard != PRIMARY_SHARD:
+                await session.close()
+
+
+shard_router = ShardRouter(engine, settings.SHARD_URLS, settings.SHARD_ID_MODULUS)
+
+
+async def get_shard_sessions(db_session: AsyncSession = Depends(get_session)) -> ShardSessions:
+    sessions = ShardSessions(shard_router, db_session)
+    try:
+        yield sessions
+    finally:
+        await sessions.close()
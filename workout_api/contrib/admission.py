@@ -0,0 +1,257 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """A fila de espera da classe da rota está cheia ou a espera excedeu o timeout"""
+
+
+@dataclass
+class Bucket:
+    """Limite de concorrência de uma classe de rota ou de um prefixo de rota"""
+    name: str
+    limit: int
+    in_flight: int = 0
+
+    @property
+    def available(self) -> bool:
+        return self.in_flight < self.limit
+
+
+@dataclass
+class RouteClass:
+    bucket: Bucket
+    priority: int
+    max_queue: int
+    queued: int = 0
+    shed: int = 0
+    admitted: int = 0
+
+
+@dataclass(order=True)
+class Waiter:
+    priority: int
+    seq: int
+    future: asyncio.Future = field(compare=False)
+    route_class: RouteClass = field(compare=False)
+    buckets: list[Bucket] = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Controle de admissão na frente do pool de conexões.
+
+    No máximo `capacity` requisições (o tamanho do pool) executam ao mesmo tempo,
+    respeitando ainda o limite da classe (read/write/bulk) e, opcionalmente, de um
+    prefixo de rota. O excedente espera em uma fila com prioridade (leituras antes
+    de escritas antes de bulk) limitada por classe; com a fila cheia ou após
+    `queue_timeout` segundos, a requisição é rejeitada imediatamente (Overloaded),
+    em vez de esperar pelo timeout do pool do SQLAlchemy.
+
+    O limite da rota (e da classe) é verificado antes da fila global: quem espera só
+    porque o próprio prefixo está saturado não ocupa lugar na fila das vagas do pool
+    nem atrasa requisições de outras rotas.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        classes: dict[str, RouteClass],
+        route_limits: Optional[dict[str, int]] = None,
+        queue_timeout: float = 5.0,
+    ):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.classes = classes
+        self.route_buckets = {
+            prefix: Bucket(name=prefix, limit=limit)
+            for prefix, limit in (route_limits or {}).items()
+        }
+        self.queue_timeout = queue_timeout
+        self._waiters: list[Waiter] = []
+        self._seq = itertools.count()
+
+    def _buckets(self, route_class: RouteClass, path: str) -> list[Bucket]:
+        buckets = [route_class.bucket]
+        for prefix, bucket in self.route_buckets.items():
+            if path.startswith(prefix):
+                buckets.append(bucket)
+        return buckets
+
+    @staticmethod
+    def _within_limits(buckets: list[Bucket]) -> bool:
+        return all(bucket.available for bucket in buckets)
+
+    def _can_run(self, buckets: list[Bucket]) -> bool:
+        return self.in_flight < self.capacity and self._within_limits(buckets)
+
+    def _grant(self, route_class: RouteClass, buckets: list[Bucket]) -> None:
+        self.in_flight += 1
+        route_class.admitted += 1
+        for bucket in buckets:
+            bucket.in_flight += 1
+
+    async def acquire(self, class_name: str, path: str) -> list[Bucket]:
+        route_class = self.classes[class_name]
+        buckets = self._buckets(route_class, path)
+
+        # Só passa à frente quem não cabe nos próprios limites; sem isso, uma rota saturada
+        # seguraria todas as outras da mesma prioridade (head-of-line blocking)
+        blocked = any(
+            waiter.priority <= route_class.priority and self._within_limits(waiter.buckets)
+            for waiter in self._waiters
+        )
+        if not blocked and self._can_run(buckets):
+            self._grant(route_class, buckets)
+            return buckets
+
+        if route_class.queued >= route_class.max_queue:
+            route_class.shed += 1
+            raise Overloaded(class_name)
+
+        waiter = Waiter(
+            priority=route_class.priority,
+            seq=next(self._seq),
+            future=asyncio.get_running_loop().create_future(),
+            route_class=route_class,
+            buckets=buckets,
+        )
+        heapq.heappush(self._waiters, waiter)
+        route_class.queued += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                # Liberado no mesmo instante do timeout: usa a vaga concedida
+                return buckets
+            self._remove_waiter(waiter)
+            route_class.shed += 1
+            raise Overloaded(class_name)
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                self.release(buckets)
+            else:
+                self._remove_waiter(waiter)
+            raise
+
+        return buckets
+
+    def _remove_waiter(self, waiter: Waiter) -> None:
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+        waiter.route_class.queued -= 1
+        waiter.future.cancel()
+
+    def release(self, buckets: list[Bucket]) -> None:
+        self.in_flight -= 1
+        for bucket in buckets:
+            bucket.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Percorre a fila por prioridade concedendo vagas a quem couber nos limites
+        for waiter in sorted(self._waiters):
+            if self.in_flight >= self.capacity:
+                break
+            if not self._within_limits(waiter.buckets):
+                continue
+            self._waiters.remove(waiter)
+            waiter.route_class.queued -= 1
+            self._grant(waiter.route_class, waiter.buckets)
+            waiter.future.set_result(None)
+        heapq.heapify(self._waiters)
+
+    def stats(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'in_flight': self.in_flight,
+            'queue_depth': len(self._waiters),
+            'classes': {
+                name: {
+                    'limit': route_class.bucket.limit,
+                    'in_flight': route_class.bucket.in_flight,
+                    'queued': route_class.queued,
+                    'max_queue': route_class.max_queue,
+                    'admitted': route_class.admitted,
+                    'shed': route_class.shed,
+                }
+                for name, route_class in self.classes.items()
+            },
+            'routes': {
+                prefix: {'limit': bucket.limit, 'in_flight': bucket.in_flight}
+                for prefix, bucket in self.route_buckets.items()
+            },
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware ASGI que passa cada requisição HTTP pelo AdmissionController.
+
+    GET/HEAD são 'read', os demais métodos são 'write' e os prefixos em
+    `bulk_paths` são 'bulk'. Rotas em `exempt_paths` (health check, docs,
+    streams de longa duração) não ocupam vagas.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        controller: AdmissionController,
+        bulk_paths: tuple[str, ...] = (),
+        exempt_paths: tuple[str, ...] = (),
+        retry_after: int = 1,
+    ):
+        self.app = app
+        self.controller = controller
+        self.bulk_paths = bulk_paths
+        self.exempt_paths = exempt_paths
+        self.retry_after = retry_after
+
+    def classify(self, method: str, path: str) -> str:
+        if any(path.startswith(prefix) for prefix in self.bulk_paths):
+            return 'bulk'
+        if method in ('GET', 'HEAD'):
+            return 'read'
+        return 'write'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get('path', '')
+        if scope['type'] != 'http' or path == '/' or any(path.startswith(prefix) for prefix in self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        class_name = self.classify(scope['method'], path)
+        try:
+            buckets = await self.controller.acquire(class_name, path)
+        except Overloaded:
+            logger.warning(f"Requisição rejeitada por sobrecarga ({class_name}): {scope['method']} {path}")
+            await self._reject(send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(buckets)
+
+    async def _reject(self, send: Send) -> None:
+        body = json.dumps({'detail': 'Servidor sobrecarregado, tente novamente em instantes'}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 503,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', str(self.retry_after).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Event:
+    id: str
+    type: str
+    data: dict[str, Any]
+
+    def to_json(self) -> str:
+        return json.dumps({'id': self.id, 'type': self.type, 'data': self.data})
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'Event':
+        return cls(**json.loads(payload))
+
+    def to_sse(self) -> str:
+        return f'id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n'
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Fila limitada de um consumidor; ao estourar, o consumidor é desligado (overflow)"""
+    queue: asyncio.Queue
+    overflowed: bool = False
+    # Eventos anteriores à inscrição que devem ser reenviados (Last-Event-ID)
+    backlog: list[Event] = field(default_factory=list)
+    # Last-Event-ID informado não está mais no histórico
+    stale: bool = False
+
+
+class Broadcaster:
+    """
+    Fan-out em processo de eventos para consumidores (ex.: SSE).
+
+    Cada consumidor tem uma fila com tamanho máximo; um consumidor lento que a
+    enche é removido e marcado como `overflowed`, de modo que a memória fica
+    limitada a `queue_size` eventos por consumidor mais `history_size` eventos
+    de histórico, usado para retomar a partir do Last-Event-ID.
+
+    Com `dsn` informado, os eventos são publicados via Postgres NOTIFY e
+    recebidos via LISTEN, chegando a consumidores de todos os workers. Se a conexão
+    do LISTEN cair, ela é refeita em segundo plano e os consumidores recebem um
+    evento 'reset' (os eventos do intervalo se perderam).
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        history_size: int = 1000,
+        queue_size: int = 100,
+        dsn: Optional[str] = None,
+    ):
+        self.channel = channel
+        self.queue_size = queue_size
+        self.dsn = dsn
+        self._history: deque[Event] = deque(maxlen=history_size)
+        self._subscriptions: set[Subscription] = set()
+        self._connection = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        # Eventos publicados só localmente enquanto o LISTEN esteve fora do ar
+        self._unsent = False
+        self._lock = asyncio.Lock()
+        self._deferred: ContextVar[Optional[list[tuple[str, dict[str, Any]]]]] = ContextVar(
+            f'{channel}_deferred', default=None
+        )
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    async def start(self) -> None:
+        if not self.dsn:
+            return
+        await self._connect()
+        logger.info(f"Broadcaster '{self.channel}' escutando via LISTEN/NOTIFY")
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        await connection.add_listener(self.channel, self._on_notify)
+        connection.add_termination_listener(self._on_terminated)
+        self._connection = connection
+
+    def _on_terminated(self, connection) -> None:
+        if connection is not self._connection:
+            # Fechada por stop() ou já substituída
+            return
+        logger.warning(f"Conexão LISTEN do broadcaster '{self.channel}' caiu; reconectando")
+        self._connection = None
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self, max_delay: float = 30.0) -> None:
+        """
+        Refaz o LISTEN com backoff e avisa os consumidores com um evento 'reset': o que foi
+        notificado enquanto a conexão esteve fora se perdeu, então caches locais e clientes
+        SSE precisam se ressincronizar. O histórico é descartado para que um Last-Event-ID
+        anterior à queda também resulte em 'reset'.
+        """
+        delay = 0.5
+        while True:
+            try:
+                await self._connect()
+                break
+            except Exception:
+                logger.warning(f"Falha ao reconectar o broadcaster '{self.channel}'; nova tentativa em {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+        logger.info(f"Broadcaster '{self.channel}' reconectado")
+        self._history.clear()
+        reset = Event(id=uuid4().hex, type='reset', data={})
+        if self._unsent:
+            # Os outros workers também perderam eventos: o 'reset' vai a todos (inclusive a este, via LISTEN)
+            try:
+                async with self._lock:
+                    await self._connection.execute('SELECT pg_notify($1, $2)', self.channel, reset.to_json())
+                self._unsent = False
+                return
+            except Exception:
+                logger.exception(f"Falha ao notificar o 'reset' do broadcaster '{self.channel}'")
+        self.dispatch(reset)
+
+    async def stop(self) -> None:
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.close()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self.dispatch(Event.from_json(payload))
+
+    @asynccontextmanager
+    async def deferred(self):
+        """
+        Retém os eventos publicados dentro do bloco e os envia ao final, se o bloco
+        terminar sem exceção; limpar a lista devolvida descarta os eventos retidos.
+        """
+        pending: list[tuple[str, dict[str, Any]]] = []
+        token = self._deferred.set(pending)
+        try:
+            yield pending
+        finally:
+            self._deferred.reset(token)
+
+        for type, data in pending:
+            await self.publish(type, data)
+
+    async def publish(self, type: str, data: dict[str, Any]) -> Optional[Event]:
+        pending = self._deferred.get()
+        if pending is not None:
+            pending.append((type, data))
+            return None
+
+        event = Event(id=uuid4().hex, type=type, data=data)
+        async with self._lock:
+            if self._connection is not None:
+                try:
+                    await self._connection.execute('SELECT pg_notify($1, $2)', self.channel, event.to_json())
+                    return event
+                except Exception:
+                    logger.exception(f"Falha no NOTIFY do broadcaster '{self.channel}'; evento entregue só localmente")
+
+        if self.dsn:
+            # Sem LISTEN/NOTIFY no momento: os outros workers recebem um 'reset' na reconexão
+            self._unsent = True
+        self.dispatch(event)
+        return event
+
+    def dispatch(self, event: Event) -> None:
+        self._history.append(event)
+        for subscription in list(self._subscriptions):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self._subscriptions.discard(subscription)
+                logger.warning(f"Consumidor lento desligado do broadcaster '{self.channel}'")
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(queue=asyncio.Queue(maxsize=self.queue_size))
+
+        if last_event_id:
+            ids = [event.id for event in self._history]
+            if last_event_id in ids:
+                subscription.backlog = list(self._history)[ids.index(last_event_id) + 1:]
+            else:
+                subscription.stale = True
+
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from workout_api.contrib.exception_handlers import deadline_exceeded_response
+
+logger = logging.getLogger(__name__)
+
+# Instante (time.monotonic) em que a requisição atual deve terminar
+request_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+
+def resolve_deadline_ms(method: str, path: str, route_deadlines: dict[str, int], default_ms: int) -> int:
+    """
+    Escolhe o deadline da rota pelo prefixo mais longo. As chaves podem ser
+    '/prefixo' (qualquer método) ou 'METODO /prefixo', que vence em caso de empate;
+    0 desativa o deadline.
+    """
+    best, best_rank = default_ms, (-1, False)
+    for key, deadline_ms in route_deadlines.items():
+        key_method, _, prefix = key.rpartition(' ')
+        if key_method and key_method.upper() != method:
+            continue
+        rank = (len(prefix), bool(key_method))
+        if path.startswith(prefix) and rank > best_rank:
+            best, best_rank = deadline_ms, rank
+    return best
+
+
+def apply_statement_timeout(session, transaction, connection) -> None:
+    """
+    Listener de `after_begin`: limita cada transação Postgres ao tempo que resta
+    até o deadline da requisição, via SET LOCAL statement_timeout.
+    """
+    deadline = request_deadline.get()
+    if deadline is None or connection.dialect.name != 'postgresql':
+        return
+
+    remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+    connection.exec_driver_sql(f'SET LOCAL statement_timeout = {remaining_ms}')
+
+
+class DeadlineMiddleware:
+    """
+    Middleware ASGI que impõe o deadline de cada rota e cancela o handler
+    (e, com ele, a query asyncpg em andamento) quando o deadline expira ou o
+    cliente desconecta. Deadline expirado antes da resposta vira 504.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default_ms: int,
+        route_deadlines: Optional[dict[str, int]] = None,
+        exempt_paths: tuple[str, ...] = (),
+    ):
+        self.app = app
+        self.default_ms = default_ms
+        self.route_deadlines = route_deadlines or {}
+        self.exempt_paths = exempt_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get('path', '')
+        if scope['type'] != 'http' or any(path.startswith(prefix) for prefix in self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        deadline_ms = resolve_deadline_ms(scope['method'], path, self.route_deadlines, self.default_ms)
+        timeout = deadline_ms / 1000 if deadline_ms else None
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        disconnected = False
+        response_started = False
+
+        async def receive_from_queue() -> Message:
+            return await messages.get()
+
+        async def send_tracking(message: Message) -> None:
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+            await send(message)
+
+        token = request_deadline.set(time.monotonic() + timeout if timeout else None)
+        try:
+            app_task = asyncio.create_task(self.app(scope, receive_from_queue, send_tracking))
+        finally:
+            request_deadline.reset(token)
+
+        async def watch_disconnect() -> None:
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message['type'] == 'http.disconnect':
+                    disconnected = True
+                    app_task.cancel()
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            done, _ = await asyncio.wait({app_task}, timeout=timeout)
+            if not done:
+                app_task.cancel()
+                await asyncio.gather(app_task, return_exceptions=True)
+                logger.warning(f"Deadline de {deadline_ms}ms excedido em {scope['method']} {path}")
+                if not response_started and not disconnected:
+                    response = deadline_exceeded_response()
+                    await response(scope, receive, send)
+                return
+
+            if app_task.cancelled():
+                if disconnected:
+                    logger.info(f"Cliente desconectou; requisição cancelada: {scope['method']} {path}")
+                    return
+            app_task.result()
+        finally:
+            watcher.cancel()
@@ -1,7 +1,7 @@
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError, TimeoutError as PoolTimeoutError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -55,6 +55,34 @@ async def integrity_exception_handler(request: Request, exc: IntegrityError):
     )
 
 
+async def pool_timeout_exception_handler(request: Request, exc: PoolTimeoutError):
+    """Handler para esgotamento do pool de conexões: 503 com Retry-After em vez de 500"""
+    logger.error(f"Pool de conexões esgotado na rota {request.url.path}: {str(exc)}")
+    
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servidor sobrecarregado, tente novamente em instantes"},
+        headers={"Retry-After": "1"}
+    )
+
+
+def deadline_exceeded_response() -> JSONResponse:
+    """Resposta 504 para requisições que excederam o deadline da rota"""
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "A consulta excedeu o tempo limite da rota"}
+    )
+
+
+async def dbapi_exception_handler(request: Request, exc: DBAPIError):
+    """Handler para erros do driver: statement_timeout (SQLSTATE 57014) vira 504"""
+    if getattr(exc.orig, 'sqlstate', None) == '57014':
+        logger.warning(f"statement_timeout atingido na rota {request.url.path}")
+        return deadline_exceeded_response()
+    
+    return await sqlalchemy_exception_handler(request, exc)
+
+
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handler para erros gerais do SQLAlchemy"""
     logger.error(f"Erro do SQLAlchemy: {str(exc)}")
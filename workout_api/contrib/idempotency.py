@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# (caminho, valor do header Idempotency-Key)
+IdempotencyKey = tuple[str, str]
+
+MAX_KEY_LENGTH = 255
+
+
+class StoredResponse:
+    __slots__ = ('status', 'headers', 'body', 'fingerprint', 'stored_at')
+
+    def __init__(self, status: int, headers: list[tuple[bytes, bytes]], body: bytes, fingerprint: str):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.fingerprint = fingerprint
+        self.stored_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+class IdempotencyStore:
+    """
+    Respostas já enviadas para cada Idempotency-Key (por processo), em LRU limitado a
+    `max_bytes` e válidas por `ttl` segundos, e as execuções ainda em andamento.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.replayed = 0
+        self._entries: OrderedDict[IdempotencyKey, StoredResponse] = OrderedDict()
+        self._in_flight: dict[IdempotencyKey, tuple[str, asyncio.Future]] = {}
+
+    def get(self, key: IdempotencyKey) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl:
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: IdempotencyKey, response: StoredResponse) -> None:
+        if response.size > self.max_bytes:
+            return
+        self._discard(key)
+        self._entries[key] = response
+        self.size += response.size
+        while self.size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: IdempotencyKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def in_flight(self, key: IdempotencyKey) -> Optional[tuple[str, asyncio.Future]]:
+        return self._in_flight.get(key)
+
+    def begin(self, key: IdempotencyKey, fingerprint: str) -> None:
+        self._in_flight[key] = (fingerprint, asyncio.get_running_loop().create_future())
+
+    def finish(self, key: IdempotencyKey) -> None:
+        """Encerra a execução da chave e acorda as requisições repetidas que esperavam por ela"""
+        _, future = self._in_flight.pop(key)
+        if not future.done():
+            future.set_result(None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            'entradas': len(self._entries),
+            'bytes': self.size,
+            'em_andamento': len(self._in_flight),
+            'repeticoes': self.replayed,
+        }
+
+
+class IdempotencyMiddleware:
+    """
+    Middleware ASGI que torna idempotentes os POST em `paths` enviados com o header `header`.
+
+    A primeira requisição de cada chave executa normalmente e sua resposta (status < 500)
+    fica guardada no `store`; repetições com o mesmo corpo recebem a resposta guardada,
+    com o header Idempotent-Replayed, sem passar pelo controle de admissão nem pelo banco.
+    Repetições concorrentes esperam a execução em andamento em vez de disputar o mesmo
+    insert. Reusar a chave com outro corpo é respondido com 422. Respostas 5xx não são
+    guardadas: a próxima repetição executa de novo.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        paths: tuple[str, ...] = (),
+        header: str = 'Idempotency-Key',
+    ):
+        self.app = app
+        self.store = store
+        self.paths = paths
+        self.header = header.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] != 'POST' or scope['path'] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        value = next((value.decode('latin-1') for name, value in scope['headers'] if name == self.header), None)
+        if value is None:
+            await self.app(scope, receive, send)
+            return
+        if not value or len(value) > MAX_KEY_LENGTH:
+            await self._error(send, 400, f'Idempotency-Key deve ter entre 1 e {MAX_KEY_LENGTH} caracteres')
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            # Cliente desconectou no meio do upload: nada executa nem fica guardado na chave
+            return
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = (scope['path'], value)
+
+        while True:
+            stored = self.store.get(key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    await self._mismatch(send)
+                    return
+                self.store.replayed += 1
+                await self._replay(send, stored)
+                return
+
+            in_flight = self.store.in_flight(key)
+            if in_flight is None:
+                break
+            if in_flight[0] != fingerprint:
+                await self._mismatch(send)
+                return
+            # shield: o cancelamento desta requisição não cancela o future compartilhado
+            await asyncio.shield(in_flight[1])
+
+        self.store.begin(key, fingerprint)
+        try:
+            await self._execute(scope, receive, send, body, key, fingerprint)
+        finally:
+            self.store.finish(key)
+
+    async def _execute(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        body: bytes,
+        key: IdempotencyKey,
+        fingerprint: str,
+    ) -> None:
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+        async def replay_receive() -> Message:
+            # Corpo já lido: entrega-o de novo; depois disso, só a desconexão do cliente
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        response = {'status': 500, 'headers': [], 'body': b''}
+
+        async def capture(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = list(message.get('headers', []))
+            elif message['type'] == 'http.response.body':
+                response['body'] += message.get('body', b'')
+                if not message.get('more_body', False) and response['status'] < 500:
+                    self.store.store(key, StoredResponse(
+                        response['status'], response['headers'], response['body'], fingerprint
+                    ))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> Optional[bytes]:
+        """Corpo completo da requisição; None se o cliente desconectar antes do fim"""
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] != 'http.request':
+                return None
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                return body
+
+    @staticmethod
+    async def _replay(send: Send, stored: StoredResponse) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': stored.status,
+            'headers': [*stored.headers, (b'idempotent-replayed', b'true')],
+        })
+        await send({'type': 'http.response.body', 'body': stored.body})
+
+    async def _mismatch(self, send: Send) -> None:
+        await self._error(send, 422, 'Idempotency-Key já usada com outro corpo de requisição')
+
+    @staticmethod
+    async def _error(send: Send, status_code: int, detail: str) -> None:
+        body = json.dumps({'detail': detail}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status_code,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,215 @@
+import asyncio
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Optional
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Statements executados pela requisição em perfilamento: [(sql, ms)]
+sql_trace: ContextVar[Optional[list[tuple[str, float]]]] = ContextVar('sql_trace', default=None)
+
+# Fases da requisição no FastAPI e a função que delimita cada uma (tempo acumulado no cProfile)
+PHASES = {
+    'validacao': ('fastapi/dependencies/utils.py', 'solve_dependencies'),
+    'handler': ('fastapi/routing.py', 'run_endpoint_function'),
+    'serializacao': ('fastapi/routing.py', 'serialize_response'),
+}
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if sql_trace.get() is not None:
+        conn.info.setdefault('profiling_started', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = sql_trace.get()
+    started = conn.info.get('profiling_started')
+    if trace is not None and started:
+        trace.append((statement, (time.perf_counter() - started.pop()) * 1000))
+
+
+class ProfileReports:
+    """Últimos relatórios de perfilamento, por id (memória limitada a `max_reports`)"""
+
+    def __init__(self, max_reports: int):
+        self.max_reports = max_reports
+        self._reports: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def add(self, report: dict[str, Any]) -> None:
+        self._reports[report['id']] = report
+        while len(self._reports) > self.max_reports:
+            self._reports.popitem(last=False)
+
+    def get(self, report_id: str) -> Optional[dict[str, Any]]:
+        return self._reports.get(report_id)
+
+    def summaries(self) -> list[dict[str, Any]]:
+        keys = ('id', 'metodo', 'caminho', 'status', 'inicio', 'total_ms')
+        return [{key: report[key] for key in keys} for report in reversed(self._reports.values())]
+
+
+def short_filename(filename: str) -> str:
+    for marker in ('site-packages/', os.getcwd() + os.sep):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+def build_report(
+    profiler: cProfile.Profile,
+    trace: list[tuple[str, float]],
+    top: int,
+) -> dict[str, Any]:
+    """
+    Resume o perfil: tempo de CPU por fase (cProfile, sem o tempo suspenso em await),
+    tempo de parede do SQL (eventos do engine) e as funções com maior tempo acumulado.
+    """
+    stats = pstats.Stats(profiler).stats
+
+    fases = {}
+    for fase, (path, funcname) in PHASES.items():
+        fases[fase] = round(sum(
+            cumulative for (filename, _, name), (_, _, _, cumulative, _) in stats.items()
+            if name == funcname and filename.replace(os.sep, '/').endswith(path)
+        ) * 1000, 3)
+    fases['sql'] = round(sum(ms for _, ms in trace), 3)
+
+    funcoes = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+
+    return {
+        'fases_ms': fases,
+        'sql': {
+            'queries': len(trace),
+            'total_ms': fases['sql'],
+            'mais_lentas': [
+                {'sql': statement[:500], 'ms': round(ms, 3)}
+                for statement, ms in sorted(trace, key=lambda item: item[1], reverse=True)[:10]
+            ],
+        },
+        'funcoes': [
+            {
+                'funcao': f'{short_filename(filename)}:{lineno}({name})',
+                'chamadas': calls,
+                'proprio_ms': round(own * 1000, 3),
+                'acumulado_ms': round(cumulative * 1000, 3),
+            }
+            for (filename, lineno, name), (_, calls, own, cumulative, _) in funcoes
+        ],
+    }
+
+
+class ProfilingMiddleware:
+    """
+    Perfila com cProfile apenas as requisições marcadas pelo header `header` ou pelo
+    query param `query_param` (cujo valor deve ser `token`, se configurado).
+
+    Requisições sem a marca custam uma varredura dos headers. Requisições marcadas
+    são perfiladas uma por vez (o cProfile é global no processo, e o que rodar em
+    paralelo também aparece no perfil); o relatório fica em `reports`, e o id volta
+    no header X-Profile-Id. Com `directory`, o .prof (pstats) e o JSON também são
+    gravados em disco.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        reports: ProfileReports,
+        header: str = 'X-Profile',
+        query_param: str = '_profile',
+        token: Optional[str] = None,
+        directory: Optional[str] = None,
+        top: int = 25,
+    ):
+        self.app = app
+        self.reports = reports
+        self.header = header.lower().encode()
+        self.query_param = query_param
+        self.token = token
+        self.directory = directory
+        self.top = top
+        self._lock = asyncio.Lock()
+
+        for name, listener in (
+            ('before_cursor_execute', before_cursor_execute),
+            ('after_cursor_execute', after_cursor_execute),
+        ):
+            if not event.contains(Engine, name, listener):
+                event.listen(Engine, name, listener)
+
+    def requested(self, scope: Scope) -> bool:
+        value = next((value.decode('latin-1') for name, value in scope['headers'] if name == self.header), None)
+
+        query_string = scope.get('query_string', b'')
+        if value is None and self.query_param.encode() in query_string:
+            values = parse_qs(query_string.decode('latin-1'), keep_blank_values=True).get(self.query_param)
+            value = values[0] if values else None
+
+        if value is None:
+            return False
+        return self.token is None or value == self.token
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not self.requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        async with self._lock:
+            await self.profile(scope, receive, send)
+
+    async def profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        report_id = uuid4().hex[:16]
+        status_code = None
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                message = {**message, 'headers': [*message.get('headers', []), (b'x-profile-id', report_id.encode())]}
+            await send(message)
+
+        trace: list[tuple[str, float]] = []
+        token = sql_trace.set(trace)
+        profiler = cProfile.Profile()
+        inicio = datetime.utcnow()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            total_ms = (time.perf_counter() - started) * 1000
+            sql_trace.reset(token)
+
+            report = {
+                'id': report_id,
+                'metodo': scope['method'],
+                'caminho': scope['path'],
+                'status': status_code,
+                'inicio': inicio.isoformat(),
+                'total_ms': round(total_ms, 3),
+                **build_report(profiler, trace, self.top),
+            }
+            self.reports.add(report)
+            if self.directory:
+                self.dump(report, profiler)
+            logger.info(f"Perfil {report_id}: {scope['method']} {scope['path']} em {total_ms:.1f}ms")
+
+    def dump(self, report: dict[str, Any], profiler: cProfile.Profile) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, report['id'])
+        profiler.dump_stats(f'{base}.prof')
+        with open(f'{base}.json', 'w') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,139 @@
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from workout_api.configs.settings import settings
+
+# (workout_id, categoria_id, centro_treinamento_id); None = sem filtro
+ScopeKey = tuple[int, Optional[int], Optional[int]]
+
+
+class WorkoutRanking:
+    """
+    Ranking ordenado de um workout dentro de um escopo (filtros de categoria/centro).
+
+    Mantém uma lista ordenada de (chave, atleta_id), em que a chave já embute o
+    sentido do workout (menor vence ou maior vence). Consultas de top-N e de
+    posição de um atleta são buscas binárias; atualizações são O(log n) + memmove.
+    """
+
+    def __init__(self, menor_vence: bool, scores: Iterable[tuple[int, float]] = ()):
+        self.menor_vence = menor_vence
+        self.built_at = time.monotonic()
+        self._valores: dict[int, float] = dict(scores)
+        self._ordem: list[tuple[float, int]] = sorted(
+            (self._key(valor), atleta_id) for atleta_id, valor in self._valores.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._ordem)
+
+    def _key(self, valor: float) -> float:
+        return valor if self.menor_vence else -valor
+
+    def _posicao(self, key: float) -> int:
+        # Semântica de RANK(): empates dividem a posição
+        return bisect_left(self._ordem, (key,)) + 1
+
+    def upsert(self, atleta_id: int, valor: float) -> None:
+        self.remove(atleta_id)
+        self._valores[atleta_id] = valor
+        insort(self._ordem, (self._key(valor), atleta_id))
+
+    def remove(self, atleta_id: int) -> None:
+        valor = self._valores.pop(atleta_id, None)
+        if valor is None:
+            return
+        del self._ordem[bisect_left(self._ordem, (self._key(valor), atleta_id))]
+
+    def rank_of(self, atleta_id: int) -> Optional[tuple[int, float]]:
+        valor = self._valores.get(atleta_id)
+        if valor is None:
+            return None
+        return self._posicao(self._key(valor)), valor
+
+    def top(self, limit: int, offset: int = 0) -> list[tuple[int, int, float]]:
+        """Retorna [(posicao, atleta_id, valor)] da fatia [offset, offset + limit)"""
+        entries = []
+        previous_key, posicao = None, 0
+        for index, (key, atleta_id) in enumerate(self._ordem[offset:offset + limit], start=offset):
+            if key != previous_key:
+                posicao = self._posicao(key) if previous_key is None else index + 1
+                previous_key = key
+            entries.append((posicao, atleta_id, self._valores[atleta_id]))
+        return entries
+
+
+class LeaderboardCache:
+    """
+    Cache LRU de WorkoutRanking por escopo, mantido incrementalmente pelas escritas
+    de scores deste processo. Escritas feitas por outros workers aparecem após
+    `ttl` segundos, quando o escopo é reconstruído a partir do banco.
+    """
+
+    def __init__(self, ttl: float, max_scopes: int):
+        self.ttl = ttl
+        self.max_scopes = max_scopes
+        self._scopes: OrderedDict[ScopeKey, WorkoutRanking] = OrderedDict()
+        self._generations: dict[int, int] = {}
+        self._global_generation = 0
+
+    def generation(self, workout_id: int) -> tuple[int, int]:
+        """Marca usada para descartar rankings construídos durante uma escrita concorrente"""
+        return self._global_generation, self._generations.get(workout_id, 0)
+
+    def get(self, key: ScopeKey) -> Optional[WorkoutRanking]:
+        ranking = self._scopes.get(key)
+        if ranking is None:
+            return None
+        if time.monotonic() - ranking.built_at > self.ttl:
+            del self._scopes[key]
+            return None
+        self._scopes.move_to_end(key)
+        return ranking
+
+    def store(self, key: ScopeKey, ranking: WorkoutRanking, generation: tuple[int, int]) -> None:
+        if generation != self.generation(key[0]):
+            return
+        self._scopes[key] = ranking
+        self._scopes.move_to_end(key)
+        while len(self._scopes) > self.max_scopes:
+            self._scopes.popitem(last=False)
+
+    def upsert_score(
+        self,
+        workout_id: int,
+        atleta_id: int,
+        categoria_id: int,
+        centro_treinamento_id: int,
+        valor: float,
+    ) -> None:
+        self._generations[workout_id] = self._generations.get(workout_id, 0) + 1
+        for (scope_workout, scope_categoria, scope_centro), ranking in self._scopes.items():
+            if scope_workout != workout_id:
+                continue
+            if scope_categoria not in (None, categoria_id) or scope_centro not in (None, centro_treinamento_id):
+                continue
+            ranking.upsert(atleta_id, valor)
+
+    def remove_score(self, workout_id: int, atleta_id: int) -> None:
+        self._generations[workout_id] = self._generations.get(workout_id, 0) + 1
+        for (scope_workout, _, _), ranking in self._scopes.items():
+            if scope_workout == workout_id:
+                ranking.remove(atleta_id)
+
+    def remove_atleta(self, atleta_id: int) -> None:
+        self._global_generation += 1
+        for ranking in self._scopes.values():
+            ranking.remove(atleta_id)
+
+    def clear(self) -> None:
+        self._global_generation += 1
+        self._scopes.clear()
+
+
+leaderboard_cache = LeaderboardCache(
+    ttl=settings.LEADERBOARD_CACHE_TTL,
+    max_scopes=settings.LEADERBOARD_CACHE_MAX_SCOPES,
+)
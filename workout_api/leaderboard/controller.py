@@ -0,0 +1,359 @@
+import asyncio
+from collections import Counter
+from typing import Optional
+from fastapi import APIRouter, status, HTTPException, Query
+from sqlalchemy import Select, case, func
+from sqlalchemy.future import select
+
+from workout_api.leaderboard.cache import WorkoutRanking, leaderboard_cache
+from workout_api.leaderboard.schemas import LeaderboardWorkoutEntry, LeaderboardGeralEntry
+from workout_api.atleta.models import AtletaModel
+from workout_api.categorias.models import CategoriaModel
+from workout_api.categorias.schemas import CategoriaSimpleOut
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.centro_treinamento.schemas import CentroTreinamentoSimpleOut
+from workout_api.scores.models import ScoreModel
+from workout_api.workouts.models import WorkoutModel
+from workout_api.workouts.schemas import TipoScore
+from workout_api.configs.database import AsyncSession
+from workout_api.configs.settings import settings
+from fastapi import Depends
+from workout_api.configs.sharding import PRIMARY_SHARD, ShardSessions, get_shard_sessions, shard_router
+
+router = APIRouter()
+
+
+def filter_scores(query: Select, categoria_id: Optional[int], centro_treinamento_id: Optional[int]) -> Select:
+    """Aplica os filtros de categoria/centro do atleta sobre um SELECT que já faz JOIN com atletas"""
+    if categoria_id is not None:
+        query = query.filter(AtletaModel.categoria_id == categoria_id)
+    if centro_treinamento_id is not None:
+        query = query.filter(AtletaModel.centro_treinamento_id == centro_treinamento_id)
+    return query
+
+
+def score_order(workout_tipo: str):
+    return ScoreModel.valor.asc() if TipoScore(workout_tipo).menor_vence else ScoreModel.valor.desc()
+
+
+def workout_scores_query(
+    workout: WorkoutModel,
+    categoria_id: Optional[int],
+    centro_treinamento_id: Optional[int],
+    *columns,
+) -> Select:
+    """SELECT das colunas pedidas sobre os scores do workout no escopo filtrado"""
+    query = (
+        select(*columns)
+        .select_from(ScoreModel)
+        .join(AtletaModel, AtletaModel.pk_id == ScoreModel.atleta_id)
+        .filter(ScoreModel.workout_id == workout.pk_id)
+    )
+    return filter_scores(query, categoria_id, centro_treinamento_id)
+
+
+def workout_ranking_query(
+    workout: WorkoutModel,
+    categoria_id: Optional[int] = None,
+    centro_treinamento_id: Optional[int] = None,
+) -> Select:
+    """RANK() sobre (workout_id, valor), servido pelo índice ix_scores_workout_valor"""
+    query = (
+        select(
+            ScoreModel.atleta_id,
+            ScoreModel.valor,
+            func.rank().over(order_by=score_order(workout.tipo)).label('posicao'),
+        )
+        .join(AtletaModel, AtletaModel.pk_id == ScoreModel.atleta_id)
+        .filter(ScoreModel.workout_id == workout.pk_id)
+    )
+    return filter_scores(query, categoria_id, centro_treinamento_id)
+
+
+def geral_ranking_query(
+    categoria_id: Optional[int] = None,
+    centro_treinamento_id: Optional[int] = None,
+) -> Select:
+    """
+    Leaderboard geral: posição por workout via RANK() OVER (PARTITION BY workout_id),
+    somada por atleta; vence quem completou mais workouts e, depois, soma menos pontos.
+    """
+    chave = case(
+        (WorkoutModel.tipo == TipoScore.tempo.value, ScoreModel.valor),
+        else_=-ScoreModel.valor,
+    )
+    posicoes = filter_scores(
+        select(
+            ScoreModel.atleta_id,
+            func.rank().over(partition_by=ScoreModel.workout_id, order_by=chave).label('posicao'),
+        )
+        .join(WorkoutModel, WorkoutModel.pk_id == ScoreModel.workout_id)
+        .join(AtletaModel, AtletaModel.pk_id == ScoreModel.atleta_id),
+        categoria_id,
+        centro_treinamento_id,
+    ).subquery()
+
+    totais = (
+        select(
+            posicoes.c.atleta_id,
+            func.sum(posicoes.c.posicao).label('pontos'),
+            func.count().label('workouts'),
+        )
+        .group_by(posicoes.c.atleta_id)
+        .subquery()
+    )
+
+    return select(
+        totais.c.atleta_id,
+        totais.c.pontos,
+        totais.c.workouts,
+        func.rank().over(order_by=(totais.c.workouts.desc(), totais.c.pontos.asc())).label('posicao'),
+    )
+
+
+async def scope_shards(shard_sessions: ShardSessions, centro_treinamento_id: Optional[int]) -> list[str]:
+    """Shards com scores no escopo: os scores ficam no shard do atleta, que é o do centro"""
+    if centro_treinamento_id is not None:
+        return [await shard_router.shard_for_centro(shard_sessions.primary, centro_treinamento_id) or PRIMARY_SHARD]
+    return shard_router.names
+
+
+async def fetch_shards(shard_sessions: ShardSessions, shards: list[str], query: Select) -> list:
+    """Executa o mesmo SELECT em paralelo nos shards e concatena as linhas"""
+    results = await asyncio.gather(*(shard_sessions.get(shard).execute(query) for shard in shards))
+    return [row for result in results for row in result.all()]
+
+
+def geral_ranking(scores: list) -> list[dict]:
+    """
+    O cálculo de `geral_ranking_query` em Python, sobre (workout_id, tipo, atleta_id, valor)
+    de todos os shards: RANK() não pode ser calculado por shard e somado depois.
+    """
+    por_workout: dict[int, tuple[str, list]] = {}
+    for workout_id, tipo, atleta_id, valor in scores:
+        por_workout.setdefault(workout_id, (tipo, []))[1].append((atleta_id, valor))
+
+    pontos, workouts = Counter(), Counter()
+    for tipo, valores in por_workout.values():
+        ranking = WorkoutRanking(TipoScore(tipo).menor_vence, valores)
+        for posicao, atleta_id, _ in ranking.top(len(ranking)):
+            pontos[atleta_id] += posicao
+            workouts[atleta_id] += 1
+
+    ordem = sorted(pontos, key=lambda atleta_id: (-workouts[atleta_id], pontos[atleta_id], atleta_id))
+    rows, previous_key, posicao = [], None, 0
+    for index, atleta_id in enumerate(ordem):
+        key = (workouts[atleta_id], pontos[atleta_id])
+        if key != previous_key:
+            posicao, previous_key = index + 1, key
+        rows.append({'atleta_id': atleta_id, 'pontos': pontos[atleta_id], 'workouts': workouts[atleta_id], 'posicao': posicao})
+    return rows
+
+
+async def get_workout(db_session: AsyncSession, workout_id: int) -> WorkoutModel:
+    workout = await db_session.get(WorkoutModel, workout_id)
+
+    if not workout:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Workout não encontrado com id: {workout_id}'
+        )
+
+    return workout
+
+
+async def get_ranking(
+    shard_sessions: ShardSessions,
+    workout: WorkoutModel,
+    categoria_id: Optional[int],
+    centro_treinamento_id: Optional[int],
+) -> WorkoutRanking:
+    """Busca o ranking do escopo no cache ou o reconstrói com os scores do escopo em todos os shards"""
+    key = (workout.pk_id, categoria_id, centro_treinamento_id)
+    ranking = leaderboard_cache.get(key)
+    if ranking is not None:
+        return ranking
+
+    generation = leaderboard_cache.generation(workout.pk_id)
+    query = workout_scores_query(workout, categoria_id, centro_treinamento_id, ScoreModel.atleta_id, ScoreModel.valor)
+    rows = await fetch_shards(shard_sessions, await scope_shards(shard_sessions, centro_treinamento_id), query)
+
+    ranking = WorkoutRanking(TipoScore(workout.tipo).menor_vence, rows)
+    leaderboard_cache.store(key, ranking, generation)
+    return ranking
+
+
+async def load_atletas(shard_sessions: ShardSessions, atleta_ids: list[int]) -> dict[int, tuple[str, str, str]]:
+    """Busca nome, categoria e centro dos atletas por PK, com uma consulta por shard dono dos ids"""
+    by_shard: dict[str, list[int]] = {}
+    for atleta_id in atleta_ids:
+        shard = shard_router.shard_for_id(atleta_id)
+        if shard is not None:
+            by_shard.setdefault(shard, []).append(atleta_id)
+
+    atletas = {}
+    for shard, ids in by_shard.items():
+        rows = await shard_sessions.get(shard).execute(
+            select(AtletaModel.pk_id, AtletaModel.nome, CategoriaModel.nome, CentroTreinamentoModel.nome)
+            .join(CategoriaModel, CategoriaModel.pk_id == AtletaModel.categoria_id)
+            .join(CentroTreinamentoModel, CentroTreinamentoModel.pk_id == AtletaModel.centro_treinamento_id)
+            .filter(AtletaModel.pk_id.in_(ids))
+        )
+        atletas.update({pk_id: (nome, categoria, centro) for pk_id, nome, categoria, centro in rows})
+    return atletas
+
+
+def build_entries(entry_class, rows: list[dict], atletas: dict[int, tuple[str, str, str]]) -> list:
+    entries = []
+    for row in rows:
+        atleta = atletas.get(row['atleta_id'])
+        if atleta is None:
+            continue
+        nome, categoria, centro = atleta
+        entries.append(entry_class(
+            nome=nome,
+            categoria=CategoriaSimpleOut(nome=categoria),
+            centro_treinamento=CentroTreinamentoSimpleOut(nome=centro),
+            **row
+        ))
+    return entries
+
+
+@router.get(
+    '/workouts/{workout_id}',
+    summary='Leaderboard de um workout',
+    status_code=status.HTTP_200_OK,
+    response_model=list[LeaderboardWorkoutEntry],
+    description="""
+    Ranking de um workout, opcionalmente restrito a uma categoria e/ou centro de treinamento.
+    
+    Servido pelo cache incremental de leaderboards quando habilitado
+    (`LEADERBOARD_CACHE_ENABLED`); caso contrário, por RANK() no banco. Com sharding,
+    cada shard devolve seu top-N e as posições saem da intercalação.
+    """,
+)
+async def workout_leaderboard(
+    workout_id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    categoria_id: Optional[int] = Query(None, description="Filtrar pela categoria do atleta"),
+    centro_treinamento_id: Optional[int] = Query(None, description="Filtrar pelo centro do atleta"),
+    limit: int = Query(50, ge=1, le=500, description="Quantidade de posições (top-N)"),
+    offset: int = Query(0, ge=0, description="Posições a pular"),
+) -> list[LeaderboardWorkoutEntry]:
+    workout = await get_workout(shard_sessions.primary, workout_id)
+
+    if settings.LEADERBOARD_CACHE_ENABLED or shard_router.enabled:
+        if settings.LEADERBOARD_CACHE_ENABLED:
+            ranking = await get_ranking(shard_sessions, workout, categoria_id, centro_treinamento_id)
+        else:
+            # As primeiras offset + limit posições de cada shard contêm a fatia global e
+            # todos os scores à frente dela, então as posições do merge são as globais
+            query = workout_scores_query(workout, categoria_id, centro_treinamento_id, ScoreModel.atleta_id, ScoreModel.valor)
+            query = query.order_by(score_order(workout.tipo), ScoreModel.atleta_id).limit(offset + limit)
+            shards = await scope_shards(shard_sessions, centro_treinamento_id)
+            ranking = WorkoutRanking(TipoScore(workout.tipo).menor_vence, await fetch_shards(shard_sessions, shards, query))
+        rows = [
+            {'posicao': posicao, 'atleta_id': atleta_id, 'valor': valor}
+            for posicao, atleta_id, valor in ranking.top(limit, offset)
+        ]
+    else:
+        query = workout_ranking_query(workout, categoria_id, centro_treinamento_id)
+        query = query.order_by('posicao', ScoreModel.atleta_id).limit(limit).offset(offset)
+        rows = [dict(row._mapping) for row in await shard_sessions.primary.execute(query)]
+
+    atletas = await load_atletas(shard_sessions, [row['atleta_id'] for row in rows])
+    return build_entries(LeaderboardWorkoutEntry, rows, atletas)
+
+
+@router.get(
+    '/workouts/{workout_id}/atletas/{atleta_id}',
+    summary='Posição de um atleta no leaderboard de um workout',
+    status_code=status.HTTP_200_OK,
+    response_model=LeaderboardWorkoutEntry,
+    responses={
+        404: {"description": "Workout não encontrado ou atleta sem score no escopo"}
+    }
+)
+async def workout_rank_of(
+    workout_id: int,
+    atleta_id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    categoria_id: Optional[int] = Query(None, description="Filtrar pela categoria do atleta"),
+    centro_treinamento_id: Optional[int] = Query(None, description="Filtrar pelo centro do atleta"),
+) -> LeaderboardWorkoutEntry:
+    workout = await get_workout(shard_sessions.primary, workout_id)
+
+    row = None
+    if settings.LEADERBOARD_CACHE_ENABLED:
+        ranking = await get_ranking(shard_sessions, workout, categoria_id, centro_treinamento_id)
+        rank = ranking.rank_of(atleta_id)
+        if rank is not None:
+            row = {'posicao': rank[0], 'atleta_id': atleta_id, 'valor': rank[1]}
+    elif shard_router.enabled:
+        # Posição = 1 + scores à frente do atleta, contados em cada shard do escopo
+        shard = shard_router.shard_for_id(atleta_id)
+        valor = None
+        if shard is not None:
+            valor = (await shard_sessions.get(shard).execute(
+                workout_scores_query(workout, categoria_id, centro_treinamento_id, ScoreModel.valor)
+                .filter(ScoreModel.atleta_id == atleta_id)
+            )).scalar()
+        if valor is not None:
+            frente = ScoreModel.valor < valor if TipoScore(workout.tipo).menor_vence else ScoreModel.valor > valor
+            query = workout_scores_query(workout, categoria_id, centro_treinamento_id, func.count()).filter(frente)
+            counts = await fetch_shards(shard_sessions, await scope_shards(shard_sessions, centro_treinamento_id), query)
+            row = {'posicao': 1 + sum(count for count, in counts), 'atleta_id': atleta_id, 'valor': valor}
+    else:
+        ranked = workout_ranking_query(workout, categoria_id, centro_treinamento_id).subquery()
+        result = (await shard_sessions.primary.execute(select(ranked).filter(ranked.c.atleta_id == atleta_id))).first()
+        if result is not None:
+            row = dict(result._mapping)
+
+    entries = build_entries(LeaderboardWorkoutEntry, [row], await load_atletas(shard_sessions, [atleta_id])) if row else []
+    if not entries:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Atleta {atleta_id} sem score no workout {workout_id}'
+        )
+
+    return entries[0]
+
+
+@router.get(
+    '/',
+    summary='Leaderboard geral',
+    status_code=status.HTTP_200_OK,
+    response_model=list[LeaderboardGeralEntry],
+    description="""
+    Ranking geral somando as posições de cada atleta em todos os workouts
+    (menor soma vence; quem completou mais workouts fica à frente).
+    
+    As posições são calculadas com window functions no banco, dentro do escopo filtrado.
+    Com sharding, os scores do escopo vêm de todos os shards e as posições são
+    calculadas na aplicação.
+    """,
+)
+async def geral_leaderboard(
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    categoria_id: Optional[int] = Query(None, description="Filtrar pela categoria do atleta"),
+    centro_treinamento_id: Optional[int] = Query(None, description="Filtrar pelo centro do atleta"),
+    limit: int = Query(50, ge=1, le=500, description="Quantidade de posições (top-N)"),
+    offset: int = Query(0, ge=0, description="Posições a pular"),
+) -> list[LeaderboardGeralEntry]:
+    if shard_router.enabled:
+        query = filter_scores(
+            select(ScoreModel.workout_id, WorkoutModel.tipo, ScoreModel.atleta_id, ScoreModel.valor)
+            .join(WorkoutModel, WorkoutModel.pk_id == ScoreModel.workout_id)
+            .join(AtletaModel, AtletaModel.pk_id == ScoreModel.atleta_id),
+            categoria_id,
+            centro_treinamento_id,
+        )
+        scores = await fetch_shards(shard_sessions, await scope_shards(shard_sessions, centro_treinamento_id), query)
+        rows = geral_ranking(scores)[offset:offset + limit]
+    else:
+        ranked = geral_ranking_query(categoria_id, centro_treinamento_id).subquery()
+        query = select(ranked).order_by(ranked.c.posicao, ranked.c.atleta_id).limit(limit).offset(offset)
+        rows = [dict(row._mapping) for row in await shard_sessions.primary.execute(query)]
+
+    atletas = await load_atletas(shard_sessions, [row['atleta_id'] for row in rows])
+    return build_entries(LeaderboardGeralEntry, rows, atletas)
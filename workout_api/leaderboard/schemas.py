@@ -0,0 +1,21 @@
+from typing import Annotated
+from pydantic import Field, BaseModel
+from workout_api.categorias.schemas import CategoriaSimpleOut
+from workout_api.centro_treinamento.schemas import CentroTreinamentoSimpleOut
+
+
+class LeaderboardAtleta(BaseModel):
+    posicao: Annotated[int, Field(description='Posição no ranking (empates dividem a posição)')]
+    atleta_id: Annotated[int, Field(description='Identificador do atleta')]
+    nome: Annotated[str, Field(description='Nome do atleta')]
+    categoria: Annotated[CategoriaSimpleOut, Field(description='Categoria')]
+    centro_treinamento: Annotated[CentroTreinamentoSimpleOut, Field(description='Centro de treinamento')]
+
+
+class LeaderboardWorkoutEntry(LeaderboardAtleta):
+    valor: Annotated[float, Field(description='Resultado do atleta no workout')]
+
+
+class LeaderboardGeralEntry(LeaderboardAtleta):
+    pontos: Annotated[int, Field(description='Soma das posições nos workouts (menor é melhor)')]
+    workouts: Annotated[int, Field(description='Quantidade de workouts com score registrado')]
@@ -1,16 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_pagination import add_pagination
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError, TimeoutError as PoolTimeoutError
 import logging
 
+from workout_api.analytics.controller import router as analytics_router
+from workout_api.analytics.snapshot import atleta_snapshot
+from workout_api.atleta.archive import atleta_archiver
+from workout_api.atleta.batcher import atleta_batcher
 from workout_api.atleta.controller import router as atleta_router
+from workout_api.atleta.cpf_index import cpf_index
+from workout_api.atleta.events import atleta_events
+from workout_api.atleta.listing_cache import listing_cache
+from workout_api.batch.controller import router as batch_router
 from workout_api.categorias.controller import router as categorias_router
 from workout_api.centro_treinamento.controller import router as centro_treinamento_router
+from workout_api.workouts.controller import router as workouts_router
+from workout_api.scores.controller import router as scores_router
+from workout_api.leaderboard.controller import router as leaderboard_router
+from workout_api.medidas.controller import router as medidas_router
+from workout_api.configs.settings import settings
+from workout_api.configs.sharding import shard_router
+from workout_api.contrib.admission import AdmissionController, AdmissionControlMiddleware, Bucket, RouteClass
+from workout_api.contrib.deadlines import DeadlineMiddleware
+from workout_api.contrib.idempotency import IdempotencyMiddleware, IdempotencyStore
+from workout_api.contrib.profiling import ProfileReports, ProfilingMiddleware
 from workout_api.contrib.exception_handlers import (
     validation_exception_handler,
     integrity_exception_handler,
+    pool_timeout_exception_handler,
+    dbapi_exception_handler,
     sqlalchemy_exception_handler,
     generic_exception_handler
 )
@@ -21,7 +42,34 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicia e encerra recursos de longa duração (ex.: LISTEN do change-feed, filtro de CPFs, cache de listagens, arquivamento, engines dos shards)"""
+    await shard_router.prepare()
+    if settings.ATLETA_BATCH_ENABLED:
+        atleta_batcher.check(shard_router.engines)
+    await atleta_events.start()
+    if settings.CPF_FILTER_ENABLED:
+        await cpf_index.start(atleta_events)
+    if settings.ANALYTICS_ENABLED:
+        atleta_snapshot.start(settings.ANALYTICS_REFRESH_INTERVAL, atleta_events)
+    if settings.LISTING_CACHE_ENABLED:
+        listing_cache.start(atleta_events)
+    if settings.ARCHIVE_ENABLED:
+        atleta_archiver.start(settings.ARCHIVE_INTERVAL)
+    yield
+    await atleta_batcher.stop()
+    await atleta_archiver.stop()
+    await listing_cache.stop()
+    await atleta_snapshot.stop()
+    await cpf_index.stop()
+    await atleta_events.stop()
+    await shard_router.dispose()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title='WorkoutAPI',
     description='API para gerenciamento de competições de CrossFit',
     version='1.0.0',
@@ -29,6 +77,58 @@ app = FastAPI(
     redoc_url='/redoc'
 )
 
+# Deadlines por rota: statement_timeout na sessão e cancelamento em deadline ou desconexão do cliente
+app.add_middleware(
+    DeadlineMiddleware,
+    default_ms=settings.REQUEST_DEADLINE_MS,
+    route_deadlines=settings.REQUEST_DEADLINES_MS,
+    exempt_paths=('/atletas/eventos',),
+)
+
+# Controle de admissão: rejeita com 503 + Retry-After em vez de enfileirar no pool do SQLAlchemy
+pool_capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+admission_controller = AdmissionController(
+    capacity=pool_capacity,
+    classes={
+        'read': RouteClass(
+            bucket=Bucket('read', settings.ADMISSION_READ_LIMIT or pool_capacity),
+            priority=0,
+            max_queue=settings.ADMISSION_READ_QUEUE,
+        ),
+        'write': RouteClass(
+            bucket=Bucket('write', settings.ADMISSION_WRITE_LIMIT or pool_capacity),
+            priority=1,
+            max_queue=settings.ADMISSION_WRITE_QUEUE,
+        ),
+        'bulk': RouteClass(
+            bucket=Bucket('bulk', settings.ADMISSION_BULK_LIMIT),
+            priority=2,
+            max_queue=settings.ADMISSION_BULK_QUEUE,
+        ),
+    },
+    route_limits=settings.ADMISSION_ROUTE_LIMITS,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+)
+
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        controller=admission_controller,
+        bulk_paths=tuple(settings.ADMISSION_BULK_PATHS),
+        exempt_paths=('/docs', '/redoc', '/openapi.json', '/admission', '/atletas/eventos', '/analytics', '/profiling', '/idempotency'),
+        retry_after=settings.ADMISSION_RETRY_AFTER,
+    )
+
+# Idempotency-Key: repetições respondem do store, antes da admissão e sem tocar no banco
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_MAX_BYTES, settings.IDEMPOTENCY_TTL)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(
+        IdempotencyMiddleware,
+        store=idempotency_store,
+        paths=tuple(settings.IDEMPOTENCY_PATHS),
+        header=settings.IDEMPOTENCY_HEADER,
+    )
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -38,9 +138,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Perfilamento sob demanda: sem o header/query param, o custo é uma varredura dos headers
+profile_reports = ProfileReports(settings.PROFILING_HISTORY)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        reports=profile_reports,
+        header=settings.PROFILING_HEADER,
+        query_param=settings.PROFILING_QUERY_PARAM,
+        token=settings.PROFILING_TOKEN,
+        directory=settings.PROFILING_DIR,
+        top=settings.PROFILING_TOP_FUNCTIONS,
+    )
+
 # Registrar exception handlers
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(IntegrityError, integrity_exception_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_exception_handler)
+app.add_exception_handler(DBAPIError, dbapi_exception_handler)
 app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
@@ -48,6 +163,12 @@ app.add_exception_handler(Exception, generic_exception_handler)
 app.include_router(atleta_router, prefix='/atletas', tags=['atletas'])
 app.include_router(categorias_router, prefix='/categorias', tags=['categorias'])
 app.include_router(centro_treinamento_router, prefix='/centros_treinamento', tags=['centros_treinamento'])
+app.include_router(workouts_router, prefix='/workouts', tags=['workouts'])
+app.include_router(scores_router, prefix='/scores', tags=['scores'])
+app.include_router(leaderboard_router, prefix='/leaderboard', tags=['leaderboard'])
+app.include_router(medidas_router, prefix='/medidas', tags=['medidas'])
+app.include_router(analytics_router, prefix='/analytics', tags=['analytics'])
+app.include_router(batch_router, prefix='/batch', tags=['batch'])
 
 # Add pagination support
 add_pagination(app)
@@ -61,3 +182,33 @@ async def health_check():
         "message": "WorkoutAPI está funcionando!",
         "version": "1.0.0"
     }
+
+
+@app.get('/admission', tags=['health'])
+async def admission_stats():
+    """Profundidade das filas, vagas em uso e requisições rejeitadas pelo controle de admissão"""
+    return admission_controller.stats()
+
+
+@app.get('/idempotency', tags=['health'])
+async def idempotency_stats():
+    """Respostas guardadas por Idempotency-Key, execuções em andamento e repetições respondidas do store"""
+    return idempotency_store.stats()
+
+
+@app.get('/profiling', tags=['health'])
+async def profiling_reports():
+    """Últimos relatórios de perfilamento (id, rota, status e duração)"""
+    return profile_reports.summaries()
+
+
+@app.get('/profiling/{report_id}', tags=['health'])
+async def profiling_report(report_id: str):
+    """Relatório de uma requisição perfilada: tempo por fase, SQL e funções mais custosas"""
+    report = profile_reports.get(report_id)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Relatório de perfilamento não encontrado: {report_id}'
+        )
+    return report
@@ -0,0 +1 @@
+# Medidas
@@ -0,0 +1,185 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, status, HTTPException, Query
+from sqlalchemy import Select, func, literal_column
+from sqlalchemy.future import select
+
+from workout_api.atleta.controller import atleta_session
+from workout_api.atleta.models import AtletaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.medidas.models import MedidaModel
+from workout_api.medidas.schemas import Granularidade, MedidaOut, PontoSerie, SerieOut
+from workout_api.configs.database import AsyncSession
+from fastapi import Depends
+from workout_api.configs.sharding import PRIMARY_SHARD, ShardSessions, get_shard_sessions, shard_router
+
+router = APIRouter()
+
+# Unidade do date_trunc do Postgres para cada granularidade
+DATE_TRUNC_UNITS = {
+    Granularidade.dia: 'day',
+    Granularidade.semana: 'week',
+    Granularidade.mes: 'month',
+}
+# Modificadores de datetime() do SQLite equivalentes (desenvolvimento local e testes)
+SQLITE_MODIFIERS = {
+    Granularidade.dia: ('start of day',),
+    Granularidade.semana: ('-6 days', 'weekday 1', 'start of day'),
+    Granularidade.mes: ('start of month',),
+}
+
+
+def bucket_expression(dialect_name: str, granularidade: Granularidade):
+    """Início do intervalo de cada medição, calculado no banco"""
+    if dialect_name == 'postgresql':
+        # Unidade como literal: com parâmetros, o SELECT e o GROUP BY viram expressões diferentes
+        return func.date_trunc(literal_column(f"'{DATE_TRUNC_UNITS[granularidade]}'"), MedidaModel.registrado_em)
+    return func.datetime(MedidaModel.registrado_em, *SQLITE_MODIFIERS[granularidade])
+
+
+def filter_periodo(query: Select, inicio: Optional[datetime], fim: Optional[datetime]) -> Select:
+    if inicio is not None:
+        query = query.filter(MedidaModel.registrado_em >= inicio)
+    if fim is not None:
+        query = query.filter(MedidaModel.registrado_em < fim)
+    return query
+
+
+async def serie(
+    db_session: AsyncSession,
+    filtro,
+    granularidade: Granularidade,
+    inicio: Optional[datetime],
+    fim: Optional[datetime],
+) -> SerieOut:
+    """Médias de peso, altura e idade por intervalo, agregadas em SQL (GROUP BY do intervalo)"""
+    bucket = bucket_expression(db_session.bind.dialect.name, granularidade).label('inicio')
+    query = filter_periodo(
+        select(
+            bucket,
+            func.count().label('total'),
+            func.avg(MedidaModel.peso).label('peso'),
+            func.avg(MedidaModel.altura).label('altura'),
+            func.avg(MedidaModel.idade).label('idade'),
+        ).filter(filtro),
+        inicio,
+        fim,
+    ).group_by(bucket).order_by(bucket)
+
+    rows = (await db_session.execute(query)).all()
+    return SerieOut(
+        granularidade=granularidade,
+        pontos=[PontoSerie.model_validate(row, from_attributes=True) for row in rows],
+    )
+
+
+async def atleta_medidas_session(shard_sessions: ShardSessions, id: int) -> AsyncSession:
+    """Sessão do shard do atleta (as medições ficam junto dele); 404 se o atleta não existe"""
+    db_session = atleta_session(shard_sessions, id)
+    if (await db_session.execute(select(AtletaModel.pk_id).filter_by(pk_id=id))).scalar() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Atleta não encontrado com id: {id}'
+        )
+    return db_session
+
+
+@router.get(
+    '/atletas/{id}',
+    summary='Histórico de medidas de um atleta',
+    status_code=status.HTTP_200_OK,
+    response_model=list[MedidaOut],
+    description="""
+    Medições de peso, altura e idade do atleta em ordem cronológica. Uma medição é registrada
+    no cadastro e a cada alteração de peso, altura ou idade (`PATCH /atletas/{id}`).
+    
+    **Parâmetros:**
+    - `inicio` / `fim`: Período (fim exclusivo)
+    - `limite`: Máximo de medições (as mais recentes do período)
+    """,
+    responses={
+        200: {"description": "Medições do atleta"},
+        404: {"description": "Atleta não encontrado"}
+    }
+)
+async def historico(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    inicio: Optional[datetime] = Query(None, description="Início do período"),
+    fim: Optional[datetime] = Query(None, description="Fim do período (exclusivo)"),
+    limite: int = Query(500, ge=1, le=5000, description="Máximo de medições"),
+) -> list[MedidaOut]:
+    db_session = await atleta_medidas_session(shard_sessions, id)
+    query = filter_periodo(
+        select(MedidaModel.registrado_em, MedidaModel.peso, MedidaModel.altura, MedidaModel.idade)
+        .filter(MedidaModel.atleta_id == id),
+        inicio,
+        fim,
+    ).order_by(MedidaModel.registrado_em.desc()).limit(limite)
+
+    rows = (await db_session.execute(query)).all()
+    return [MedidaOut.model_validate(row, from_attributes=True) for row in reversed(rows)]
+
+
+@router.get(
+    '/atletas/{id}/serie',
+    summary='Série temporal das medidas de um atleta',
+    status_code=status.HTTP_200_OK,
+    response_model=SerieOut,
+    description="""
+    Médias diárias, semanais ou mensais de peso, altura e idade do atleta, calculadas no banco
+    sobre o índice (atleta_id, registrado_em).
+    
+    **Exemplos:**
+    - `/medidas/atletas/1/serie?granularidade=semana`
+    - `/medidas/atletas/1/serie?granularidade=mes&inicio=2024-01-01T00:00:00`
+    """,
+    responses={
+        200: {"description": "Série do atleta"},
+        404: {"description": "Atleta não encontrado"}
+    }
+)
+async def serie_atleta(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    granularidade: Granularidade = Query(Granularidade.semana, description="Tamanho dos intervalos"),
+    inicio: Optional[datetime] = Query(None, description="Início do período"),
+    fim: Optional[datetime] = Query(None, description="Fim do período (exclusivo)"),
+) -> SerieOut:
+    db_session = await atleta_medidas_session(shard_sessions, id)
+    return await serie(db_session, MedidaModel.atleta_id == id, granularidade, inicio, fim)
+
+
+@router.get(
+    '/centros_treinamento/{id}/serie',
+    summary='Série temporal das medidas dos atletas de um centro',
+    status_code=status.HTTP_200_OK,
+    response_model=SerieOut,
+    description="""
+    Médias diárias, semanais ou mensais de peso, altura e idade de todas as medições dos atletas
+    do centro de treinamento, calculadas no banco sobre o índice (centro_treinamento_id, registrado_em).
+    """,
+    responses={
+        200: {"description": "Série do centro de treinamento"},
+        404: {"description": "Centro de treinamento não encontrado"}
+    }
+)
+async def serie_centro(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    granularidade: Granularidade = Query(Granularidade.mes, description="Tamanho dos intervalos"),
+    inicio: Optional[datetime] = Query(None, description="Início do período"),
+    fim: Optional[datetime] = Query(None, description="Fim do período (exclusivo)"),
+) -> SerieOut:
+    centro = (
+        await shard_sessions.primary.execute(select(CentroTreinamentoModel.pk_id).filter_by(pk_id=id))
+    ).scalar()
+    if centro is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Centro de treinamento não encontrado com id: {id}'
+        )
+
+    # As medições de um centro estão no shard dele, como os atletas
+    shard = await shard_router.shard_for_centro(shard_sessions.primary, id) or PRIMARY_SHARD
+    return await serie(shard_sessions.get(shard), MedidaModel.centro_treinamento_id == id, granularidade, inicio, fim)
@@ -0,0 +1,61 @@
+from datetime import datetime
+from sqlalchemy import Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from workout_api.contrib.models import BaseModel
+
+
+class MedidaModel(BaseModel):
+    __tablename__ = 'medidas'
+    # Séries por atleta e por centro: índices (fk, registrado_em) com as métricas em INCLUDE
+    # (index-only scan no Postgres); BRIN em registrado_em para varreduras por período de todos
+    # os centros, já que as linhas chegam em ordem de tempo
+    __table_args__ = (
+        Index(
+            'ix_medidas_atleta_registrado', 'atleta_id', 'registrado_em',
+            postgresql_include=['peso', 'altura', 'idade'],
+        ),
+        Index(
+            'ix_medidas_centro_registrado', 'centro_treinamento_id', 'registrado_em',
+            postgresql_include=['peso', 'altura', 'idade'],
+        ),
+        Index('ix_medidas_registrado_brin', 'registrado_em', postgresql_using='brin'),
+    )
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    peso: Mapped[float] = mapped_column(Float, nullable=False)
+    altura: Mapped[float] = mapped_column(Float, nullable=False)
+    idade: Mapped[int] = mapped_column(Integer, nullable=False)
+    registrado_em: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    atleta_id: Mapped[int] = mapped_column(ForeignKey('atletas.pk_id', ondelete='CASCADE'))
+    # Desnormalizado do atleta: a série por centro não precisa de JOIN com atletas
+    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
+
+    @staticmethod
+    def values_for(atleta_id: int, atleta_values: dict, registrado_em: datetime) -> dict:
+        """Colunas da medição com o estado de um atleta (`atleta_values` com as colunas de atletas)"""
+        return {
+            'atleta_id': atleta_id,
+            'centro_treinamento_id': atleta_values['centro_treinamento_id'],
+            'peso': atleta_values['peso'],
+            'altura': atleta_values['altura'],
+            'idade': atleta_values['idade'],
+            'registrado_em': registrado_em,
+        }
+
+
+class MedidaArquivoModel(BaseModel):
+    """Medições dos atletas arquivados (movidas de `medidas` junto com o atleta)"""
+    __tablename__ = 'medidas_arquivo'
+    __table_args__ = (
+        Index('ix_medidas_arquivo_atleta_registrado', 'atleta_id', 'registrado_em'),
+    )
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    peso: Mapped[float] = mapped_column(Float, nullable=False)
+    altura: Mapped[float] = mapped_column(Float, nullable=False)
+    idade: Mapped[int] = mapped_column(Integer, nullable=False)
+    registrado_em: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    atleta_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    centro_treinamento_id: Mapped[int] = mapped_column(ForeignKey('centros_treinamento.pk_id'))
@@ -0,0 +1,31 @@
+from enum import Enum
+from typing import Annotated
+from pydantic import Field, BaseModel
+from datetime import datetime
+
+
+class Granularidade(str, Enum):
+    """Tamanho dos intervalos das séries (semanas começam na segunda-feira)"""
+    dia = 'dia'
+    semana = 'semana'
+    mes = 'mes'
+
+
+class MedidaOut(BaseModel):
+    registrado_em: Annotated[datetime, Field(description='Momento da medição')]
+    peso: Annotated[float, Field(description='Peso em kg', example=75.5)]
+    altura: Annotated[float, Field(description='Altura em metros', example=1.70)]
+    idade: Annotated[int, Field(description='Idade', example=25)]
+
+
+class PontoSerie(BaseModel):
+    inicio: Annotated[datetime, Field(description='Início do intervalo')]
+    total: Annotated[int, Field(description='Medições no intervalo')]
+    peso: Annotated[float, Field(description='Peso médio em kg')]
+    altura: Annotated[float, Field(description='Altura média em metros')]
+    idade: Annotated[float, Field(description='Idade média')]
+
+
+class SerieOut(BaseModel):
+    granularidade: Annotated[Granularidade, Field(description='Tamanho dos intervalos')]
+    pontos: Annotated[list[PontoSerie], Field(description='Médias por intervalo, em ordem cronológica')]
@@ -19,9 +19,13 @@ if config.config_file_name is not None:
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from workout_api.contrib.models import BaseModel
-from workout_api.atleta.models import AtletaModel
+from workout_api.atleta.models import AtletaArquivoModel, AtletaModel
 from workout_api.categorias.models import CategoriaModel
 from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.workouts.models import WorkoutModel
+from workout_api.scores.models import ScoreArquivoModel, ScoreModel
+from workout_api.medidas.models import MedidaArquivoModel, MedidaModel
+from workout_api.configs.sharding import ShardConfigModel
 
 target_metadata = BaseModel.metadata
 
@@ -0,0 +1,41 @@
+"""atletas filter indexes
+
+Revision ID: 0002_atletas_filter_indexes
+Revises: 0001_initial
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_atletas_filter_indexes'
+down_revision: Union[str, None] = '0001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_atletas_categoria_sexo_idade', ['categoria_id', 'sexo', 'idade']),
+    ('ix_atletas_centro_sexo_idade', ['centro_treinamento_id', 'sexo', 'idade']),
+    ('ix_atletas_categoria_nome', ['categoria_id', 'nome']),
+    ('ix_atletas_centro_nome', ['centro_treinamento_id', 'nome']),
+    ('ix_atletas_sexo_idade', ['sexo', 'idade']),
+    ('ix_atletas_nome', ['nome']),
+    ('ix_atletas_idade', ['idade']),
+    ('ix_atletas_peso', ['peso']),
+    ('ix_atletas_altura', ['altura']),
+    ('ix_atletas_created_at', ['created_at']),
+)
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, 'atletas', columns)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='atletas')
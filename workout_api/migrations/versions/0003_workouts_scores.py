@@ -0,0 +1,53 @@
+"""workouts and scores
+
+Revision ID: 0003_workouts_scores
+Revises: 0002_atletas_filter_indexes
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_workouts_scores'
+down_revision: Union[str, None] = '0002_atletas_filter_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'workouts',
+        sa.Column('pk_id', sa.Integer(), nullable=False),
+        sa.Column('nome', sa.String(length=50), nullable=False),
+        sa.Column('descricao', sa.String(length=255), nullable=True),
+        sa.Column('tipo', sa.String(length=20), nullable=False),
+        sa.Column('categoria_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['categoria_id'], ['categorias.pk_id']),
+        sa.PrimaryKeyConstraint('pk_id'),
+        sa.UniqueConstraint('nome'),
+    )
+    op.create_table(
+        'scores',
+        sa.Column('pk_id', sa.Integer(), nullable=False),
+        sa.Column('valor', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('atleta_id', sa.Integer(), nullable=False),
+        sa.Column('workout_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['atleta_id'], ['atletas.pk_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.pk_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('pk_id'),
+        sa.UniqueConstraint('atleta_id', 'workout_id', name='uq_scores_atleta_workout'),
+    )
+    op.create_index('ix_scores_workout_valor', 'scores', ['workout_id', 'valor'])
+    op.create_index('ix_scores_atleta', 'scores', ['atleta_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scores_atleta', table_name='scores')
+    op.drop_index('ix_scores_workout_valor', table_name='scores')
+    op.drop_table('scores')
+    op.drop_table('workouts')
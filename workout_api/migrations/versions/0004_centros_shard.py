@@ -0,0 +1,29 @@
+"""centros_treinamento shard
+
+Revision ID: 0004_centros_shard
+Revises: 0003_workouts_scores
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_centros_shard'
+down_revision: Union[str, None] = '0003_workouts_scores'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'centros_treinamento',
+        sa.Column('shard', sa.String(length=30), nullable=False, server_default='default'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('centros_treinamento', 'shard')
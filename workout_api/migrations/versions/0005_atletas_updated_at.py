@@ -0,0 +1,28 @@
+"""atletas updated_at
+
+Revision ID: 0005_atletas_updated_at
+Revises: 0004_centros_shard
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_atletas_updated_at'
+down_revision: Union[str, None] = '0004_centros_shard'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('atletas', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_atletas_updated_at', 'atletas', ['updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_atletas_updated_at', table_name='atletas')
+    op.drop_column('atletas', 'updated_at')
@@ -0,0 +1,36 @@
+"""atletas keyset indexes
+
+Revision ID: 0006_atletas_keyset_indexes
+Revises: 0005_atletas_updated_at
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_atletas_keyset_indexes'
+down_revision: Union[str, None] = '0005_atletas_updated_at'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# pk_id no fim do índice (fk, nome) cobre o ORDER BY nome, pk_id das listagens keyset por pai
+INDEXES = (
+    ('ix_atletas_categoria_nome', 'categoria_id'),
+    ('ix_atletas_centro_nome', 'centro_treinamento_id'),
+)
+
+
+def upgrade() -> None:
+    for name, fk_column in INDEXES:
+        op.drop_index(name, table_name='atletas')
+        op.create_index(name, 'atletas', [fk_column, 'nome', 'pk_id'])
+
+
+def downgrade() -> None:
+    for name, fk_column in INDEXES:
+        op.drop_index(name, table_name='atletas')
+        op.create_index(name, 'atletas', [fk_column, 'nome'])
@@ -0,0 +1,58 @@
+"""medidas
+
+Revision ID: 0007_medidas
+Revises: 0006_atletas_keyset_indexes
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_medidas'
+down_revision: Union[str, None] = '0006_atletas_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'medidas',
+        sa.Column('pk_id', sa.Integer(), nullable=False),
+        sa.Column('peso', sa.Float(), nullable=False),
+        sa.Column('altura', sa.Float(), nullable=False),
+        sa.Column('idade', sa.Integer(), nullable=False),
+        sa.Column('registrado_em', sa.DateTime(), nullable=False),
+        sa.Column('atleta_id', sa.Integer(), nullable=False),
+        sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['atleta_id'], ['atletas.pk_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['centro_treinamento_id'], ['centros_treinamento.pk_id']),
+        sa.PrimaryKeyConstraint('pk_id'),
+    )
+
+    # Medição inicial dos atletas já cadastrados, com o estado atual
+    op.execute("""
+        INSERT INTO medidas (atleta_id, centro_treinamento_id, peso, altura, idade, registrado_em)
+        SELECT pk_id, centro_treinamento_id, peso, altura, idade, COALESCE(updated_at, created_at)
+        FROM atletas
+    """)
+
+    op.create_index(
+        'ix_medidas_atleta_registrado', 'medidas', ['atleta_id', 'registrado_em'],
+        postgresql_include=['peso', 'altura', 'idade'],
+    )
+    op.create_index(
+        'ix_medidas_centro_registrado', 'medidas', ['centro_treinamento_id', 'registrado_em'],
+        postgresql_include=['peso', 'altura', 'idade'],
+    )
+    op.create_index('ix_medidas_registrado_brin', 'medidas', ['registrado_em'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_medidas_registrado_brin', table_name='medidas')
+    op.drop_index('ix_medidas_centro_registrado', table_name='medidas')
+    op.drop_index('ix_medidas_atleta_registrado', table_name='medidas')
+    op.drop_table('medidas')
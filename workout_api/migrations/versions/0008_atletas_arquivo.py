@@ -0,0 +1,85 @@
+"""atletas arquivo
+
+Revision ID: 0008_atletas_arquivo
+Revises: 0007_medidas
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_atletas_arquivo'
+down_revision: Union[str, None] = '0007_medidas'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # No Postgres, particionada por faixa de created_at; as partições anuais são criadas
+    # pelo arquivamento, e a default recebe o que chegar antes delas
+    op.create_table(
+        'atletas_arquivo',
+        sa.Column('pk_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('nome', sa.String(length=50), nullable=False),
+        sa.Column('cpf', sa.String(length=11), nullable=False),
+        sa.Column('idade', sa.Integer(), nullable=False),
+        sa.Column('peso', sa.Float(), nullable=False),
+        sa.Column('altura', sa.Float(), nullable=False),
+        sa.Column('sexo', sa.String(length=1), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('arquivado_em', sa.DateTime(), nullable=False),
+        sa.Column('categoria_id', sa.Integer(), nullable=False),
+        sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['categoria_id'], ['categorias.pk_id']),
+        sa.ForeignKeyConstraint(['centro_treinamento_id'], ['centros_treinamento.pk_id']),
+        sa.PrimaryKeyConstraint('pk_id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE TABLE atletas_arquivo_default PARTITION OF atletas_arquivo DEFAULT')
+
+    op.create_index('ix_atletas_arquivo_pk_id', 'atletas_arquivo', ['pk_id'])
+    op.create_index('ix_atletas_arquivo_cpf', 'atletas_arquivo', ['cpf'])
+    op.create_index('ix_atletas_arquivo_nome', 'atletas_arquivo', ['nome'])
+
+    op.create_table(
+        'scores_arquivo',
+        sa.Column('pk_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('valor', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('atleta_id', sa.Integer(), nullable=False),
+        sa.Column('workout_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.pk_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('pk_id'),
+    )
+    op.create_index('ix_scores_arquivo_atleta', 'scores_arquivo', ['atleta_id'])
+
+    op.create_table(
+        'medidas_arquivo',
+        sa.Column('pk_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('peso', sa.Float(), nullable=False),
+        sa.Column('altura', sa.Float(), nullable=False),
+        sa.Column('idade', sa.Integer(), nullable=False),
+        sa.Column('registrado_em', sa.DateTime(), nullable=False),
+        sa.Column('atleta_id', sa.Integer(), nullable=False),
+        sa.Column('centro_treinamento_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['centro_treinamento_id'], ['centros_treinamento.pk_id']),
+        sa.PrimaryKeyConstraint('pk_id'),
+    )
+    op.create_index('ix_medidas_arquivo_atleta_registrado', 'medidas_arquivo', ['atleta_id', 'registrado_em'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_medidas_arquivo_atleta_registrado', table_name='medidas_arquivo')
+    op.drop_table('medidas_arquivo')
+    op.drop_index('ix_scores_arquivo_atleta', table_name='scores_arquivo')
+    op.drop_table('scores_arquivo')
+    op.drop_index('ix_atletas_arquivo_nome', table_name='atletas_arquivo')
+    op.drop_index('ix_atletas_arquivo_cpf', table_name='atletas_arquivo')
+    op.drop_index('ix_atletas_arquivo_pk_id', table_name='atletas_arquivo')
+    op.drop_table('atletas_arquivo')
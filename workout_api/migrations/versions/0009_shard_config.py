@@ -0,0 +1,33 @@
+"""shard config
+
+Revision ID: 0009_shard_config
+Revises: 0008_atletas_arquivo
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_shard_config'
+down_revision: Union[str, None] = '0008_atletas_arquivo'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Preenchida por `python -m workout_api.configs.shard_setup`, não pela migration
+    op.create_table(
+        'shard_config',
+        sa.Column('pk_id', sa.Integer(), nullable=False),
+        sa.Column('modulus', sa.Integer(), nullable=False),
+        sa.Column('legacy_max_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('pk_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('shard_config')
@@ -0,0 +1,37 @@
+"""atletas sort indexes
+
+Revision ID: 0010_atletas_sort_indexes
+Revises: 0009_shard_config
+Create Date: 2026-10-20 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_atletas_sort_indexes'
+down_revision: Union[str, None] = '0009_shard_config'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# pk_id no fim cobre o desempate de ORDER BY coluna, pk_id: sem ele, colunas com poucos
+# valores distintos (idade, altura) exigem ordenar um grupo inteiro antes do LIMIT
+SORT_COLUMNS = ('nome', 'idade', 'peso', 'altura', 'created_at')
+
+
+def upgrade() -> None:
+    for column in SORT_COLUMNS:
+        op.drop_index(f'ix_atletas_{column}', table_name='atletas')
+        op.create_index(f'ix_atletas_{column}', 'atletas', [column, 'pk_id'])
+    # Ranking por peso dentro de uma categoria: filtro e ordenação no mesmo índice
+    op.create_index('ix_atletas_categoria_peso', 'atletas', ['categoria_id', 'peso', 'pk_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_atletas_categoria_peso', table_name='atletas')
+    for column in SORT_COLUMNS:
+        op.drop_index(f'ix_atletas_{column}', table_name='atletas')
+        op.create_index(f'ix_atletas_{column}', 'atletas', [column])
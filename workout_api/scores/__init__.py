@@ -0,0 +1 @@
+# Scores
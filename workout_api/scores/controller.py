@@ -0,0 +1,158 @@
+from datetime import datetime
+from fastapi import APIRouter, status, Body, HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from workout_api.scores.schemas import ScoreIn, ScoreOut, ScoreUpdate
+from workout_api.scores.models import ScoreModel
+from workout_api.atleta.models import AtletaModel
+from workout_api.workouts.models import WorkoutModel
+from workout_api.leaderboard.cache import leaderboard_cache
+from workout_api.configs.database import AsyncSession
+from fastapi import Depends
+from workout_api.configs.sharding import ShardSessions, get_shard_sessions, shard_router
+
+router = APIRouter()
+
+
+def to_score_out(score: ScoreModel) -> ScoreOut:
+    return ScoreOut(
+        id=score.pk_id,
+        atleta_id=score.atleta_id,
+        workout_id=score.workout_id,
+        valor=score.valor,
+        created_at=score.created_at
+    )
+
+
+async def get_score(shard_sessions: ShardSessions, id: int) -> tuple[AsyncSession, ScoreModel]:
+    """
+    Busca o score shard a shard (fica no shard do atleta; os ids são únicos entre os
+    shards) e retorna também a sessão do shard onde ele está
+    """
+    for shard in shard_router.names:
+        db_session = shard_sessions.get(shard)
+        score = await db_session.get(ScoreModel, id)
+        if score:
+            return db_session, score
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f'Score não encontrado com id: {id}'
+    )
+
+
+@router.post(
+    '/',
+    summary='Registrar o score de um atleta em um workout',
+    status_code=status.HTTP_201_CREATED,
+    response_model=ScoreOut,
+    responses={
+        201: {"description": "Score registrado com sucesso"},
+        303: {"description": "Atleta já possui score neste workout"},
+        400: {"description": "Atleta ou workout não encontrados, ou categoria incompatível"}
+    }
+)
+async def post(
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    score_in: ScoreIn = Body(...),
+) -> ScoreOut:
+    # O score fica no shard do atleta (FK e arquivamento locais), derivado do próprio id
+    shard = shard_router.shard_for_id(score_in.atleta_id)
+    atleta = None
+    if shard is not None:
+        db_session = shard_sessions.get(shard)
+        atleta = await db_session.get(AtletaModel, score_in.atleta_id)
+    if not atleta:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Atleta não encontrado com id: {score_in.atleta_id}'
+        )
+
+    # Workouts são replicados: o `default` é a fonte da verdade
+    workout = await shard_sessions.primary.get(WorkoutModel, score_in.workout_id)
+    if not workout:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Workout não encontrado com id: {score_in.workout_id}'
+        )
+
+    if workout.categoria_id is not None and workout.categoria_id != atleta.categoria_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'O workout {workout.nome} não pertence à categoria do atleta'
+        )
+
+    # Réplicas de workout que falharam neste shard são refeitas antes do insert (FK)
+    await shard_router.repair(shard)
+    try:
+        score_model = ScoreModel(**score_in.model_dump(), created_at=datetime.utcnow())
+
+        db_session.add(score_model)
+        await db_session.commit()
+    except IntegrityError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_303_SEE_OTHER,
+            detail=f'O atleta {score_in.atleta_id} já possui score no workout {score_in.workout_id}'
+        )
+
+    leaderboard_cache.upsert_score(
+        workout_id=workout.pk_id,
+        atleta_id=atleta.pk_id,
+        categoria_id=atleta.categoria_id,
+        centro_treinamento_id=atleta.centro_treinamento_id,
+        valor=score_model.valor,
+    )
+    return to_score_out(score_model)
+
+
+@router.get(
+    '/{id}',
+    summary='Consultar um score pelo id',
+    status_code=status.HTTP_200_OK,
+    response_model=ScoreOut,
+)
+async def get(id: int, shard_sessions: ShardSessions = Depends(get_shard_sessions)) -> ScoreOut:
+    _, score = await get_score(shard_sessions, id)
+    return to_score_out(score)
+
+
+@router.patch(
+    '/{id}',
+    summary='Atualizar um score pelo id',
+    status_code=status.HTTP_200_OK,
+    response_model=ScoreOut,
+)
+async def patch(
+    id: int,
+    shard_sessions: ShardSessions = Depends(get_shard_sessions),
+    score_up: ScoreUpdate = Body(...),
+) -> ScoreOut:
+    db_session, score = await get_score(shard_sessions, id)
+    atleta = await db_session.get(AtletaModel, score.atleta_id)
+
+    score.valor = score_up.valor
+    await db_session.commit()
+
+    leaderboard_cache.upsert_score(
+        workout_id=score.workout_id,
+        atleta_id=score.atleta_id,
+        categoria_id=atleta.categoria_id,
+        centro_treinamento_id=atleta.centro_treinamento_id,
+        valor=score.valor,
+    )
+    return to_score_out(score)
+
+
+@router.delete(
+    '/{id}',
+    summary='Deletar um score pelo id',
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def delete(id: int, shard_sessions: ShardSessions = Depends(get_shard_sessions)) -> None:
+    db_session, score = await get_score(shard_sessions, id)
+
+    await db_session.delete(score)
+    await db_session.commit()
+
+    leaderboard_cache.remove_score(score.workout_id, score.atleta_id)
@@ -0,0 +1,36 @@
+from datetime import datetime
+from sqlalchemy import Integer, Float, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from workout_api.contrib.models import BaseModel
+
+
+class ScoreModel(BaseModel):
+    __tablename__ = 'scores'
+    # (workout_id, valor) atende o ORDER BY das window functions do leaderboard
+    __table_args__ = (
+        UniqueConstraint('atleta_id', 'workout_id', name='uq_scores_atleta_workout'),
+        Index('ix_scores_workout_valor', 'workout_id', 'valor'),
+        Index('ix_scores_atleta', 'atleta_id'),
+    )
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    valor: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    atleta_id: Mapped[int] = mapped_column(ForeignKey('atletas.pk_id', ondelete='CASCADE'))
+    workout_id: Mapped[int] = mapped_column(ForeignKey('workouts.pk_id', ondelete='CASCADE'))
+
+
+class ScoreArquivoModel(BaseModel):
+    """Scores dos atletas arquivados (movidos de `scores` junto com o atleta)"""
+    __tablename__ = 'scores_arquivo'
+    __table_args__ = (
+        Index('ix_scores_arquivo_atleta', 'atleta_id'),
+    )
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    valor: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    atleta_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    workout_id: Mapped[int] = mapped_column(ForeignKey('workouts.pk_id', ondelete='CASCADE'))
@@ -0,0 +1,18 @@
+from typing import Annotated
+from pydantic import Field, BaseModel
+from datetime import datetime
+
+
+class ScoreIn(BaseModel):
+    atleta_id: Annotated[int, Field(description='Identificador do atleta')]
+    workout_id: Annotated[int, Field(description='Identificador do workout')]
+    valor: Annotated[float, Field(description='Resultado (segundos, repetições ou kg, conforme o tipo do workout)', example=215, ge=0)]
+
+
+class ScoreOut(ScoreIn):
+    id: Annotated[int, Field(description='Identificador do score')]
+    created_at: Annotated[datetime, Field(description='Data de registro do score')]
+
+
+class ScoreUpdate(BaseModel):
+    valor: Annotated[float, Field(description='Novo resultado', example=230, ge=0)]
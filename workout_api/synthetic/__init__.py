@@ -0,0 +1 @@
+# Synthetic
@@ -0,0 +1,64 @@
+"""
+Gerador de atletas sintéticos para testes de escala.
+
+    python -m workout_api.synthetic --total 1000000 --seed 42
+
+Grava no DATABASE_URL (ou --database-url) via COPY; use um banco local descartável.
+Para acrescentar mais atletas sem repetir CPFs, rode de novo com a mesma --seed e
+--inicio igual ao total já gerado.
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from workout_api.synthetic.generator import CATEGORIAS, GeradorAtletas
+from workout_api.synthetic.loader import load_atletas
+
+logger = logging.getLogger('workout_api.synthetic')
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m workout_api.synthetic', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--total', type=int, default=100_000, help='Atletas a gerar')
+    parser.add_argument('--seed', type=int, default=42, help='Semente (mesma semente e lote: mesmos dados)')
+    parser.add_argument('--inicio', type=int, default=0, help='Índice do primeiro atleta (para acrescentar dados)')
+    parser.add_argument('--lote', type=int, default=50_000, help='Atletas por COPY/commit')
+    parser.add_argument('--categorias', type=int, default=len(CATEGORIAS), help='Quantidade de categorias')
+    parser.add_argument('--centros', type=int, default=20, help='Quantidade de centros de treinamento')
+    parser.add_argument('--skew-categorias', type=float, default=1.0, help='Expoente Zipf das categorias (0: uniforme)')
+    parser.add_argument('--skew-centros', type=float, default=1.2, help='Expoente Zipf dos centros (0: uniforme)')
+    parser.add_argument('--dias', type=int, default=3 * 365, help='Janela de created_at, em dias')
+    parser.add_argument('--database-url', default=None, help='Padrão: DATABASE_URL das settings')
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.database_url is None:
+        from workout_api.configs.settings import settings
+        args.database_url = settings.DATABASE_URL
+
+    gerador = GeradorAtletas(
+        seed=args.seed,
+        categorias=args.categorias,
+        centros=args.centros,
+        skew_categorias=args.skew_categorias,
+        skew_centros=args.skew_centros,
+        dias=args.dias,
+    )
+
+    def progress(gravados: int, elapsed: float) -> None:
+        logger.info(f'{gravados} atletas gravados ({gravados / elapsed:,.0f}/s)')
+
+    engine = create_async_engine(args.database_url)
+    try:
+        await load_atletas(engine, gerador, args.total, inicio=args.inicio, lote=args.lote, progress=progress)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from math import gcd
+
+import numpy as np
+
+# Espaço das 9 primeiras posições do CPF; os 2 dígitos verificadores são calculados
+CPF_SPACE = 10 ** 9
+CPF_WEIGHTS_1 = np.arange(10, 1, -1)
+CPF_WEIGHTS_2 = np.arange(11, 1, -1)
+DIGIT_POWERS = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+
+NOMES_MASCULINOS = [
+    'João', 'Pedro', 'Lucas', 'Gabriel', 'Rafael', 'Mateus', 'Gustavo', 'Felipe', 'Bruno', 'Thiago',
+    'Carlos', 'Marcos', 'André', 'Eduardo', 'Rodrigo', 'Diego', 'Leonardo', 'Vinícius', 'Daniel', 'Paulo',
+]
+NOMES_FEMININOS = [
+    'Maria', 'Ana', 'Julia', 'Beatriz', 'Larissa', 'Fernanda', 'Camila', 'Mariana', 'Amanda', 'Letícia',
+    'Gabriela', 'Carolina', 'Patrícia', 'Juliana', 'Bruna', 'Isabela', 'Vanessa', 'Aline', 'Renata', 'Luana',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa',
+    'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado', 'Mendes', 'Freitas',
+]
+CATEGORIAS = ['RX', 'Scaled', 'Iniciante', 'Intermediário', 'Masters 35+', 'Masters 40+', 'Masters 45+', 'Teens']
+CIDADES = [
+    'São Paulo', 'Rio de Janeiro', 'Belo Horizonte', 'Curitiba', 'Porto Alegre', 'Salvador', 'Recife',
+    'Fortaleza', 'Brasília', 'Goiânia', 'Florianópolis', 'Campinas', 'Manaus', 'Belém', 'Vitória',
+]
+
+
+def nomes_categorias(total: int) -> list[str]:
+    return [CATEGORIAS[i] if i < len(CATEGORIAS) else f'Categoria {i + 1}' for i in range(total)]
+
+
+def nomes_centros(total: int) -> list[str]:
+    return [
+        f'CT {CIDADES[i % len(CIDADES)]}' + (f' {i // len(CIDADES) + 1}' if i >= len(CIDADES) else '')
+        for i in range(total)
+    ]
+
+
+def cpf_check_digits(bases: np.ndarray) -> np.ndarray:
+    """Dígitos (n, 11) dos CPFs cujas 9 primeiras posições são `bases`, com os verificadores"""
+    digits = (bases[:, None] // DIGIT_POWERS) % 10
+
+    first = (digits @ CPF_WEIGHTS_1) % 11
+    first = np.where(first < 2, 0, 11 - first)
+    digits = np.column_stack([digits, first])
+
+    second = (digits @ CPF_WEIGHTS_2) % 11
+    second = np.where(second < 2, 0, 11 - second)
+    return np.column_stack([digits, second])
+
+
+def cpfs_as_strings(digits: np.ndarray) -> list[str]:
+    return (digits.astype(np.uint8) + ord('0')).view('S11').ravel().astype('U11').tolist()
+
+
+def zipf_weights(total: int, skew: float) -> np.ndarray:
+    """Pesos ∝ 1 / posição^skew (skew 0: uniforme)"""
+    weights = 1.0 / np.arange(1, total + 1) ** skew
+    return weights / weights.sum()
+
+
+@dataclass
+class GeradorAtletas:
+    """
+    Gera atletas sintéticos em lotes colunares, de forma determinística para a semente.
+
+    Cada índice global i vira o CPF de base (i * a + b) mod 10^9, uma bijeção do espaço
+    de 9 dígitos escolhida pela semente: lotes com índices disjuntos (inclusive de
+    execuções diferentes com a mesma semente) nunca repetem CPF. As demais colunas
+    usam um gerador semeado por (semente, índice inicial do lote).
+    """
+
+    seed: int = 42
+    categorias: int = len(CATEGORIAS)
+    centros: int = 20
+    skew_categorias: float = 1.0
+    skew_centros: float = 1.2
+    dias: int = 3 * 365
+    agora: datetime = datetime(2024, 1, 1)
+
+    def __post_init__(self):
+        rng = np.random.default_rng(self.seed)
+        multiplier = int(rng.integers(1, CPF_SPACE))
+        while gcd(multiplier, CPF_SPACE) != 1:
+            multiplier += 1
+        self._multiplier = multiplier
+        self._offset = int(rng.integers(0, CPF_SPACE))
+        self._pesos_categorias = zipf_weights(self.categorias, self.skew_categorias)
+        self._pesos_centros = zipf_weights(self.centros, self.skew_centros)
+
+    def cpf_bases(self, inicio: int, total: int) -> np.ndarray:
+        if inicio + total > CPF_SPACE:
+            raise ValueError(f'Máximo de {CPF_SPACE} CPFs distintos')
+        indexes = np.arange(inicio, inicio + total, dtype=np.int64)
+        return (indexes * self._multiplier + self._offset) % CPF_SPACE
+
+    def lote(self, inicio: int, total: int) -> dict[str, list]:
+        """
+        Colunas dos atletas de índices [inicio, inicio + total). `categoria` e `centro`
+        são posições em nomes_categorias()/nomes_centros(). Bases de CPF com todos os
+        dígitos iguais (inválidas, no máximo 10 no espaço inteiro) são descartadas.
+        """
+        rng = np.random.default_rng([self.seed, inicio])
+
+        bases = self.cpf_bases(inicio, total)
+        validos = bases % 111_111_111 != 0
+        total = int(validos.sum())
+        cpfs = cpfs_as_strings(cpf_check_digits(bases[validos]))
+
+        feminino = rng.random(total) < 0.45
+        primeiros = np.where(
+            feminino,
+            np.array(NOMES_FEMININOS, dtype=object)[rng.integers(0, len(NOMES_FEMININOS), total)],
+            np.array(NOMES_MASCULINOS, dtype=object)[rng.integers(0, len(NOMES_MASCULINOS), total)],
+        )
+        sobrenomes = np.array(SOBRENOMES, dtype=object)[rng.integers(0, len(SOBRENOMES), (2, total))]
+        nomes = (primeiros + ' ' + sobrenomes[0] + ' ' + sobrenomes[1]).tolist()
+
+        idades = np.clip(np.rint(rng.normal(31, 9, total)), 16, 70).astype(np.int64)
+        alturas = np.round(np.clip(np.where(
+            feminino, rng.normal(1.63, 0.065, total), rng.normal(1.76, 0.07, total)
+        ), 1.40, 2.10), 2)
+        imcs = np.clip(rng.normal(24.5, 2.8, total), 17, 38)
+        pesos = np.round(imcs * alturas ** 2, 1)
+
+        segundos = rng.integers(0, self.dias * 86400, total)
+        created_at = (np.datetime64(self.agora, 's') - segundos.astype('timedelta64[s]')).astype('datetime64[us]')
+
+        return {
+            'nome': nomes,
+            'cpf': cpfs,
+            'idade': idades.tolist(),
+            'peso': pesos.tolist(),
+            'altura': alturas.tolist(),
+            'sexo': np.where(feminino, 'F', 'M').tolist(),
+            'created_at': created_at.tolist(),
+            'categoria': rng.choice(self.categorias, total, p=self._pesos_categorias),
+            'centro': rng.choice(self.centros, total, p=self._pesos_centros),
+        }
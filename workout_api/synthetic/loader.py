@@ -0,0 +1,118 @@
+import logging
+import time
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.future import select
+
+from workout_api.atleta.models import AtletaModel
+from workout_api.categorias.models import CategoriaModel
+from workout_api.centro_treinamento.models import CentroTreinamentoModel
+from workout_api.medidas.models import MedidaModel
+from workout_api.synthetic.generator import GeradorAtletas, nomes_categorias, nomes_centros
+
+logger = logging.getLogger(__name__)
+
+ATLETA_COLUMNS = (
+    'nome', 'cpf', 'idade', 'peso', 'altura', 'sexo', 'created_at', 'categoria_id', 'centro_treinamento_id',
+)
+MEDIDA_COLUMNS = ('atleta_id', 'centro_treinamento_id', 'peso', 'altura', 'idade', 'registrado_em')
+
+
+async def ensure_ids(conn: AsyncConnection, model, nomes: list[str], **defaults) -> np.ndarray:
+    """pk_id de cada nome, na ordem de `nomes`, inserindo os que ainda não existem"""
+    existentes = dict((await conn.execute(
+        select(model.nome, model.pk_id).filter(model.nome.in_(nomes))
+    )).all())
+    faltantes = [nome for nome in nomes if nome not in existentes]
+    if faltantes:
+        await conn.execute(insert(model), [{'nome': nome, **defaults} for nome in faltantes])
+        existentes.update((await conn.execute(
+            select(model.nome, model.pk_id).filter(model.nome.in_(faltantes))
+        )).all())
+    return np.array([existentes[nome] for nome in nomes], dtype=np.int64)
+
+
+async def copy_rows(conn: AsyncConnection, model, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """COPY binário (asyncpg) no Postgres; INSERT multi-linha nos demais bancos"""
+    if conn.dialect.driver == 'asyncpg':
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            model.__tablename__, records=rows, columns=columns,
+        )
+    else:
+        await conn.execute(model.__table__.insert(), [dict(zip(columns, row)) for row in rows])
+
+
+async def atleta_ids(conn: AsyncConnection, cpfs: list[str], chunk: int = 10_000) -> dict[str, int]:
+    """pk_id dos atletas recém-copiados (o COPY não tem RETURNING), pelo índice único de cpf"""
+    ids = {}
+    for start in range(0, len(cpfs), chunk):
+        ids.update((await conn.execute(
+            select(AtletaModel.cpf, AtletaModel.pk_id).filter(AtletaModel.cpf.in_(cpfs[start:start + chunk]))
+        )).all())
+    return ids
+
+
+async def load_atletas(
+    engine: AsyncEngine,
+    gerador: GeradorAtletas,
+    total: int,
+    inicio: int = 0,
+    lote: int = 50_000,
+    progress: Optional[callable] = None,
+) -> int:
+    """
+    Gera e grava `total` atletas (índices a partir de `inicio`) com a medição inicial de
+    cada um, um COPY de atletas, um de medidas e um commit por lote. Categorias e centros
+    que faltarem são criados antes. Retorna os atletas gravados.
+    """
+    async with engine.begin() as conn:
+        categoria_ids = await ensure_ids(conn, CategoriaModel, nomes_categorias(gerador.categorias))
+        centro_ids = await ensure_ids(
+            conn, CentroTreinamentoModel, nomes_centros(gerador.centros),
+            endereco='Endereço sintético', proprietario='Gerador',
+        )
+
+    gravados = 0
+    started = time.perf_counter()
+    for offset in range(inicio, inicio + total, lote):
+        colunas = gerador.lote(offset, min(lote, inicio + total - offset))
+        centros = centro_ids[colunas['centro']].tolist()
+        rows = list(zip(
+            colunas['nome'],
+            colunas['cpf'],
+            colunas['idade'],
+            colunas['peso'],
+            colunas['altura'],
+            colunas['sexo'],
+            colunas['created_at'],
+            categoria_ids[colunas['categoria']].tolist(),
+            centros,
+        ))
+        async with engine.begin() as conn:
+            await copy_rows(conn, AtletaModel, ATLETA_COLUMNS, rows)
+            # Medição inicial, como no POST /atletas/: o estado do cadastro na data de criação
+            ids = await atleta_ids(conn, colunas['cpf'])
+            await copy_rows(conn, MedidaModel, MEDIDA_COLUMNS, list(zip(
+                [ids[cpf] for cpf in colunas['cpf']],
+                centros,
+                colunas['peso'],
+                colunas['altura'],
+                colunas['idade'],
+                colunas['created_at'],
+            )))
+
+        gravados += len(rows)
+        if progress is not None:
+            progress(gravados, time.perf_counter() - started)
+
+    if engine.dialect.name == 'postgresql':
+        async with engine.connect() as conn:
+            for model in (AtletaModel, MedidaModel):
+                await conn.execute(text(f'ANALYZE {model.__tablename__}'))
+            await conn.commit()
+
+    return gravados
@@ -0,0 +1 @@
+# Workouts
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, status, Body, HTTPException
+from sqlalchemy.future import select
+from sqlalchemy.exc import IntegrityError
+
+from workout_api.workouts.schemas import WorkoutIn, WorkoutOut
+from workout_api.workouts.models import WorkoutModel
+from workout_api.categorias.models import CategoriaModel
+from workout_api.configs.database import AsyncSession
+from fastapi import Depends
+from workout_api.configs.database import get_session
+from workout_api.configs.sharding import shard_router
+
+router = APIRouter()
+
+
+def to_workout_out(workout: WorkoutModel) -> WorkoutOut:
+    return WorkoutOut(
+        id=workout.pk_id,
+        nome=workout.nome,
+        descricao=workout.descricao,
+        tipo=workout.tipo,
+        categoria_id=workout.categoria_id
+    )
+
+
+@router.post(
+    '/',
+    summary='Criar um novo workout',
+    status_code=status.HTTP_201_CREATED,
+    response_model=WorkoutOut,
+    responses={
+        201: {"description": "Workout criado com sucesso"},
+        303: {"description": "Workout já cadastrado"},
+        400: {"description": "Categoria não encontrada"}
+    }
+)
+async def post(
+    db_session: AsyncSession = Depends(get_session),
+    workout_in: WorkoutIn = Body(...),
+) -> WorkoutOut:
+    if workout_in.categoria_id is not None:
+        categoria = await db_session.get(CategoriaModel, workout_in.categoria_id)
+        if not categoria:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'Categoria não encontrada com id: {workout_in.categoria_id}'
+            )
+
+    try:
+        workout_model = WorkoutModel(**workout_in.model_dump(mode='json'))
+
+        db_session.add(workout_model)
+        await db_session.commit()
+    except IntegrityError:
+        await db_session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_303_SEE_OTHER,
+            detail=f'Já existe um workout cadastrado com o nome: {workout_in.nome}'
+        )
+
+    # Workouts são dados de referência: replicados nos shards, onde ficam os scores
+    await shard_router.replicate(
+        WorkoutModel, {'pk_id': workout_model.pk_id, **workout_in.model_dump(mode='json')}
+    )
+
+    return to_workout_out(workout_model)
+
+
+@router.get(
+    '/',
+    summary='Consultar todos os workouts',
+    status_code=status.HTTP_200_OK,
+    response_model=list[WorkoutOut],
+)
+async def query(db_session: AsyncSession = Depends(get_session)) -> list[WorkoutOut]:
+    workouts = (
+        await db_session.execute(select(WorkoutModel).order_by(WorkoutModel.pk_id))
+    ).scalars().all()
+
+    return [to_workout_out(workout) for workout in workouts]
+
+
+@router.get(
+    '/{id}',
+    summary='Consultar um workout pelo id',
+    status_code=status.HTTP_200_OK,
+    response_model=WorkoutOut,
+)
+async def get(id: int, db_session: AsyncSession = Depends(get_session)) -> WorkoutOut:
+    workout = await db_session.get(WorkoutModel, id)
+
+    if not workout:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'Workout não encontrado com id: {id}'
+        )
+
+    return to_workout_out(workout)
@@ -0,0 +1,16 @@
+from typing import Optional
+from sqlalchemy import Integer, String, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from workout_api.contrib.models import BaseModel
+
+
+class WorkoutModel(BaseModel):
+    __tablename__ = 'workouts'
+
+    pk_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    nome: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    descricao: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    tipo: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Categoria à qual o workout se destina (None = aberto a todas)
+    categoria_id: Mapped[Optional[int]] = mapped_column(ForeignKey('categorias.pk_id'), nullable=True)
@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Annotated, Optional
+from pydantic import Field, BaseModel
+
+
+class TipoScore(str, Enum):
+    """Tipo de score do workout; define se o menor ou o maior valor vence"""
+    tempo = 'tempo'
+    repeticoes = 'repeticoes'
+    carga = 'carga'
+
+    @property
+    def menor_vence(self) -> bool:
+        return self is TipoScore.tempo
+
+
+class WorkoutIn(BaseModel):
+    nome: Annotated[str, Field(description='Nome do workout', example='23.1', max_length=50)]
+    descricao: Annotated[Optional[str], Field(None, description='Descrição do workout', example='AMRAP 14 min', max_length=255)]
+    tipo: Annotated[TipoScore, Field(description='Tipo de score (tempo: menor vence; repeticoes/carga: maior vence)', example='repeticoes')]
+    categoria_id: Annotated[Optional[int], Field(None, description='Categoria do workout (vazio = todas as categorias)')]
+
+
+class WorkoutOut(WorkoutIn):
+    id: Annotated[int, Field(description='Identificador do workout')]